@@ -7465,6 +7465,73 @@ Return valid JSON only.`;
 //  The local Python scraper POSTs progress and results here.
 // =============================================================================
 
+// Firestore update for one scraper job: status, merged progress fields,
+// result totals and the CSV link.
+function scraperJobUpdate(data: any): any {
+  const updateData: any = {
+    updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+    lastHeartbeat: admin.firestore.FieldValue.serverTimestamp(),
+  };
+  if (data?.status) updateData.status = data.status;
+  if (data?.progress) {
+    // Merge progress fields
+    for (const [key, value] of Object.entries(data.progress)) {
+      updateData[`progress.${key}`] = value;
+    }
+  }
+  if (data?.totalResults !== undefined)
+    updateData.totalResults = data.totalResults;
+  if (data?.csvUrl !== undefined) updateData.csvUrl = data.csvUrl;
+  return updateData;
+}
+
+// Scrape results live one per document in scrape-jobs/{jobId}/results,
+// keyed by placeId, so a job's size isn't capped by the 1 MiB document
+// limit and an upload writes only the rows it carries.
+const SCRAPE_RESULTS = "results";
+const FIRESTORE_BATCH_LIMIT = 500;
+
+function scrapeResultRef(
+  jobRef: admin.firestore.DocumentReference,
+  placeId: string
+): admin.firestore.DocumentReference {
+  return jobRef.collection(SCRAPE_RESULTS).doc(encodeURIComponent(placeId));
+}
+
+// Merge rows into their result documents with batched writes. Fields a
+// row doesn't carry (e.g. emailVerification set by the app) are kept.
+async function upsertScrapeResults(
+  jobRef: admin.firestore.DocumentReference,
+  rows: any[]
+): Promise<void> {
+  const db = admin.firestore();
+  for (let i = 0; i < rows.length; i += FIRESTORE_BATCH_LIMIT) {
+    const batch = db.batch();
+    for (const row of rows.slice(i, i + FIRESTORE_BATCH_LIMIT)) {
+      batch.set(scrapeResultRef(jobRef, row.placeId), row, { merge: true });
+    }
+    await batch.commit();
+  }
+}
+
+// A job's results. Jobs uploaded before results moved to their own
+// documents still carry them as an array on the job doc (legacy: true).
+async function loadScrapeResults(
+  jobRef: admin.firestore.DocumentReference,
+  jobData?: any
+): Promise<{ results: any[]; refs: admin.firestore.DocumentReference[]; legacy: boolean }> {
+  const snap = await jobRef.collection(SCRAPE_RESULTS).get();
+  if (!snap.empty) {
+    return {
+      results: snap.docs.map((d) => d.data()),
+      refs: snap.docs.map((d) => d.ref),
+      legacy: false,
+    };
+  }
+  const data = jobData ?? (await jobRef.get()).data();
+  return { results: data?.results || [], refs: [], legacy: true };
+}
+
 export const scraperApi = onRequest(
   {
     cors: true,
@@ -7513,7 +7580,6 @@ export const scraperApi = onRequest(
             },
             totalResults: 0,
             csvUrl: "",
-            results: [],
             createdAt: admin.firestore.FieldValue.serverTimestamp(),
             updatedAt: admin.firestore.FieldValue.serverTimestamp(),
             lastHeartbeat: admin.firestore.FieldValue.serverTimestamp(),
@@ -7529,33 +7595,34 @@ export const scraperApi = onRequest(
             res.status(400).json({ error: "Missing jobId" });
             return;
           }
-          const updateData: any = {
-            updatedAt: admin.firestore.FieldValue.serverTimestamp(),
-            lastHeartbeat: admin.firestore.FieldValue.serverTimestamp(),
-          };
-          if (data?.status) updateData.status = data.status;
-          if (data?.progress) {
-            // Merge progress fields
-            for (const [key, value] of Object.entries(data.progress)) {
-              updateData[`progress.${key}`] = value;
-            }
-          }
-          if (data?.totalResults !== undefined)
-            updateData.totalResults = data.totalResults;
-          if (data?.csvUrl !== undefined) updateData.csvUrl = data.csvUrl;
-
-          await db.collection(COLLECTION).doc(jobId).update(updateData);
+          await db.collection(COLLECTION).doc(jobId).update(scraperJobUpdate(data));
           res.status(200).json({ success: true });
           return;
         }
 
-        // Upload final results array
+        // Progress/status updates for several jobs in one request. Each job
+        // is updated on its own, so a deleted job doesn't fail the others.
+        case "batchUpdateJobs": {
+          const updates: any[] = Array.isArray(data?.updates) ? data.updates : [];
+          const outcomes = await Promise.allSettled(
+            updates.map((u: any) =>
+              db.collection(COLLECTION).doc(u.jobId).update(scraperJobUpdate(u.data))
+            )
+          );
+          const failed = updates
+            .filter((_: any, i: number) => outcomes[i].status === "rejected")
+            .map((u: any) => u.jobId);
+          res.status(200).json({ success: true, updated: updates.length - failed.length, failed });
+          return;
+        }
+
+        // Upload final results
         case "uploadResults": {
           if (!jobId) {
             res.status(400).json({ error: "Missing jobId" });
             return;
           }
-          const rawResults = data?.results || [];
+          const rawResults = (data?.results || []).filter((r: any) => r.placeId);
 
           // Clean and validate email fields on ingestion
           const results = rawResults.map((r: any) => ({
@@ -7565,20 +7632,92 @@ export const scraperApi = onRequest(
 
           const totalWithEmail = results.filter((r: any) => r.email).length;
 
-          await db
-            .collection(COLLECTION)
-            .doc(jobId)
-            .update({
-              results: results,
-              totalResults: results.length,
-              "progress.totalWithEmail": totalWithEmail,
-              "progress.emailsFound": totalWithEmail,
-              updatedAt: admin.firestore.FieldValue.serverTimestamp(),
-            });
+          const resultsRef = db.collection(COLLECTION).doc(jobId);
+          await upsertScrapeResults(resultsRef, results);
+          await resultsRef.update({
+            totalResults: results.length,
+            "progress.totalWithEmail": totalWithEmail,
+            "progress.emailsFound": totalWithEmail,
+            updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+          });
           res.status(200).json({ success: true, count: results.length });
           return;
         }
 
+        // Upsert one chunk of results, keyed by placeId. Re-sending a chunk
+        // is harmless, so the scraper can resume an interrupted upload or
+        // send only new and changed rows. Only the chunk's result documents
+        // are written; totals reach the job doc through updateJob.
+        case "uploadResultsChunk": {
+          if (!jobId) {
+            res.status(400).json({ error: "Missing jobId" });
+            return;
+          }
+          const chunkRef = db.collection(COLLECTION).doc(jobId);
+          if (!(await chunkRef.get()).exists) {
+            res.status(404).json({ error: "Job not found" });
+            return;
+          }
+          // Rows synced while a job runs may carry only details or only
+          // an email; a missing field leaves the stored one alone.
+          const chunkRows = (data?.results || [])
+            .filter((r: any) => r.placeId)
+            .map((r: any) =>
+              "email" in r ? { ...r, email: cleanEmailField(r.email || "") } : r
+            );
+          await upsertScrapeResults(chunkRef, chunkRows);
+          res.status(200).json({
+            success: true,
+            chunk: data?.chunk,
+            count: chunkRows.length,
+          });
+          return;
+        }
+
+        // Store one part of a CSV; the last part composes them into the
+        // final file. Parts are numbered, so a retried part just replaces
+        // its earlier copy.
+        case "uploadCsvPart": {
+          if (!jobId) {
+            res.status(400).json({ error: "Missing jobId" });
+            return;
+          }
+          const partName = data?.fileName || "results.csv";
+          const part = Number(data?.part || 0);
+          const parts = Number(data?.parts || 1);
+          const partBucket = admin.storage().bucket();
+          const partPrefix = `scrape-results/${jobId}/parts/${partName}`;
+          await partBucket.file(`${partPrefix}.${part}`).save(data?.csv || "", {
+            metadata: { contentType: "text/csv" },
+          });
+          if (part < parts - 1) {
+            res.status(200).json({ success: true, part });
+            return;
+          }
+
+          // Cloud Storage composes at most 32 objects per call.
+          const partPath = `scrape-results/${jobId}/${partName}`;
+          const target = partBucket.file(partPath);
+          const sources = Array.from({ length: parts }, (_, i) =>
+            partBucket.file(`${partPrefix}.${i}`)
+          );
+          await partBucket.combine(sources.splice(0, 32), target);
+          while (sources.length) {
+            await partBucket.combine([target, ...sources.splice(0, 31)], target);
+          }
+          await target.setMetadata({ contentType: "text/csv" });
+          await partBucket.deleteFiles({ prefix: `${partPrefix}.` });
+
+          await target.makePublic();
+          const partCsvUrl = `https://storage.googleapis.com/${partBucket.name}/${partPath}`;
+          await db.collection(COLLECTION).doc(jobId).update({
+            csvUrl: partCsvUrl,
+            updatedAt: admin.firestore.FieldValue.serverTimestamp(),
+          });
+          res.status(200).json({ success: true, part, csvUrl: partCsvUrl });
+          return;
+        }
+
         // Upload CSV content and store as a download URL via base64
         case "uploadCsv": {
           if (!jobId) {
@@ -7677,6 +7816,7 @@ export const scraperApi = onRequest(
             res.status(404).json({ error: "Job not found" });
             return;
           }
+          await db.recursiveDelete(rerunRef.collection(SCRAPE_RESULTS));
           await rerunRef.update({
             status: "created",
             progress: {
@@ -7690,7 +7830,7 @@ export const scraperApi = onRequest(
               totalWithEmail: 0,
               totalWithWebsite: 0,
             },
-            results: [],
+            results: admin.firestore.FieldValue.delete(),
             totalResults: 0,
             csvUrl: "",
             updatedAt: admin.firestore.FieldValue.serverTimestamp(),
@@ -7706,7 +7846,8 @@ export const scraperApi = onRequest(
             res.status(400).json({ error: "Missing jobId" });
             return;
           }
-          await db.collection(COLLECTION).doc(jobId).delete();
+          // Takes the job's result documents with it.
+          await db.recursiveDelete(db.collection(COLLECTION).doc(jobId));
           res.status(200).json({ success: true });
           return;
         }
@@ -7800,7 +7941,7 @@ export const verifyOutreachEmails = onCall(
     if (!jobSnap.exists) throw new HttpsError("not-found", "Job not found");
 
     const jobData = jobSnap.data()!;
-    const results: any[] = jobData.results || [];
+    const { results, refs, legacy } = await loadScrapeResults(jobRef, jobData);
     console.log(`[verifyOutreachEmails] Job ${jobId}: ${results.length} total results`);
 
     const emailsToVerify: string[] = [];
@@ -7892,6 +8033,7 @@ export const verifyOutreachEmails = onCall(
     const now = new Date().toISOString();
     const summary = { deliverable: 0, risky: 0, undeliverable: 0, unknown: 0 };
     let matched = 0;
+    const changed = new Set<number>();
 
     for (const br of allBouncerResults) {
       const email = (br.email || "").trim().toLowerCase();
@@ -7913,12 +8055,31 @@ export const verifyOutreachEmails = onCall(
 
       for (const idx of indices) {
         results[idx].emailVerification = verification;
+        changed.add(idx);
       }
     }
 
     console.log(`[verifyOutreachEmails] Matched ${matched}/${allBouncerResults.length} results. Summary: ${JSON.stringify(summary)}`);
 
-    await jobRef.update({ results });
+    const deliverableCount = results.filter(
+      (r: any) =>
+        r.emailVerification?.status === "deliverable" ||
+        r.emailVerification?.status === "custom"
+    ).length;
+    if (legacy) {
+      await jobRef.update({ results, deliverableCount });
+    } else {
+      // Only the verified rows are written, one result document each.
+      const indices = Array.from(changed);
+      for (let i = 0; i < indices.length; i += FIRESTORE_BATCH_LIMIT) {
+        const batch = db.batch();
+        for (const idx of indices.slice(i, i + FIRESTORE_BATCH_LIMIT)) {
+          batch.update(refs[idx], { emailVerification: results[idx].emailVerification });
+        }
+        await batch.commit();
+      }
+      await jobRef.update({ deliverableCount });
+    }
     console.log(`[verifyOutreachEmails] Saved updated results to Firestore`);
 
     return {
@@ -8148,7 +8309,7 @@ export const populateOutreachRecipients = onCall(async (request) => {
   const jobDoc = await db.collection("scrape-jobs").doc(campaign.jobId).get();
   if (!jobDoc.exists) throw new HttpsError("not-found", "Scrape job not found");
 
-  const results: any[] = jobDoc.data()!.results || [];
+  const { results } = await loadScrapeResults(jobDoc.ref, jobDoc.data());
   const existingRecipients = await db.collection(`outreach-campaigns/${campaignId}/recipients`).get();
   const existingEmails = new Set(existingRecipients.docs.map((d) => d.data().email?.toLowerCase()));
   const existingPlaceIds = new Set(existingRecipients.docs.map((d) => d.data().placeId).filter(Boolean));
@@ -8262,7 +8423,7 @@ export const syncOutreachRecipients = onCall(async (request) => {
   const jobDoc = await db.collection("scrape-jobs").doc(campaign.jobId).get();
   if (!jobDoc.exists) throw new HttpsError("not-found", "Scrape job not found");
 
-  const results: any[] = jobDoc.data()!.results || [];
+  const { results } = await loadScrapeResults(jobDoc.ref, jobDoc.data());
   const existingRecipients = await db.collection(`outreach-campaigns/${campaignId}/recipients`).get();
   const existingEmails = new Set(existingRecipients.docs.map((d) => d.data().email?.toLowerCase()));
   const existingPlaceIds = new Set(existingRecipients.docs.map((d) => d.data().placeId).filter(Boolean));
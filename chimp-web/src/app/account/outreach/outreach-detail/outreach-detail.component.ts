@@ -202,14 +202,14 @@ export class OutreachDetailComponent implements OnInit, OnDestroy {
         delete row.emailVerification;
         if (trimmed) row.skipped = false;
       }
-      this.service.updateResult(this.job.id, this.job.results);
+      this.service.updateResults(this.job, [row]);
     }
     this.editingCell = null;
   }
 
   skipResult(row: ScrapeJobResult): void {
     row.skipped = true;
-    this.service.updateResult(this.job.id, this.job.results);
+    this.service.updateResults(this.job, [row]);
     this.applyFilter();
   }
 
@@ -281,7 +281,7 @@ export class OutreachDetailComponent implements OnInit, OnDestroy {
       reason: "manual",
       verifiedAt: new Date().toISOString(),
     };
-    this.service.updateResult(this.job.id, this.job.results);
+    this.service.updateResults(this.job, [row]);
 
     this.campaignService
       .addVerifiedContactToCampaign(this.job.id, {
@@ -62,12 +62,7 @@ export class OutreachListComponent implements OnInit, OnDestroy {
   }
 
   getDeliverableCount(job: ScrapeJob): number {
-    if (!job.results?.length) return 0;
-    return job.results.filter(
-      (r) =>
-        r.emailVerification?.status === "deliverable" ||
-        r.emailVerification?.status === "custom"
-    ).length;
+    return this.service.getDeliverableCount(job);
   }
 
   ngOnDestroy() {
@@ -1,5 +1,5 @@
 import { Injectable } from "@angular/core";
-import { Observable, of } from "rxjs";
+import { Observable, combineLatest, of } from "rxjs";
 import {
   Firestore,
   collection,
@@ -9,7 +9,9 @@ import {
   query,
   orderBy,
   deleteDoc,
+  getDocs,
   updateDoc,
+  writeBatch,
 } from "@angular/fire/firestore";
 import { Functions, httpsCallable } from "@angular/fire/functions";
 import { map, catchError } from "rxjs/operators";
@@ -34,6 +36,7 @@ export interface EmailVerification {
 }
 
 export interface ScrapeJobResult {
+  placeId: string;
   name: string;
   phone: string;
   email: string;
@@ -53,6 +56,10 @@ export interface ScrapeJob {
   totalResults: number;
   csvUrl: string;
   results: ScrapeJobResult[];
+  /** Results are still an array on the job doc (jobs from before per-row docs). */
+  resultsLegacy?: boolean;
+  /** Deliverable or custom emails, kept up to date when results change. */
+  deliverableCount?: number;
   createdAt: Date;
   updatedAt: Date;
   lastHeartbeat: Date;
@@ -103,10 +110,11 @@ export class OutreachService {
   }
 
   getJob(jobId: string): Observable<ScrapeJob> {
-    return docData(doc(this.db, `scrape-jobs/${jobId}`), {
-      idField: "id",
-    }).pipe(
-      map((data: any) => {
+    return combineLatest([
+      docData(doc(this.db, `scrape-jobs/${jobId}`), { idField: "id" }),
+      collectionData(collection(this.db, `scrape-jobs/${jobId}/results`)),
+    ]).pipe(
+      map(([data, rows]: [any, any[]]) => {
         const createdAt = data.createdAt?.toDate
           ? data.createdAt.toDate()
           : data.createdAt;
@@ -116,7 +124,16 @@ export class OutreachService {
         const lastHeartbeat = data.lastHeartbeat?.toDate
           ? data.lastHeartbeat.toDate()
           : data.lastHeartbeat;
-        return { ...data, createdAt, updatedAt, lastHeartbeat } as ScrapeJob;
+        const resultsLegacy = !rows.length && !!data.results?.length;
+        const results = resultsLegacy ? data.results : rows;
+        return {
+          ...data,
+          results,
+          resultsLegacy,
+          createdAt,
+          updatedAt,
+          lastHeartbeat,
+        } as ScrapeJob;
       }),
       catchError((error) => {
         console.error("Error loading scrape job:", error);
@@ -125,20 +142,54 @@ export class OutreachService {
     );
   }
 
-  updateResult(jobId: string, results: ScrapeJobResult[]): Promise<void> {
-    return updateDoc(doc(this.db, `scrape-jobs/${jobId}`), { results }).catch(
-      (error) => {
-        console.error("Error updating result:", error);
-        throw error;
+  /** Save edited rows. Each row is its own document, so only those are written. */
+  async updateResults(job: ScrapeJob, rows: ScrapeJobResult[]): Promise<void> {
+    const jobRef = doc(this.db, `scrape-jobs/${job.id}`);
+    const deliverableCount = this.getDeliverableCount(job);
+    try {
+      if (job.resultsLegacy) {
+        await updateDoc(jobRef, { results: job.results, deliverableCount });
+        return;
       }
-    );
+      for (let i = 0; i < rows.length; i += 499) {
+        const batch = writeBatch(this.db);
+        for (const row of rows.slice(i, i + 499)) {
+          batch.set(
+            doc(this.db, `scrape-jobs/${job.id}/results/${encodeURIComponent(row.placeId)}`),
+            row
+          );
+        }
+        batch.update(jobRef, { deliverableCount });
+        await batch.commit();
+      }
+    } catch (error) {
+      console.error("Error updating result:", error);
+      throw error;
+    }
   }
 
-  deleteJob(jobId: string): Promise<void> {
-    return deleteDoc(doc(this.db, `scrape-jobs/${jobId}`)).catch((error) => {
+  getDeliverableCount(job: ScrapeJob): number {
+    if (!job.results?.length) return job.deliverableCount ?? 0;
+    return job.results.filter(
+      (r) =>
+        r.emailVerification?.status === "deliverable" ||
+        r.emailVerification?.status === "custom"
+    ).length;
+  }
+
+  async deleteJob(jobId: string): Promise<void> {
+    try {
+      const rows = await getDocs(collection(this.db, `scrape-jobs/${jobId}/results`));
+      for (let i = 0; i < rows.docs.length; i += 500) {
+        const batch = writeBatch(this.db);
+        rows.docs.slice(i, i + 500).forEach((d) => batch.delete(d.ref));
+        await batch.commit();
+      }
+      await deleteDoc(doc(this.db, `scrape-jobs/${jobId}`));
+    } catch (error) {
       console.error("Error deleting scrape job:", error);
       throw error;
-    });
+    }
   }
 
   getStatusLabel(status: string, job?: ScrapeJob): string {
@@ -222,19 +273,18 @@ export class OutreachService {
   /** Sanitize all email fields in a job's results and save back to Firestore. */
   async sanitizeEmails(job: ScrapeJob): Promise<number> {
     if (!job?.results?.length) return 0;
-    let changed = 0;
-    const cleaned = job.results.map((r) => {
+    const changed: ScrapeJobResult[] = [];
+    for (const r of job.results) {
       const sanitized = this.cleanEmailField(r.email || "");
       if (sanitized !== (r.email || "")) {
-        changed++;
-        return { ...r, email: sanitized };
+        r.email = sanitized;
+        changed.push(r);
       }
-      return r;
-    });
-    if (changed > 0) {
-      await this.updateResult(job.id, cleaned);
     }
-    return changed;
+    if (changed.length > 0) {
+      await this.updateResults(job, changed);
+    }
+    return changed.length;
   }
 
   async verifyEmails(jobId: string): Promise<VerifyEmailsResult> {
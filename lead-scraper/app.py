@@ -14,6 +14,7 @@ Usage:
 """
 
 import asyncio
+import concurrent.futures
 import json
 import subprocess
 import threading
@@ -24,13 +25,25 @@ from datetime import datetime, timezone
 
 from flask import Flask, render_template, request, jsonify, send_file, redirect
 
+import exporter
+from browser_pool import BrowserPool
+from firebase_sync import FirebaseSync
+from lead_index import LeadIndex
 from scraper import ScrapeJob, FirebaseAPI, REGIONS, STATE_BOUNDS, PLACE_TYPES, EXCLUDED_PRIMARY_TYPES
 
 app = Flask(__name__)
 
 # In-memory registry of LOCAL running/resumable jobs
 JOBS: dict[str, ScrapeJob] = {}
-JOB_THREADS: dict[str, threading.Thread] = {}
+JOB_TASKS: dict[str, concurrent.futures.Future] = {}
+
+# Every job runs on this one event loop (in a background thread), so all of
+# them share a single BrowserPool: Playwright objects are bound to the loop
+# that created them. A blocking call on the loop stalls every job, so
+# Firebase requests, cache writes and the export run in worker threads
+# (asyncio.to_thread) or on FirebaseSync's sender thread.
+ENGINE_LOOP = asyncio.new_event_loop()
+threading.Thread(target=ENGINE_LOOP.run_forever, name='scrape-engine', daemon=True).start()
 
 # Cache of cloud jobs (refreshed on each poll)
 CLOUD_JOBS_CACHE: list = []
@@ -60,6 +73,41 @@ def _get_firebase_api() -> FirebaseAPI:
     return FirebaseAPI(settings.get('firebase_url', ''))
 
 
+def _apply_scan_settings(job: ScrapeJob, settings: dict):
+    """Apply optional scan/scrape engine tuning (settings.json) to a job."""
+    job.scan_concurrency = int(settings.get('scan_concurrency') or ScrapeJob.SCAN_CONCURRENCY)
+    job.scan_qps = float(settings.get('scan_qps') or ScrapeJob.SCAN_QPS)
+    job.scrape_concurrency = int(settings.get('scrape_concurrency') or ScrapeJob.SCRAPE_CONCURRENCY)
+    job.scrape_rate = float(settings.get('scrape_rate') or ScrapeJob.SCRAPE_RATE)
+    job.scrape_blocking = settings.get('scrape_blocking', ScrapeJob.SCRAPE_BLOCKING)
+    job.email_blocking = settings.get('email_blocking', ScrapeJob.EMAIL_BLOCKING)
+    job.email_concurrency = int(settings.get('email_concurrency') or ScrapeJob.EMAIL_CONCURRENCY)
+    pipeline = settings.get('pipeline')
+    job.pipeline = pipeline if pipeline in ScrapeJob.PIPELINE_MODES else ScrapeJob.PIPELINE
+    job.pipeline_queue_size = int(settings.get('pipeline_queue_size') or ScrapeJob.PIPELINE_QUEUE_SIZE)
+    formats = settings.get('export_formats') or ScrapeJob.EXPORT_FORMATS
+    job.export_formats = ('csv',) + tuple(f for f in formats if f in exporter.FORMATS and f != 'csv')
+    fresh_days = settings.get('lead_index_fresh_days')
+    job.lead_index_fresh_days = float(ScrapeJob.LEAD_INDEX_FRESH_DAYS if fresh_days is None else fresh_days)
+
+
+def _launch(job_id: str, job: ScrapeJob, coro):
+    """Run a job pipeline coroutine on the shared engine loop."""
+    async def runner():
+        try:
+            await coro
+        except Exception as e:
+            job.log(f"Error: {e}")
+            job.status = 'error'
+
+    JOB_TASKS[job_id] = asyncio.run_coroutine_threadsafe(runner(), ENGINE_LOOP)
+
+
+def _is_running(job_id: str) -> bool:
+    task = JOB_TASKS.get(job_id)
+    return bool(task and not task.done())
+
+
 def _discover_and_register_resumable():
     """On startup, find interrupted jobs and register them (but don't run them)."""
     settings = load_settings()
@@ -104,13 +152,47 @@ def index():
 
 @app.route('/api/estimate')
 def api_estimate():
-    """Return estimated API cost for a region scan."""
+    """Return estimated API cost for a region scan.
+
+    With ?job=<id>, estimate expanding that job: only the cells it has not
+    already scanned are counted.
+    """
     region_key = request.args.get('region', 'utah')
-    result = ScrapeJob.estimate_scan_cost(region_key)
-    result['cost_per_request'] = ScrapeJob.COST_PER_REQUEST
+    scan_mode = request.args.get('mode', 'grid')
+    enrichment = request.args.get('enrichment', 'browser')
+    job = JOBS.get(request.args.get('job', ''))
+    if job:
+        result = job.estimate_expansion_cost(region_key)
+    else:
+        result = ScrapeJob.estimate_scan_cost(region_key, scan_mode=scan_mode, enrichment=enrichment)
+    result['cost_per_request'] = ScrapeJob.cost_per_request(result.get('enrichment', 'browser'))
     return jsonify(result)
 
 
+@app.route('/api/coverage')
+def api_coverage():
+    """Per-region report of grid cells (and paid calls) skipped by the land mask."""
+    return jsonify(ScrapeJob.coverage_report())
+
+
+@app.route('/api/leads')
+def api_leads():
+    """Search the cross-job lead index: /api/leads?q=smith dental&limit=50."""
+    index = LeadIndex.shared(DATA_DIR)
+    limit = max(1, min(request.args.get('limit', 50, type=int), 500))
+    return jsonify({
+        'q': request.args.get('q', ''),
+        'results': index.search(request.args.get('q', ''), limit),
+        'indexed': index.count(),
+    })
+
+
+@app.route('/api/sync-stats')
+def api_sync_stats():
+    """Queue depth and send latency of the background Firebase senders."""
+    return jsonify(FirebaseSync.all_stats())
+
+
 @app.route('/api/billing')
 def api_billing():
     """Return current-month Google Places API usage and cost via Cloud Monitoring."""
@@ -224,6 +306,8 @@ def api_start():
     niche = data.get('niche', '').strip()
     niche_type = data.get('niche_type', '').strip()
     region_key = data.get('region', 'utah')
+    scan_mode = data.get('scan_mode', 'grid')
+    enrichment = data.get('enrichment', 'browser')
     api_key = data.get('api_key', '').strip()
     firebase_url = data.get('firebase_url', '').strip()
 
@@ -231,6 +315,10 @@ def api_start():
         return jsonify({'error': 'Niche is required'}), 400
     if not api_key:
         return jsonify({'error': 'Google Places API key is required'}), 400
+    if scan_mode not in ScrapeJob.SCAN_MODES:
+        return jsonify({'error': f'Unknown scan mode: {scan_mode}'}), 400
+    if enrichment not in ScrapeJob.ENRICHMENT_MODES:
+        return jsonify({'error': f'Unknown enrichment mode: {enrichment}'}), 400
 
     # Save settings for next time
     save_settings({'api_key': api_key, 'firebase_url': firebase_url})
@@ -251,23 +339,13 @@ def api_start():
         api_key=api_key,
         firebase_url=firebase_url,
         data_dir=DATA_DIR,
+        scan_mode=scan_mode,
+        enrichment=enrichment,
     )
+    _apply_scan_settings(job, load_settings())
     JOBS[job_id] = job
 
-    def run_job():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(job.run())
-        except Exception as e:
-            job.log(f"Error: {e}")
-            job.status = 'error'
-        finally:
-            loop.close()
-
-    t = threading.Thread(target=run_job, daemon=True)
-    JOB_THREADS[job_id] = t
-    t.start()
+    _launch(job_id, job, job.run())
 
     return jsonify({'success': True, 'jobId': job_id})
 
@@ -283,30 +361,17 @@ def api_resume(job_id):
         return jsonify({'error': 'Job cannot be resumed'}), 400
 
     # Check if already running
-    thread = JOB_THREADS.get(job_id)
-    if thread and thread.is_alive():
+    if _is_running(job_id):
         return jsonify({'error': 'Job is already running'}), 400
 
     # Update API key and firebase URL from current settings
     settings = load_settings()
     job.api_key = settings.get('api_key', job.api_key)
     job.fb = FirebaseAPI(settings.get('firebase_url', ''))
+    _apply_scan_settings(job, settings)
     job.should_stop = False
 
-    def run_resume():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(job.resume())
-        except Exception as e:
-            job.log(f"Error: {e}")
-            job.status = 'error'
-        finally:
-            loop.close()
-
-    t = threading.Thread(target=run_resume, daemon=True)
-    JOB_THREADS[job_id] = t
-    t.start()
+    _launch(job_id, job, job.resume())
 
     return jsonify({'success': True, 'jobId': job_id})
 
@@ -323,8 +388,7 @@ def api_expand(job_id):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
-    thread = JOB_THREADS.get(job_id)
-    if thread and thread.is_alive():
+    if _is_running(job_id):
         return jsonify({'error': 'Job is currently running'}), 400
 
     data = request.json or {}
@@ -338,25 +402,13 @@ def api_expand(job_id):
     settings = load_settings()
     job.api_key = settings.get('api_key', job.api_key)
     job.fb = FirebaseAPI(settings.get('firebase_url', ''))
+    _apply_scan_settings(job, settings)
     job.should_stop = False
 
     if not job.expand_region(new_region_key):
         return jsonify({'error': f'Unknown region: {new_region_key}'}), 400
 
-    def run_expanded():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(job.resume())
-        except Exception as e:
-            job.log(f"Error: {e}")
-            job.status = 'error'
-        finally:
-            loop.close()
-
-    t = threading.Thread(target=run_expanded, daemon=True)
-    JOB_THREADS[job_id] = t
-    t.start()
+    _launch(job_id, job, job.resume())
 
     return jsonify({'success': True, 'jobId': job_id, 'new_region': job.region})
 
@@ -375,30 +427,17 @@ def api_rerun(job_id):
         return jsonify({'error': 'Job not found'}), 404
 
     # Don't re-run a job that's actively running
-    thread = JOB_THREADS.get(job_id)
-    if thread and thread.is_alive():
+    if _is_running(job_id):
         return jsonify({'error': 'Job is currently running'}), 400
 
     # Refresh credentials from current settings
     settings = load_settings()
     job.api_key = settings.get('api_key', job.api_key)
     job.fb = FirebaseAPI(settings.get('firebase_url', ''))
+    _apply_scan_settings(job, settings)
     job.should_stop = False
 
-    def run_rerun():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            loop.run_until_complete(job.clear_and_rerun())
-        except Exception as e:
-            job.log(f"Error: {e}")
-            job.status = 'error'
-        finally:
-            loop.close()
-
-    t = threading.Thread(target=run_rerun, daemon=True)
-    JOB_THREADS[job_id] = t
-    t.start()
+    _launch(job_id, job, job.clear_and_rerun())
 
     return jsonify({'success': True, 'jobId': job_id})
 
@@ -548,13 +587,31 @@ def download_excluded_csv(job_id):
     return 'Excluded CSV not available', 404
 
 
+@app.route('/download-xlsx/<job_id>')
+def download_xlsx(job_id):
+    """Download the Excel workbook (leads and excluded sheets) for a job."""
+    job = JOBS.get(job_id)
+    if job and job.xlsx_file.exists():
+        return send_file(job.xlsx_file, as_attachment=True,
+                         download_name=job.xlsx_file.name)
+    return 'Excel file not available', 404
+
+
 # =========================================================================
 #  Main
 # =========================================================================
 
 if __name__ == '__main__':
+    # Browser pool limits apply to all jobs, so they are read once at startup
+    settings = load_settings()
+    BrowserPool.MAX_PAGES = int(settings.get('browser_max_pages') or BrowserPool.MAX_PAGES)
+    BrowserPool.RECYCLE_AFTER = int(settings.get('browser_recycle_after') or BrowserPool.RECYCLE_AFTER)
+
     # Discover interrupted jobs on startup
     _discover_and_register_resumable()
+    # Bring the lead index up to date with every job's data (incremental)
+    threading.Thread(target=LeadIndex.shared(DATA_DIR).update_from_data_dir,
+                     args=(DATA_DIR,), daemon=True).start()
     resumable_count = sum(1 for j in JOBS.values() if j.can_resume)
 
     # Quick cloud check
@@ -0,0 +1,147 @@
+"""
+Process-wide Chromium pool shared by every job's detail and email steps.
+
+One browser is launched on first use and kept for the life of the event
+loop, so neither pipeline steps nor jobs pay a cold start each. Callers
+lease a context + page for one unit of work (a place, a website):
+
+    async with BrowserPool.get().lease('maps', stats) as lease:
+        await lease.page.goto(...)
+
+- MAX_PAGES caps open leases across all jobs; further callers wait.
+- Idle contexts are reused per blocking profile, and a context is closed
+  after RECYCLE_AFTER navigations to bound renderer memory.
+- lease.discard() drops a context that looks broken instead of reusing it.
+
+Playwright objects belong to the event loop that created them, so there is
+one pool per loop; the web UI runs every job on one shared loop.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from playwright.async_api import async_playwright
+
+import browser_profile
+
+
+class Lease:
+    """A context + page checked out of the pool."""
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self.ctx = None
+        self.page = None
+        self.stats = None  # PageStats charged for this lease's traffic
+        self.navigations = 0
+        self.discarded = False
+
+    def _navigated(self, frame):
+        if frame.parent_frame is None:
+            self.navigations += 1
+
+    def discard(self):
+        self.discarded = True
+
+
+class BrowserPool:
+    """Shared browser with a global page cap and context recycling."""
+
+    MAX_PAGES = 8
+    RECYCLE_AFTER = 100
+
+    _pools: dict = {}
+
+    def __init__(self, max_pages: int, recycle_after: int):
+        self.max_pages = max_pages
+        self.recycle_after = recycle_after
+        self._slots = asyncio.Semaphore(max_pages)
+        self._idle: dict[str, list[Lease]] = {}
+        self._start_lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self.launches = 0
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self.in_use = 0
+
+    @classmethod
+    def get(cls) -> 'BrowserPool':
+        """The pool for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        pool = cls._pools.get(loop)
+        if pool is None:
+            pool = cls._pools[loop] = cls(cls.MAX_PAGES, cls.RECYCLE_AFTER)
+        return pool
+
+    async def _ensure_browser(self):
+        async with self._start_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                # Contexts of a crashed browser are dead; forget them.
+                self._idle.clear()
+                self._browser = await browser_profile.launch(self._playwright)
+                self.launches += 1
+        return self._browser
+
+    async def _checkout(self, profile: str) -> Lease:
+        browser = await self._ensure_browser()
+        idle = self._idle.get(profile, [])
+        while idle:
+            lease = idle.pop()
+            if not lease.page.is_closed():
+                return lease
+        lease = Lease(profile)
+        lease.ctx = await browser_profile.new_context(browser, profile, lambda: lease.stats)
+        lease.page = await lease.ctx.new_page()
+        lease.page.on('framenavigated', lease._navigated)
+        self.contexts_created += 1
+        return lease
+
+    async def _checkin(self, lease: Lease):
+        worn = lease.navigations >= self.recycle_after
+        alive = self._browser is not None and self._browser.is_connected() and not lease.page.is_closed()
+        if alive and not worn and not lease.discarded:
+            try:
+                # Stop the last page's scripts and timers while it sits idle.
+                await lease.page.goto('about:blank')
+                self._idle.setdefault(lease.profile, []).append(lease)
+                return
+            except Exception:
+                pass
+        if worn:
+            self.contexts_recycled += 1
+        try:
+            await lease.ctx.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def lease(self, profile: str, stats):
+        """Check out a page using blocking `profile`, charging traffic to `stats`."""
+        async with self._slots:
+            lease = await self._checkout(profile)
+            lease.stats = stats
+            self.in_use += 1
+            try:
+                yield lease
+            finally:
+                self.in_use -= 1
+                lease.stats = None
+                await self._checkin(lease)
+
+    async def close(self):
+        for leases in self._idle.values():
+            for lease in leases:
+                try:
+                    await lease.ctx.close()
+                except Exception:
+                    pass
+        self._idle.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
@@ -0,0 +1,138 @@
+"""
+Lean Chromium profile for the detail and email steps.
+
+Both steps only read a handful of DOM attributes or the raw HTML, so pages
+do not need images, map tiles, fonts, video or third-party trackers. Each
+step picks a blocking profile: resource types outside its allow-list and
+URLs matching its deny-list are aborted at the route layer. Every context
+also feeds a PageStats, which counts bytes transferred, blocked requests
+and page-load time so the savings show up in job progress.
+"""
+
+import time
+
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+VIEWPORT = {'width': 1280, 'height': 800}
+
+LAUNCH_ARGS = [
+    '--disable-gpu',
+    '--disable-dev-shm-usage',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+    '--blink-settings=imagesEnabled=false',
+    '--mute-audio',
+    '--no-first-run',
+]
+
+# Hosts and paths that never carry a field we read.
+TRACKERS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'googleadservices.com', 'facebook.net',
+    'connect.facebook.com', 'hotjar.com', 'clarity.ms', 'segment.io',
+    '/gen_204', '/log?', 'play.google.com/log',
+)
+
+# allow: resource types that may load; block_urls: substrings aborted even
+# when their type is allowed (tiles and photos often arrive as fetch/xhr).
+BLOCK_PROFILES = {
+    # Google Maps place panel: the app shell and its data calls, nothing else.
+    'maps': {
+        'allow': {'document', 'script', 'xhr', 'fetch', 'stylesheet'},
+        'block_urls': TRACKERS + ('/maps/vt', '/kh/', 'khms', 'streetviewpixels',
+                                  'googleusercontent.com', '/maps/preview/log'),
+    },
+    # Business websites: HTML plus scripts for sites that render client-side.
+    'site': {
+        'allow': {'document', 'script', 'xhr', 'fetch'},
+        'block_urls': TRACKERS + ('youtube.com/embed', 'player.vimeo.com',
+                                  'maps.googleapis.com', 'google.com/maps/embed'),
+    },
+}
+
+
+class PageStats:
+    """Running totals for one step's browser traffic."""
+
+    def __init__(self):
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+        self.page_loads = 0
+        self.load_seconds = 0.0
+
+    @classmethod
+    def restore(cls, progress: dict, prefix: str) -> 'PageStats':
+        """Continue the totals a previous run left in job progress."""
+        stats = cls()
+        stats.bytes = progress.get(f'{prefix}Bytes', 0)
+        stats.blocked = progress.get(f'{prefix}Blocked', 0)
+        stats.page_loads = progress.get(f'{prefix}PageLoads', 0)
+        stats.load_seconds = stats.page_loads * progress.get(f'{prefix}AvgLoadMs', 0) / 1000
+        return stats
+
+    @property
+    def avg_load_ms(self) -> int:
+        return round(self.load_seconds * 1000 / self.page_loads) if self.page_loads else 0
+
+    def as_progress(self, prefix: str) -> dict:
+        return {
+            f'{prefix}Bytes': self.bytes,
+            f'{prefix}Blocked': self.blocked,
+            f'{prefix}PageLoads': self.page_loads,
+            f'{prefix}AvgLoadMs': self.avg_load_ms,
+        }
+
+
+async def launch(playwright):
+    return await playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+
+
+async def new_context(browser, profile: str | None, get_stats):
+    """A context that applies `profile` (None blocks nothing).
+
+    Traffic is charged to the PageStats `get_stats()` returns at the time,
+    so a pooled context can serve several jobs in turn.
+    """
+    ctx = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT,
+                                    service_workers='block')
+    rules = BLOCK_PROFILES.get(profile) if profile else None
+
+    if rules:
+        async def route(r):
+            req = r.request
+            if req.resource_type not in rules['allow'] or any(u in req.url for u in rules['block_urls']):
+                stats = get_stats()
+                if stats:
+                    stats.blocked += 1
+                await r.abort()
+            else:
+                await r.continue_()
+        await ctx.route('**/*', route)
+
+    async def finished(request):
+        stats = get_stats()
+        if not stats:
+            return
+        stats.requests += 1
+        try:
+            sizes = await request.sizes()
+            stats.bytes += sizes['responseBodySize'] + sizes['responseHeadersSize']
+        except Exception:
+            pass
+    ctx.on('requestfinished', finished)
+    return ctx
+
+
+async def goto(page, url: str, stats: PageStats, **kwargs):
+    """page.goto that records the load time in `stats`."""
+    started = time.monotonic()
+    try:
+        return await page.goto(url, **kwargs)
+    finally:
+        stats.page_loads += 1
+        stats.load_seconds += time.monotonic() - started
@@ -0,0 +1,197 @@
+"""
+Streaming export of a job's results from its job store.
+
+Rows go straight from SQLite (JobStore.iter_results / iter_excluded) to
+every output file in one pass, so memory stays flat however large the
+job. The sort by business name happens in SQLite, which spills to
+temporary files when it outgrows its cache.
+
+Outputs, for a base path like <project_dir>/<slug>:
+- csv:     <slug>.csv and, if any places were filtered out, <slug>_excluded.csv
+- xlsx:    <slug>.xlsx with 'Leads' and 'Excluded' sheets (openpyxl write-only mode)
+- parquet: <slug>.parquet and <slug>_excluded.parquet (needs pyarrow; skipped
+           with a log line when it is not installed)
+
+Run as a script to benchmark a synthetic job:
+    python exporter.py 100000
+"""
+
+import csv
+from pathlib import Path
+
+FORMATS = ('csv', 'xlsx', 'parquet')
+
+LEAD_COLUMNS = ('Place ID', 'Business Name', 'Phone', 'Email', 'Website', 'Address', 'Google Maps')
+EXCLUDED_COLUMNS = ('Place ID', 'Business Name', 'Excluded Reason (Google Type)', 'Google Maps')
+
+PARQUET_BATCH_ROWS = 10_000
+
+
+class _CsvOutput:
+    def __init__(self, base: Path):
+        self.leads_path = Path(f'{base}.csv')
+        self.excluded_path = Path(f'{base}_excluded.csv')
+        self.files = [self.leads_path]
+        self._leads_file = open(self.leads_path, 'w', newline='', encoding='utf-8')
+        self._leads = csv.writer(self._leads_file, lineterminator='\n')
+        self._leads.writerow(LEAD_COLUMNS)
+        self._excluded_file = None
+        self._excluded = None
+
+    def lead(self, row: tuple):
+        self._leads.writerow(row)
+
+    def excluded(self, row: tuple):
+        if self._excluded is None:
+            self._excluded_file = open(self.excluded_path, 'w', newline='', encoding='utf-8')
+            self._excluded = csv.writer(self._excluded_file, lineterminator='\n')
+            self._excluded.writerow(EXCLUDED_COLUMNS)
+            self.files.append(self.excluded_path)
+        self._excluded.writerow(row)
+
+    def close(self):
+        self._leads_file.close()
+        if self._excluded_file:
+            self._excluded_file.close()
+
+
+class _XlsxOutput:
+    def __init__(self, base: Path):
+        from openpyxl import Workbook
+
+        self.path = Path(f'{base}.xlsx')
+        self.files = [self.path]
+        self._book = Workbook(write_only=True)
+        self._leads = self._book.create_sheet('Leads')
+        self._leads.append(LEAD_COLUMNS)
+        self._excluded = self._book.create_sheet('Excluded')
+        self._excluded.append(EXCLUDED_COLUMNS)
+
+    def lead(self, row: tuple):
+        self._leads.append(row)
+
+    def excluded(self, row: tuple):
+        self._excluded.append(row)
+
+    def close(self):
+        self._book.save(self.path)
+
+
+class _ParquetOutput:
+    def __init__(self, base: Path):
+        import pyarrow
+        import pyarrow.parquet
+
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.leads_path = Path(f'{base}.parquet')
+        self.excluded_path = Path(f'{base}_excluded.parquet')
+        self.files = []
+        self._writers = {}
+        self._pending = {'leads': [], 'excluded': []}
+
+    def _flush(self, kind: str):
+        rows = self._pending[kind]
+        if not rows:
+            return
+        columns = LEAD_COLUMNS if kind == 'leads' else EXCLUDED_COLUMNS
+        table = self._pa.table({name: [row[i] for row in rows] for i, name in enumerate(columns)})
+        writer = self._writers.get(kind)
+        if writer is None:
+            path = self.leads_path if kind == 'leads' else self.excluded_path
+            writer = self._writers[kind] = self._pq.ParquetWriter(path, table.schema)
+            self.files.append(path)
+        writer.write_table(table)
+        rows.clear()
+
+    def _add(self, kind: str, row: tuple):
+        self._pending[kind].append(row)
+        if len(self._pending[kind]) >= PARQUET_BATCH_ROWS:
+            self._flush(kind)
+
+    def lead(self, row: tuple):
+        self._add('leads', row)
+
+    def excluded(self, row: tuple):
+        self._add('excluded', row)
+
+    def close(self):
+        for kind in self._pending:
+            self._flush(kind)
+        for writer in self._writers.values():
+            writer.close()
+
+
+_OUTPUTS = {'csv': _CsvOutput, 'xlsx': _XlsxOutput, 'parquet': _ParquetOutput}
+
+
+def export(store, base: Path, formats=('csv',), log=print) -> dict:
+    """Write `store`'s leads and excluded places in each of `formats`.
+
+    Returns {'rows', 'with_phone', 'with_email', 'with_website',
+    'excluded', 'files'}.
+    """
+    outputs = []
+    for fmt in dict.fromkeys(formats):
+        try:
+            outputs.append(_OUTPUTS[fmt](base))
+        except ImportError as e:
+            log(f"  Skipping {fmt} export: {e.name} is not installed")
+
+    stats = {'rows': 0, 'with_phone': 0, 'with_email': 0, 'with_website': 0, 'excluded': 0, 'files': []}
+    try:
+        for pid, info, emails in store.iter_results(by_name=True):
+            row = (pid, info['name'], info['phone'], '; '.join(emails), info['website'],
+                   info['address'], info['google_maps_url'])
+            stats['rows'] += 1
+            stats['with_phone'] += bool(row[2])
+            stats['with_email'] += bool(row[3])
+            stats['with_website'] += bool(row[4])
+            for out in outputs:
+                out.lead(row)
+        for pid, name, primary_type, maps_url in store.iter_excluded():
+            stats['excluded'] += 1
+            row = (pid, name, primary_type, maps_url)
+            for out in outputs:
+                out.excluded(row)
+    finally:
+        for out in outputs:
+            out.close()
+    stats['files'] = [str(f) for out in outputs for f in out.files]
+    return stats
+
+
+if __name__ == '__main__':
+    import sys
+    import tempfile
+    import time
+    import tracemalloc
+
+    from job_store import JobStore
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    formats = sys.argv[2].split(',') if len(sys.argv) > 2 else FORMATS
+    with tempfile.TemporaryDirectory() as tmp:
+        store = JobStore(Path(tmp) / 'job.db')
+        ids = [f'place{i:07d}' for i in range(n)]
+        store.record_cell('bench', ids=ids, excluded=[{'id': f'x{i}', 'primaryType': 'church'}
+                                                      for i in range(n // 10)])
+        store.put_details([{'place_id': pid, 'name': f'Business {(i * 7919) % n}',
+                            'phone': '(555) 010-0000' if i % 2 else '',
+                            'website': f'https://site{i}.example' if i % 3 else '',
+                            'address': f'{i} Main St', 'google_maps_url': f'https://maps.google.com/?cid={i}'}
+                           for i, pid in enumerate(ids)])
+        store.put_email_groups([([pid], [f'info@site{i}.example']) for i, pid in enumerate(ids) if i % 5 == 0])
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = export(store, Path(tmp) / 'bench', formats)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        store.close()
+
+        print(f"{result['rows']} leads, {result['excluded']} excluded, formats {', '.join(formats)}")
+        print(f"  {elapsed:.1f}s, peak traced memory {peak / 1e6:.1f} MB")
+        for f in result['files']:
+            print(f"  {Path(f).name}: {Path(f).stat().st_size / 1e6:.1f} MB")
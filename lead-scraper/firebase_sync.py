@@ -0,0 +1,335 @@
+"""
+Background sender for job updates to the Firebase Cloud Function.
+
+Progress updates used to be POSTed inline from the scan and scrape loops,
+so a slow or flapping Cloud Function stalled scraping for up to the
+request timeout on every call. Now jobs hand their updates to the
+process-wide sender for the function URL and carry on:
+
+    FirebaseSync.get(url).update(job_id, {'status': ..., 'progress': {...}})
+
+- Updates queued for a job coalesce into the latest: status and other
+  fields are replaced, progress keys are merged.
+- A sender thread posts every SEND_INTERVAL seconds, with up to MAX_BATCH
+  jobs' updates in one batchUpdateJobs call (one updateJob call when only
+  one job is waiting, or if the deployed function predates batching).
+- Failed sends go back under any newer updates and are retried with
+  exponential backoff.
+- Result rows queued with upload_rows() are keyed by placeId (later
+  fields win) and sent with uploadResultsChunk once a job has ROWS_BATCH
+  rows waiting or its oldest has waited ROWS_MAX_WAIT seconds. The cloud
+  keeps one document per place and merges each row into it, so a chunk
+  costs its own rows, fields a row leaves out are kept, and sending a
+  row twice is harmless.
+- All requests, queued or not, share one keep-alive session, and bodies
+  over GZIP_MIN_BYTES are gzipped.
+
+stats() reports queue depth and send latency for /api/sync-stats.
+"""
+
+import atexit
+import gzip
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GZIP_MIN_BYTES = 1024
+
+
+class FirebaseSync:
+    """Pooled, compressed transport plus a coalescing update queue."""
+
+    SEND_INTERVAL = 1.0
+    MAX_BATCH = 20
+    TIMEOUT = (5, 15)  # connect, read
+    RETRY_MAX_SECONDS = 60
+    ROWS_BATCH = 100
+    ROWS_MAX_WAIT = 30
+
+    _senders: dict = {}
+    _senders_lock = threading.Lock()
+
+    def __init__(self, url: str):
+        self.url = url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.batching = True
+        self._pending: dict[str, dict] = {}  # job_id -> coalesced update
+        self._rows: dict[str, dict] = {}  # job_id -> {place_id: row}
+        self._rows_since: dict[str, float] = {}  # job_id -> when its oldest row was queued
+        self._row_acks = {}  # job_id -> callback(rows) after the cloud accepts them
+        self._flushing: dict = {}  # job_id (None for all) -> waiting flush() calls
+        self._in_flight: set[str] = set()  # job_ids being sent
+        self._cond = threading.Condition()
+        self._thread = None
+        self._latencies = deque(maxlen=200)
+        self.requests = 0
+        self.updates_sent = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.max_queued = 0
+        self.bytes_sent = 0
+        self.bytes_raw = 0
+        self.rows_sent = 0
+
+    @classmethod
+    def get(cls, url: str) -> 'FirebaseSync':
+        """The sender for `url`, created on first use."""
+        with cls._senders_lock:
+            sender = cls._senders.get(url)
+            if sender is None:
+                sender = cls._senders[url] = cls(url)
+            return sender
+
+    # -- Transport --
+    def post(self, payload: dict) -> requests.Response:
+        """POST `payload` as JSON on the pooled session, gzipped if large."""
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        headers = {'Content-Type': 'application/json'}
+        raw = len(body)
+        if raw >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=5)
+            headers['Content-Encoding'] = 'gzip'
+        started = time.monotonic()
+        try:
+            return self.session.post(self.url, data=body, headers=headers, timeout=self.TIMEOUT)
+        finally:
+            with self._cond:
+                self._latencies.append(time.monotonic() - started)
+                self.requests += 1
+                self.bytes_raw += raw
+                self.bytes_sent += len(body)
+
+    # -- Queue --
+    def update(self, job_id: str, data: dict):
+        """Queue `data` (an updateJob payload) for `job_id`."""
+        with self._cond:
+            self._merge(job_id, data)
+            self.max_queued = max(self.max_queued, len(self._pending))
+            self._wake()
+
+    def upload_rows(self, job_id: str, rows: list, on_ack=None):
+        """Queue result rows (dicts with a placeId) for `job_id`. A row may
+        carry only some fields; it is merged into the one already queued.
+        on_ack(rows) is called from the sender thread once rows are stored."""
+        with self._cond:
+            self._merge_rows(job_id, rows)
+            if on_ack is not None:
+                self._row_acks[job_id] = on_ack
+            self._wake()
+
+    def _wake(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='firebase-sync', daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _merge_rows(self, job_id: str, rows: list, older: bool = False):
+        queued = self._rows.setdefault(job_id, {})
+        self._rows_since.setdefault(job_id, time.monotonic())
+        for row in rows:
+            current = queued.get(row['placeId'])
+            if current is None:
+                queued[row['placeId']] = dict(row)
+            elif older:
+                queued[row['placeId']] = {**row, **current}
+            else:
+                current.update(row)
+
+    def _rows_due(self) -> str | None:
+        """A job whose queued rows should be sent now."""
+        now = time.monotonic()
+        for job_id, rows in self._rows.items():
+            if (self._flushed(job_id) or len(rows) >= self.ROWS_BATCH
+                    or now - self._rows_since[job_id] >= self.ROWS_MAX_WAIT):
+                return job_id
+        return None
+
+    def _flushed(self, job_id: str) -> bool:
+        return None in self._flushing or job_id in self._flushing
+
+    def _rows_wait(self) -> float | None:
+        if not self._rows_since:
+            return None
+        return max(0.05, min(self._rows_since.values()) + self.ROWS_MAX_WAIT - time.monotonic())
+
+    def _merge(self, job_id: str, data: dict, older: bool = False):
+        current = self._pending.get(job_id)
+        if current is None:
+            current = self._pending[job_id] = {}
+        elif not older:
+            self.coalesced += 1
+        for key, value in data.items():
+            if key == 'progress':
+                progress = current.setdefault('progress', {})
+                if older:
+                    current['progress'] = {**value, **progress}
+                else:
+                    progress.update(value)
+            elif not older or key not in current:
+                current[key] = value
+
+    def flush(self, timeout: float = 30, job_id: str = None) -> bool:
+        """Wait until every queued update and row, or only those for
+        `job_id`, has been sent (or given up on). Other jobs' updates keep
+        their own pace, so a busy job doesn't hold up the flush."""
+        deadline = time.monotonic() + timeout
+
+        def waiting():
+            if job_id is None:
+                return self._pending or self._rows or self._in_flight
+            return job_id in self._pending or job_id in self._rows or job_id in self._in_flight
+
+        with self._cond:
+            self._flushing[job_id] = self._flushing.get(job_id, 0) + 1
+            self._cond.notify_all()
+            try:
+                while waiting():
+                    if self._thread is None or not self._thread.is_alive():
+                        return False
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flushing[job_id] -= 1
+                if not self._flushing[job_id]:
+                    del self._flushing[job_id]
+        return True
+
+    def _run(self):
+        failures = 0
+        while True:
+            with self._cond:
+                while not self._pending and self._rows_due() is None:
+                    self._cond.wait(self._rows_wait())
+                # Jobs someone is flushing go first.
+                job_ids = sorted(self._pending, key=lambda j: not self._flushed(j))[:self.MAX_BATCH]
+                batch = [(job_id, self._pending.pop(job_id)) for job_id in job_ids]
+                rows_job = self._rows_due()
+                rows = []
+                if rows_job is not None:
+                    queued = self._rows[rows_job]
+                    for place_id in list(queued)[:self.ROWS_BATCH]:
+                        rows.append(queued.pop(place_id))
+                    if not queued:
+                        del self._rows[rows_job], self._rows_since[rows_job]
+                on_ack = self._row_acks.get(rows_job)
+                self._in_flight = set(job_ids)
+                if rows:
+                    self._in_flight.add(rows_job)
+
+            ok = self._send(batch) if batch else True
+            rows_ok = self._send_rows(rows_job, rows) if rows else True
+            if rows and rows_ok and on_ack is not None:
+                try:
+                    on_ack(rows)
+                except Exception as e:
+                    print(f"  Firebase sync: row ack failed: {e}")
+
+            with self._cond:
+                if not ok:
+                    for job_id, data in batch:
+                        self._merge(job_id, data, older=True)
+                else:
+                    self.updates_sent += len(batch)
+                if rows_ok is False:
+                    self._merge_rows(rows_job, rows, older=True)
+                elif rows_ok:
+                    self.rows_sent += len(rows)
+                ok = ok and rows_ok is not False
+                if not ok:
+                    self.failures += 1
+                self._in_flight = set()
+                self._cond.notify_all()
+            failures = 0 if ok else failures + 1
+            time.sleep(min(self.RETRY_MAX_SECONDS, self.SEND_INTERVAL * 2 ** failures))
+
+    def _send(self, batch: list) -> bool:
+        try:
+            if len(batch) > 1 and self.batching:
+                r = self.post({'action': 'batchUpdateJobs',
+                               'data': {'updates': [{'jobId': j, 'data': d} for j, d in batch]}})
+                if r.status_code == 400 and 'Unknown action' in r.text:
+                    self.batching = False
+                elif r.status_code == 200:
+                    failed = r.json().get('failed') or []
+                    if failed:
+                        print(f"  Firebase sync: update rejected for {', '.join(failed)}")
+                    return True
+                else:
+                    print(f"  Firebase sync error: {r.status_code} {r.text[:100]}")
+                    return False
+            for job_id, data in batch:
+                r = self.post({'action': 'updateJob', 'jobId': job_id, 'data': data})
+                if r.status_code != 200:
+                    print(f"  Firebase sync error: {r.status_code} {r.text[:100]}")
+                    if r.status_code >= 500:
+                        return False
+            return True
+        except Exception as e:
+            print(f"  Firebase sync error: {e}")
+            return False
+
+    def _send_rows(self, job_id: str, rows: list) -> bool | None:
+        """True once stored, False to retry, None if the rows were refused."""
+        try:
+            r = self.post({'action': 'uploadResultsChunk', 'jobId': job_id, 'data': {'results': rows}})
+            if r.status_code == 200:
+                return True
+            print(f"  Firebase sync error: {r.status_code} {r.text[:100]}")
+            # A bad request or a deleted job won't succeed on retry.
+            if r.status_code < 500 or 'not found' in r.text.lower():
+                return None
+            return False
+        except Exception as e:
+            print(f"  Firebase sync error: {e}")
+            return False
+
+    # -- Metrics --
+    def stats(self) -> dict:
+        with self._cond:
+            last = self._latencies[-1] if self._latencies else 0
+            latencies = sorted(self._latencies)
+            queued = len(self._pending)
+            rows_queued = sum(len(rows) for rows in self._rows.values())
+        ms = lambda s: round(s * 1000)
+        return {
+            'url': self.url,
+            'queued': queued,
+            'maxQueued': self.max_queued,
+            'requests': self.requests,
+            'updatesSent': self.updates_sent,
+            'updatesCoalesced': self.coalesced,
+            'rowsQueued': rows_queued,
+            'rowsSent': self.rows_sent,
+            'failures': self.failures,
+            'bytesSent': self.bytes_sent,
+            'bytesRaw': self.bytes_raw,
+            'lastLatencyMs': ms(last),
+            'avgLatencyMs': ms(sum(latencies) / len(latencies)) if latencies else 0,
+            'p95LatencyMs': ms(latencies[int(len(latencies) * 0.95)]) if latencies else 0,
+        }
+
+    @classmethod
+    def all_stats(cls) -> list:
+        with cls._senders_lock:
+            senders = list(cls._senders.values())
+        return [s.stats() for s in senders]
+
+    @classmethod
+    def flush_all(cls, timeout: float = 10):
+        with cls._senders_lock:
+            senders = list(cls._senders.values())
+        for sender in senders:
+            sender.flush(timeout)
+
+
+# Daemon sender threads die with the process; give queued updates a chance.
+atexit.register(FirebaseSync.flush_all)
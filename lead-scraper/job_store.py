@@ -0,0 +1,455 @@
+"""
+SQLite checkpoint store for one scrape job (<project_dir>/job.db).
+
+Replaces the per-job JSON files (place_ids.json, excluded_ids.json,
+progress.json, scan_journal.jsonl, scraped.json, emails.json and
+job_meta.json), which were loaded and rewritten whole on every item.
+
+- WAL mode: readers (the UI polling job state) never block the writer, and
+  a crash can lose at most the last commit, never corrupt the file.
+- Every unit of work is one transaction: a scanned cell with its place IDs,
+  excluded places and API details; one scraped place; one website's emails
+  for all places sharing it.
+- Calls come from the engine loop, the export thread and Flask request
+  threads, so one connection is shared behind a lock.
+
+import_legacy() moves a pre-SQLite job's JSON state into the database once.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS places (
+    place_id TEXT PRIMARY KEY,
+    found_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS excluded (
+    place_id     TEXT PRIMARY KEY,
+    primary_type TEXT NOT NULL DEFAULT '',
+    name         TEXT NOT NULL DEFAULT '',
+    maps_url     TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS details (
+    place_id   TEXT PRIMARY KEY,
+    name       TEXT NOT NULL DEFAULT '',
+    address    TEXT NOT NULL DEFAULT '',
+    phone      TEXT NOT NULL DEFAULT '',
+    website    TEXT NOT NULL DEFAULT '',
+    maps_url   TEXT NOT NULL DEFAULT '',
+    error      TEXT,
+    scraped_at REAL NOT NULL,
+    source_scraped_at REAL
+);
+CREATE INDEX IF NOT EXISTS details_website ON details (website) WHERE website != '' AND error IS NULL;
+CREATE TABLE IF NOT EXISTS emails (
+    place_id   TEXT PRIMARY KEY,
+    emails     TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scanned (
+    lat REAL NOT NULL,
+    lng REAL NOT NULL,
+    PRIMARY KEY (lat, lng)
+);
+CREATE TABLE IF NOT EXISTS cells (
+    node_key TEXT PRIMARY KEY,
+    count    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS failed_cells (
+    node_key TEXT PRIMARY KEY,
+    error    TEXT NOT NULL,
+    status   INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS uploaded (
+    place_id TEXT PRIMARY KEY,
+    digest   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS summary (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Job summary: counters kept current by triggers in the same transaction as
+# the rows they count, so job state never needs a table scan. Each entry is
+# (summary key, table, SQL value a row contributes given its alias).
+SUMMARY_COUNTERS = (
+    ('places', 'places', '1'),
+    ('excluded', 'excluded', '1'),
+    ('scanned', 'scanned', '1'),
+    ('failed_cells', 'failed_cells', '1'),
+    ('details', 'details', '1'),
+    ('details_ok', 'details', '{r}.error IS NULL'),
+    ('with_phone', 'details', "{r}.error IS NULL AND {r}.phone != ''"),
+    ('with_website', 'details', "{r}.error IS NULL AND {r}.website != ''"),
+    ('emails', 'emails', '1'),
+    ('emails_found', 'emails', "{r}.emails != '[]'"),
+)
+
+
+def _summary_sql() -> str:
+    """CREATE TRIGGER statements that maintain SUMMARY_COUNTERS."""
+    statements = []
+    for table in dict.fromkeys(t for _, t, _ in SUMMARY_COUNTERS):
+        counters = [(key, expr) for key, t, expr in SUMMARY_COUNTERS if t == table]
+        keys = ', '.join(f"'{key}'" for key, _ in counters)
+
+        def delta(row):
+            cases = ' '.join(f"WHEN '{key}' THEN ({expr.format(r=row)})" for key, expr in counters)
+            return f'CASE key {cases} END'
+
+        for event, change in (('INSERT', f"+ {delta('NEW')}"),
+                              ('DELETE', f"- {delta('OLD')}"),
+                              ('UPDATE', f"- {delta('OLD')} + {delta('NEW')}")):
+            statements.append(
+                f'CREATE TRIGGER IF NOT EXISTS {table}_summary_{event.lower()} AFTER {event} ON {table} '
+                f'BEGIN UPDATE summary SET value = value {change} WHERE key IN ({keys}); END;')
+    return '\n'.join(statements)
+
+
+# scraped_at is when the row was written here; source_scraped_at, for a
+# record copied from the lead index, when its source job scraped it.
+DETAIL_COLUMNS = ('place_id', 'name', 'address', 'phone', 'website', 'maps_url', 'error', 'scraped_at',
+                  'source_scraped_at')
+
+# Upserts rather than INSERT OR REPLACE: REPLACE deletes the old row without
+# firing its DELETE trigger, which would throw the summary counters off.
+UPSERT_DETAIL = (f'INSERT INTO details ({", ".join(DETAIL_COLUMNS)}) VALUES ({", ".join("?" * len(DETAIL_COLUMNS))})'
+                 ' ON CONFLICT (place_id) DO UPDATE SET '
+                 + ', '.join(f'{c} = excluded.{c}' for c in DETAIL_COLUMNS[1:]))
+UPSERT_EMAILS = ('INSERT INTO emails VALUES (?, ?, ?) ON CONFLICT (place_id)'
+                 ' DO UPDATE SET emails = excluded.emails, checked_at = excluded.checked_at')
+UPSERT_CELL = 'INSERT INTO cells VALUES (?, ?) ON CONFLICT (node_key) DO UPDATE SET count = excluded.count'
+UPSERT_FAILED = ('INSERT INTO failed_cells VALUES (?, ?, ?, ?) ON CONFLICT (node_key)'
+                 ' DO UPDATE SET error = excluded.error, status = excluded.status, attempts = excluded.attempts')
+INSERT_EXCLUDED = 'INSERT OR IGNORE INTO excluded VALUES (?, ?, ?, ?)'
+
+
+def _detail_record(row) -> dict:
+    """A details row in the shape _scrape_place returns."""
+    if row['error'] is not None:
+        return {'place_id': row['place_id'], 'error': row['error']}
+    return {'place_id': row['place_id'], 'name': row['name'], 'address': row['address'],
+            'phone': row['phone'], 'website': row['website'], 'google_maps_url': row['maps_url']}
+
+
+def _detail_row(record: dict, now: float) -> tuple:
+    return (record['place_id'], record.get('name', ''), record.get('address', ''),
+            record.get('phone', ''), record.get('website', ''),
+            record.get('google_maps_url', ''), record.get('error'), now, record.get('source_scraped_at'))
+
+
+class JobStore:
+    """One job's checkpoint database."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+        columns = {r['name'] for r in self._db.execute('PRAGMA table_info(details)')}
+        if 'source_scraped_at' not in columns:
+            self._db.execute('ALTER TABLE details ADD COLUMN source_scraped_at REAL')
+        self._db.executescript(_summary_sql())
+        if not self._db.execute('SELECT 1 FROM summary LIMIT 1').fetchone():
+            self._rebuild_summary()
+
+    def _rebuild_summary(self):
+        """Count every table once (new or pre-summary databases)."""
+        self._db.execute('BEGIN IMMEDIATE')
+        for key, table, expr in SUMMARY_COUNTERS:
+            total = f'SELECT COALESCE(SUM({expr.format(r=table)}), 0) FROM {table}'
+            self._db.execute(f'INSERT OR REPLACE INTO summary VALUES (?, ({total}))', (key,))
+        self._db.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _query(self, sql: str, args=()) -> list:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    def summary(self) -> dict:
+        """Row counts from the trigger-maintained summary (no table scans).
+
+        Keys are those of SUMMARY_COUNTERS plus 'scrape_pending' (found
+        places not scraped yet) and 'email_pending' (scraped places with a
+        website whose emails are not checked yet).
+        """
+        counts = {key: 0 for key, _, _ in SUMMARY_COUNTERS}
+        counts.update((r['key'], r['value']) for r in self._query('SELECT key, value FROM summary'))
+        counts['scrape_pending'] = max(0, counts['places'] - counts['details'])
+        counts['email_pending'] = max(0, counts['with_website'] - counts['emails'])
+        return counts
+
+    def _write(self, fn):
+        """Run fn(db) inside one transaction."""
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                fn(self._db)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+
+    # -- Job metadata --
+    def get_meta(self) -> dict | None:
+        return self.get_value('job')
+
+    def set_meta(self, meta: dict):
+        self.set_value('job', meta)
+
+    def get_value(self, key: str, default=None):
+        """A JSON value stored in the meta table under `key`."""
+        rows = self._query('SELECT value FROM meta WHERE key = ?', (key,))
+        return json.loads(rows[0]['value']) if rows else default
+
+    def set_value(self, key: str, value):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, json.dumps(value)))
+
+    # -- Scan --
+    def scan_state(self) -> dict:
+        """{'scanned': set of grid points, 'quadtree': {node_key: count},
+        'failed': {node_key: {'error', 'status', 'attempts'}}}."""
+        return {
+            'scanned': {(r['lat'], r['lng']) for r in self._query('SELECT lat, lng FROM scanned')},
+            'quadtree': {r['node_key']: r['count'] for r in self._query('SELECT node_key, count FROM cells')},
+            'failed': {r['node_key']: {'error': r['error'], 'status': r['status'], 'attempts': r['attempts']}
+                       for r in self._query('SELECT * FROM failed_cells')},
+        }
+
+    def record_cell(self, node_key: str, ids=(), excluded=(), details=(),
+                    count: int = None, done_root=None):
+        """Commit one scanned cell: its new places, excluded places and API
+        details, its result count (adaptive mode) and, if this finished its
+        grid point, `done_root`. Clears any earlier failure of the cell."""
+        now = time.time()
+
+        def write(db):
+            db.executemany('INSERT OR IGNORE INTO places (place_id, found_at) VALUES (?, ?)',
+                           [(pid, now) for pid in ids])
+            db.executemany(INSERT_EXCLUDED,
+                           [(r['id'], r.get('primaryType', ''), r.get('name', ''), r.get('googleMapsUrl', ''))
+                            for r in excluded])
+            db.executemany(UPSERT_DETAIL,
+                           [_detail_row(d, now) for d in details])
+            if count is not None:
+                db.execute(UPSERT_CELL, (node_key, count))
+            if done_root is not None:
+                db.execute('INSERT OR IGNORE INTO scanned VALUES (?, ?)', tuple(done_root))
+            db.execute('DELETE FROM failed_cells WHERE node_key = ?', (node_key,))
+        self._write(write)
+
+    def record_cell_failure(self, node_key: str, error: str, status: int, attempts: int):
+        with self._lock:
+            self._db.execute(UPSERT_FAILED,
+                             (node_key, error, status, attempts))
+
+    def mark_scanned(self, root):
+        with self._lock:
+            self._db.execute('INSERT OR IGNORE INTO scanned VALUES (?, ?)', tuple(root))
+
+    # -- Places --
+    def place_ids(self) -> list:
+        return [r[0] for r in self._query('SELECT place_id FROM places ORDER BY rowid')]
+
+    def excluded(self) -> list:
+        """Excluded places as {'id', 'primaryType', 'name', 'googleMapsUrl'}."""
+        return [{'id': r['place_id'], 'primaryType': r['primary_type'], 'name': r['name'],
+                 'googleMapsUrl': r['maps_url']}
+                for r in self._query('SELECT * FROM excluded ORDER BY rowid')]
+
+    # -- Details --
+    def details(self) -> dict:
+        """{place_id: record} for every scraped place, failures included."""
+        return {r['place_id']: _detail_record(r) for r in self._query('SELECT * FROM details ORDER BY rowid')}
+
+    def put_detail(self, record: dict):
+        self.put_details([record])
+
+    def put_details(self, records: list):
+        """Upsert scraped place records in one transaction."""
+        now = time.time()
+        self._write(lambda db: db.executemany(UPSERT_DETAIL, [_detail_row(r, now) for r in records]))
+
+    # -- Emails --
+    def emails(self) -> dict:
+        return {r['place_id']: json.loads(r['emails']) for r in self._query('SELECT * FROM emails ORDER BY rowid')}
+
+    def put_emails(self, place_ids, emails):
+        """Record the same `emails` for every place in `place_ids` (one website)."""
+        self.put_email_groups([(place_ids, emails)])
+
+    def put_email_groups(self, groups: list):
+        """put_emails for several (place_ids, emails) groups in one transaction."""
+        now = time.time()
+        rows = [(pid, json.dumps(sorted(emails)), now) for place_ids, emails in groups for pid in place_ids]
+        self._write(lambda db: db.executemany(UPSERT_EMAILS, rows))
+
+    # -- Export --
+    def _stream(self, sql: str, args=(), size: int = 1000):
+        """Rows of `sql`, fetched `size` at a time on a separate read-only
+        connection: WAL lets it read while the job keeps writing, and the
+        shared connection's lock is not held for the whole export."""
+        db = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        db.row_factory = sqlite3.Row
+        try:
+            cursor = db.execute(sql, args)
+            while rows := cursor.fetchmany(size):
+                yield from rows
+        finally:
+            db.close()
+
+    def iter_results(self, by_name: bool = False):
+        """(place_id, record, emails) for every successfully scraped place.
+        With by_name, named places only, sorted by name; SQLite's sorter
+        spills to temporary files, so a large job is never sorted in memory."""
+        sql = ('SELECT d.*, e.emails AS found_emails FROM details d LEFT JOIN emails e USING (place_id) '
+               'WHERE d.error IS NULL')
+        if by_name:
+            sql += " AND d.name != '' ORDER BY d.name, d.rowid"
+        for r in self._stream(sql):
+            yield r['place_id'], _detail_record(r), json.loads(r['found_emails'] or '[]')
+
+    def iter_results_since(self, since: float):
+        """iter_results() rows whose details or emails changed after `since`:
+        (place_id, record, emails, scraped_at, changed_at). scraped_at is when
+        the details were scraped, by this job or the one they were copied
+        from; changed_at is when this job wrote them or checked emails."""
+        sql = ('SELECT d.*, e.emails AS found_emails, MAX(d.scraped_at, COALESCE(e.checked_at, 0)) AS changed_at, '
+               'COALESCE(d.source_scraped_at, d.scraped_at) AS details_scraped_at '
+               'FROM details d LEFT JOIN emails e USING (place_id) '
+               'WHERE d.error IS NULL AND (d.scraped_at > ? OR e.checked_at > ?)')
+        for r in self._stream(sql, (since, since)):
+            yield (r['place_id'], _detail_record(r), json.loads(r['found_emails'] or '[]'),
+                   r['details_scraped_at'], r['changed_at'])
+
+    def iter_results_to_upload(self, target: str):
+        """iter_results() rows with the digest last acknowledged by `target`
+        (None if never): (place_id, record, emails, digest)."""
+        current = self.get_value('upload_target') == target
+        sql = ('SELECT d.*, e.emails AS found_emails, u.digest AS uploaded_digest FROM details d '
+               'LEFT JOIN emails e USING (place_id) LEFT JOIN uploaded u USING (place_id) '
+               'WHERE d.error IS NULL')
+        for r in self._stream(sql):
+            yield (r['place_id'], _detail_record(r), json.loads(r['found_emails'] or '[]'),
+                   r['uploaded_digest'] if current else None)
+
+    def iter_excluded(self):
+        """Excluded places as (place_id, name, primary_type, maps_url), by type."""
+        for r in self._stream('SELECT place_id, name, primary_type, maps_url FROM excluded '
+                              'ORDER BY primary_type, rowid'):
+            yield tuple(r)
+
+    # -- Uploads --
+    # Rows acknowledged by Firebase, as a digest of the row sent, for the
+    # Firebase job in meta 'upload_target'. A different target (the cloud
+    # job was recreated) starts from nothing.
+    def uploaded(self, target: str) -> dict:
+        """{place_id: digest} of rows already uploaded to `target`."""
+        if self.get_value('upload_target') != target:
+            return {}
+        return {r['place_id']: r['digest'] for r in self._query('SELECT * FROM uploaded')}
+
+    def ack_uploaded(self, target: str, rows):
+        """Record (place_id, digest) rows as acknowledged by `target`."""
+        def write(db):
+            row = db.execute("SELECT value FROM meta WHERE key = 'upload_target'").fetchone()
+            if row is None or json.loads(row['value']) != target:
+                db.execute('DELETE FROM uploaded')
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('upload_target', ?)",
+                           (json.dumps(target),))
+            db.executemany('INSERT OR REPLACE INTO uploaded VALUES (?, ?)', rows)
+        self._write(write)
+
+    # -- Housekeeping --
+    def clear(self):
+        """Drop every checkpoint except the job metadata (re-run from scratch)."""
+        def write(db):
+            for table in ('places', 'excluded', 'details', 'emails', 'scanned', 'cells', 'failed_cells',
+                          'uploaded'):
+                db.execute(f'DELETE FROM {table}')
+            db.execute("DELETE FROM meta WHERE key IN ('upload_target', 'csv_upload')")
+        self._write(write)
+
+    def import_legacy(self, meta: dict | None, ids, excluded, details: dict, emails: dict, scan: dict):
+        """Load a pre-SQLite job's state (already parsed from its JSON files)
+        in one transaction."""
+        now = time.time()
+
+        def write(db):
+            if meta:
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('job', ?)", (json.dumps(meta),))
+            db.executemany('INSERT OR IGNORE INTO places (place_id, found_at) VALUES (?, ?)',
+                           [(pid, now) for pid in ids])
+            db.executemany(INSERT_EXCLUDED,
+                           [(r['id'], r.get('primaryType', ''), r.get('name', ''), r.get('googleMapsUrl', ''))
+                            for r in excluded])
+            db.executemany(UPSERT_DETAIL,
+                           [_detail_row({'place_id': pid, **d}, now) for pid, d in details.items()])
+            db.executemany(UPSERT_EMAILS,
+                           [(pid, json.dumps(sorted(e)), now) for pid, e in emails.items()])
+            db.executemany('INSERT OR IGNORE INTO scanned VALUES (?, ?)', [tuple(p) for p in scan['scanned']])
+            db.executemany(UPSERT_CELL, list(scan['quadtree'].items()))
+            db.executemany(UPSERT_FAILED,
+                           [(k, f.get('error', ''), f.get('status', 0), f.get('attempts', 1))
+                            for k, f in scan['failed'].items()])
+        self._write(write)
+
+
+class WriteBatch:
+    """Buffers per-item checkpoint writes and commits them together.
+
+    add() flushes once `max_items` are pending or `max_seconds` have passed
+    since the oldest pending item. A caller that can sit idle between adds
+    (waiting on an upstream stage) must also call flush_due() on a timer to
+    keep that bound; call flush() when the step ends. A crash loses at most
+    the pending batch, whose items resume simply redoes.
+    """
+
+    def __init__(self, write, max_items: int, max_seconds: float):
+        self._write = write
+        self.max_items = max(1, max_items)
+        self.max_seconds = max_seconds
+        self._items = []
+        self._oldest = 0.0
+        self.flushes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, item):
+        if not self._items:
+            self._oldest = time.monotonic()
+        self._items.append(item)
+        if len(self._items) >= self.max_items:
+            self.flush()
+        else:
+            self.flush_due()
+
+    def flush_due(self):
+        """flush() if the oldest pending item has waited `max_seconds`."""
+        if self._items and time.monotonic() - self._oldest >= self.max_seconds:
+            self.flush()
+
+    def flush(self):
+        if not self._items:
+            return
+        items, self._items = self._items, []
+        self._write(items)
+        self.flushes += 1
@@ -0,0 +1,193 @@
+"""
+US land coverage mask for the scan grid.
+
+Bundled, offline, deliberately coarse polygons of US land: the lower 48
+(traced along the coast and the Canada/Mexico borders), Alaska and Hawaii,
+with the US waters of the Great Lakes cut out as holes. Outlines are drawn
+slightly seaward and the lake holes well inside the shorelines, so the mask
+errs toward keeping a cell. It exists to skip grid cells that are entirely
+ocean, lake, Canada or Mexico - cells where a paid Text Search call can only
+come back empty.
+
+Coordinates are (lat, lng) pairs.
+"""
+
+from functools import lru_cache
+
+# =============================================================================
+#  LAND POLYGONS
+# =============================================================================
+
+CONUS = [
+    # Pacific Northwest, Strait of Juan de Fuca, then the 49th parallel
+    (48.45, -124.85), (48.25, -123.30), (48.75, -123.00), (49.00, -123.10),
+    (49.00, -95.15),
+    # Northwest Angle, Rainy River, Boundary Waters
+    (49.38, -95.15), (49.38, -94.95), (48.85, -94.70), (48.70, -94.55),
+    (48.60, -93.40), (48.60, -93.00), (48.30, -92.00), (48.20, -90.80),
+    (48.10, -90.00), (48.00, -89.55),
+    # Lake Superior (north of Isle Royale), St Marys River, Lake Huron
+    (48.30, -89.00), (48.30, -88.40), (47.70, -86.50), (47.30, -85.00),
+    (46.90, -84.80), (46.52, -84.50), (46.505, -84.30), (46.40, -84.10),
+    (46.00, -83.60), (45.80, -83.30), (45.30, -82.50), (44.00, -82.20),
+    (43.00, -82.35),
+    # St Clair and Detroit rivers, Lake Erie, Niagara
+    (42.60, -82.45), (42.40, -82.90), (42.30, -83.10), (42.05, -83.15),
+    (41.90, -82.80), (41.70, -82.50), (41.80, -82.00), (42.10, -81.50),
+    (42.40, -80.50), (42.60, -79.70), (42.85, -78.95), (43.10, -79.05),
+    (43.30, -79.10),
+    # Lake Ontario, St Lawrence, 45th parallel
+    (43.60, -78.50), (43.60, -77.50), (43.70, -76.50), (44.10, -76.40),
+    (44.55, -75.80), (44.78, -75.40), (45.02, -74.95), (45.00, -74.70),
+    (45.00, -71.50),
+    # Maine / New Brunswick
+    (45.30, -71.05), (45.45, -70.70), (46.10, -70.30), (46.40, -70.05),
+    (47.45, -69.23), (47.30, -68.30), (47.10, -67.80), (45.95, -67.78),
+    (45.60, -67.45), (45.10, -67.20), (44.85, -66.90),
+    # New England coast, Cape Cod and the islands
+    (44.30, -67.90), (43.80, -69.60), (43.45, -70.10), (42.90, -70.55),
+    (42.65, -70.50), (42.30, -70.80), (42.10, -69.95), (41.60, -69.85),
+    (41.15, -69.85), (41.15, -71.85),
+    # Long Island, New Jersey, Delmarva
+    (41.05, -71.80), (40.55, -73.30), (40.50, -73.95), (40.40, -73.90),
+    (39.35, -74.30), (38.85, -74.85), (38.45, -74.95), (37.90, -75.20),
+    (37.05, -75.85),
+    # Virginia, Outer Banks, Carolinas, Georgia
+    (36.85, -75.90), (36.00, -75.45), (35.20, -75.40), (34.55, -76.45),
+    (34.15, -77.75), (33.75, -77.95), (33.65, -78.80), (32.65, -79.80),
+    (31.95, -80.75), (30.30, -81.30),
+    # Florida Atlantic coast and Keys
+    (29.85, -81.20), (28.40, -80.45), (26.70, -79.95), (25.70, -80.05),
+    (25.10, -80.30), (24.85, -80.55), (24.65, -81.05), (24.45, -81.60),
+    (24.45, -81.90), (24.70, -81.90),
+    # Florida Gulf coast and panhandle
+    (25.20, -81.25), (25.90, -81.80), (26.70, -82.35), (27.70, -82.90),
+    (28.90, -82.80), (29.65, -83.55), (29.85, -84.25), (29.55, -85.15),
+    (30.05, -85.85), (30.25, -87.35),
+    # Alabama to Texas
+    (30.15, -88.10), (30.30, -88.90), (30.05, -89.45), (28.90, -89.05),
+    (28.85, -89.45), (29.05, -90.25), (29.45, -91.50), (29.65, -92.30),
+    (29.65, -93.85), (29.25, -94.80), (28.45, -96.25), (27.75, -97.10),
+    (26.85, -97.30), (25.95, -97.10),
+    # Rio Grande
+    (25.85, -97.50), (26.35, -98.85), (27.45, -99.55), (28.65, -100.55),
+    (29.30, -100.95), (29.75, -101.80), (29.50, -102.70), (28.90, -103.20),
+    (29.45, -104.45), (30.55, -105.05), (31.75, -106.45),
+    # New Mexico / Arizona / California border
+    (31.75, -108.25), (31.30, -108.25), (31.30, -111.10), (32.45, -114.85),
+    (32.70, -114.75), (32.50, -117.15),
+    # Pacific coast
+    (32.50, -117.30), (33.15, -117.50), (33.65, -118.45), (33.95, -118.65),
+    (34.40, -120.55), (35.15, -121.00), (35.95, -121.60), (36.55, -122.00),
+    (36.90, -122.20), (37.75, -122.60), (37.95, -123.10), (38.90, -123.85),
+    (40.40, -124.50), (40.80, -124.30), (42.00, -124.35), (42.85, -124.65),
+    (44.00, -124.25), (45.50, -124.05), (46.25, -124.15), (47.00, -124.30),
+    (47.90, -124.75),
+]
+
+CATALINA = [(33.25, -118.65), (33.25, -118.25), (33.55, -118.25), (33.55, -118.65)]
+
+ALASKA = [
+    # Canada border along 141W, then the panhandle
+    (69.75, -141.00), (60.30, -141.00), (59.90, -137.50), (59.80, -135.00),
+    (59.00, -133.70), (58.00, -132.50), (57.00, -131.50), (56.00, -130.00),
+    (54.65, -130.60), (54.60, -133.70),
+    # Gulf of Alaska coast
+    (56.00, -134.90), (57.00, -136.00), (58.20, -136.80), (59.00, -138.60),
+    (59.50, -140.00), (60.00, -142.00), (60.30, -145.80), (59.70, -148.00),
+    (59.10, -151.90), (57.70, -152.30), (56.80, -153.80), (56.80, -154.90),
+    (55.70, -157.50), (54.90, -160.50), (54.70, -163.60),
+    # Bristol Bay and the Bering Sea coast
+    (55.40, -163.40), (56.30, -160.60), (57.50, -158.00), (58.70, -157.20),
+    (58.60, -160.20), (59.50, -162.10), (59.70, -165.80), (60.50, -167.40),
+    (61.50, -166.20), (62.70, -165.20), (63.90, -161.00), (64.40, -166.60),
+    (65.65, -168.20),
+    # Chukchi and Beaufort Sea coast
+    (66.40, -166.50), (66.95, -162.80), (68.40, -166.90), (69.90, -163.20),
+    (70.90, -159.90), (71.45, -156.70), (70.50, -152.00), (70.40, -148.40),
+    (70.25, -143.50),
+]
+
+ALEUTIANS = [
+    (51.30, -179.10), (51.60, -173.00), (52.70, -169.00), (53.60, -166.00),
+    (54.60, -163.00), (55.20, -163.00), (54.30, -166.00), (53.30, -169.00),
+    (52.30, -173.00), (52.20, -179.10),
+]
+
+PRIBILOFS = [(56.50, -170.80), (56.50, -169.40), (57.30, -169.40), (57.30, -170.80)]
+
+ST_LAWRENCE_ISLAND = [(62.90, -171.90), (62.90, -168.60), (63.90, -168.60), (63.90, -171.90)]
+
+HAWAII = [
+    [(18.85, -156.15), (18.85, -154.75), (20.35, -154.75), (20.35, -156.15)],   # Hawaii (Big Island)
+    [(20.50, -156.75), (20.50, -155.90), (21.10, -155.90), (21.10, -156.75)],   # Maui
+    [(20.45, -157.40), (20.45, -156.55), (21.30, -156.55), (21.30, -157.40)],   # Molokai, Lanai, Kahoolawe
+    [(21.20, -158.35), (21.20, -157.60), (21.75, -157.60), (21.75, -158.35)],   # Oahu
+    [(21.70, -160.35), (21.70, -159.20), (22.30, -159.20), (22.30, -160.35)],   # Kauai, Niihau
+]
+
+LAND_POLYGONS = [CONUS, CATALINA, ALASKA, ALEUTIANS, PRIBILOFS, ST_LAWRENCE_ISLAND, *HAWAII]
+
+# US waters of the Great Lakes, kept well inside the shorelines.
+WATER_HOLES = [
+    # Lake Superior, west and east of the Keweenaw Peninsula
+    [(47.00, -90.30), (47.35, -90.30), (47.70, -89.50), (47.70, -88.90), (47.30, -88.90), (47.00, -89.30)],
+    [(46.95, -87.60), (47.30, -87.60), (47.35, -85.05), (46.95, -85.30)],
+    # Lake Michigan
+    [(42.00, -87.30), (42.00, -86.90), (43.00, -86.60), (44.00, -86.80), (44.60, -86.60),
+     (44.60, -87.20), (44.00, -87.40), (43.00, -87.60)],
+    # Lake Huron
+    [(44.30, -83.00), (45.20, -83.00), (45.20, -82.60), (44.30, -82.50)],
+    # Lake Erie
+    [(41.65, -82.20), (41.75, -81.30), (42.20, -80.40), (42.30, -80.60), (41.90, -81.60), (41.80, -82.30)],
+    # Lake Ontario
+    [(43.45, -78.80), (43.50, -77.00), (43.60, -76.80), (43.60, -78.80)],
+]
+
+
+# =============================================================================
+#  POINT / CELL TESTS
+# =============================================================================
+
+def _bbox(poly):
+    lats = [p[0] for p in poly]
+    lngs = [p[1] for p in poly]
+    return min(lats), max(lats), min(lngs), max(lngs)
+
+
+_LAND = [(poly, _bbox(poly)) for poly in LAND_POLYGONS]
+_HOLES = [(poly, _bbox(poly)) for poly in WATER_HOLES]
+
+
+def _in_polygon(lat, lng, poly, bbox) -> bool:
+    """Even-odd ray casting test."""
+    min_lat, max_lat, min_lng, max_lng = bbox
+    if not (min_lat <= lat <= max_lat and min_lng <= lng <= max_lng):
+        return False
+    inside = False
+    j = len(poly) - 1
+    for i in range(len(poly)):
+        lat_i, lng_i = poly[i]
+        lat_j, lng_j = poly[j]
+        if (lat_i > lat) != (lat_j > lat):
+            cross = lng_i + (lat - lat_i) * (lng_j - lng_i) / (lat_j - lat_i)
+            if lng < cross:
+                inside = not inside
+        j = i
+    return inside
+
+
+def point_on_land(lat: float, lng: float) -> bool:
+    if any(_in_polygon(lat, lng, poly, bbox) for poly, bbox in _HOLES):
+        return False
+    return any(_in_polygon(lat, lng, poly, bbox) for poly, bbox in _LAND)
+
+
+@lru_cache(maxsize=65536)
+def cell_on_land(lat: float, lng: float, half_step: float) -> bool:
+    """True if any of a 3x3 sample of the cell (corners, edges, center) is land."""
+    for dlat in (-half_step, 0.0, half_step):
+        for dlng in (-half_step, 0.0, half_step):
+            if point_on_land(lat + dlat, lng + dlng):
+                return True
+    return False
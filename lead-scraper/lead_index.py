@@ -0,0 +1,194 @@
+"""
+Cross-job lead index (<data_dir>/_index/leads.db).
+
+Every job's scraped places, keyed by place ID, in one SQLite database with
+an FTS5 table over business name, address and email domains, so "do we
+already have this dentist?" is one query instead of a grep through every
+job's CSV.
+
+- Incremental: each job's last indexed change (details scraped_at, emails
+  checked_at) is kept in `jobs`, and update_from_job() only reads rows of
+  that job store that changed since.
+- A place found by several jobs has one row; the most recent scrape wins
+  and `job` names the job it came from.
+- fresh() tells step_scrape which place IDs were scraped recently enough by
+  any job to be copied instead of visited again.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from job_store import JobStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    place_id      TEXT PRIMARY KEY,
+    name          TEXT NOT NULL DEFAULT '',
+    address       TEXT NOT NULL DEFAULT '',
+    phone         TEXT NOT NULL DEFAULT '',
+    website       TEXT NOT NULL DEFAULT '',
+    maps_url      TEXT NOT NULL DEFAULT '',
+    emails        TEXT NOT NULL DEFAULT '[]',
+    email_domains TEXT NOT NULL DEFAULT '',
+    job           TEXT NOT NULL DEFAULT '',
+    niche         TEXT NOT NULL DEFAULT '',
+    region        TEXT NOT NULL DEFAULT '',
+    scraped_at    REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    job        TEXT PRIMARY KEY,
+    indexed_to REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS leads_fts USING fts5(
+    name, address, email_domains,
+    content='leads', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads BEGIN
+    INSERT INTO leads_fts (rowid, name, address, email_domains)
+    VALUES (new.rowid, new.name, new.address, new.email_domains);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, name, address, email_domains)
+    VALUES ('delete', old.rowid, old.name, old.address, old.email_domains);
+END;
+CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE ON leads BEGIN
+    INSERT INTO leads_fts (leads_fts, rowid, name, address, email_domains)
+    VALUES ('delete', old.rowid, old.name, old.address, old.email_domains);
+    INSERT INTO leads_fts (rowid, name, address, email_domains)
+    VALUES (new.rowid, new.name, new.address, new.email_domains);
+END;
+"""
+
+LEAD_COLUMNS = ('place_id', 'name', 'address', 'phone', 'website', 'maps_url', 'emails',
+                'email_domains', 'job', 'niche', 'region', 'scraped_at')
+# An older scrape never replaces a newer one from another job.
+UPSERT_LEAD = (f'INSERT INTO leads ({", ".join(LEAD_COLUMNS)}) VALUES ({", ".join("?" * len(LEAD_COLUMNS))})'
+               ' ON CONFLICT (place_id) DO UPDATE SET '
+               + ', '.join(f'{c} = excluded.{c}' for c in LEAD_COLUMNS[1:])
+               + ' WHERE excluded.scraped_at >= leads.scraped_at OR excluded.job = leads.job')
+
+TERM_RE = re.compile(r'[^\s"]+')
+
+
+def _lead(row) -> dict:
+    return {
+        'placeId': row['place_id'], 'name': row['name'], 'address': row['address'],
+        'phone': row['phone'], 'website': row['website'], 'googleMapsUrl': row['maps_url'],
+        'emails': json.loads(row['emails']), 'job': row['job'], 'niche': row['niche'],
+        'region': row['region'], 'scrapedAt': row['scraped_at'],
+    }
+
+
+class LeadIndex:
+    """The lead index for one data directory."""
+
+    _shared: dict = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(SCHEMA)
+
+    @classmethod
+    def shared(cls, data_dir) -> 'LeadIndex':
+        """One instance per data directory, shared by every job in the process."""
+        path = (Path(data_dir) / '_index' / 'leads.db').resolve()
+        with cls._shared_lock:
+            index = cls._shared.get(path)
+            if index is None:
+                index = cls._shared[path] = cls(path)
+            return index
+
+    def _query(self, sql: str, args=()) -> list:
+        with self._lock:
+            return self._db.execute(sql, args).fetchall()
+
+    # -- Updates --
+    def update_from_job(self, store: JobStore, job: str, niche: str = '', region: str = '') -> int:
+        """Index the places in `store` that changed since the job was last
+        indexed; returns how many rows were written."""
+        since = self._query('SELECT indexed_to FROM jobs WHERE job = ?', (job,))
+        since = since[0]['indexed_to'] if since else 0.0
+        rows, indexed_to = [], since
+        for pid, info, emails, scraped_at, changed_at in store.iter_results_since(since):
+            domains = sorted({e.rsplit('@', 1)[-1] for e in emails})
+            rows.append((pid, info['name'], info['address'], info['phone'], info['website'],
+                         info['google_maps_url'], json.dumps(emails), ' '.join(domains),
+                         job, niche, region, scraped_at))
+            indexed_to = max(indexed_to, changed_at)
+
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                self._db.executemany(UPSERT_LEAD, rows)
+                self._db.execute('INSERT OR REPLACE INTO jobs VALUES (?, ?)', (job, indexed_to))
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+        return len(rows)
+
+    def update_from_data_dir(self, data_dir) -> int:
+        """update_from_job() for every job directory under `data_dir`."""
+        written = 0
+        for project_dir in sorted(Path(data_dir).iterdir()):
+            if not (project_dir / 'job.db').exists():
+                continue
+            store = JobStore(project_dir / 'job.db')
+            try:
+                meta = store.get_meta() or {}
+                written += self.update_from_job(store, project_dir.name, meta.get('niche', ''),
+                                                meta.get('region', ''))
+            finally:
+                store.close()
+        return written
+
+    # -- Lookups --
+    def search(self, q: str, limit: int = 50) -> list:
+        """Leads whose name, address or email domain match every term of
+        `q` (as word prefixes), best matches first."""
+        terms = TERM_RE.findall(q or '')
+        if not terms:
+            return []
+        match = ' '.join(f'"{t}"*' for t in terms)
+        rows = self._query('SELECT leads.* FROM leads_fts JOIN leads ON leads.rowid = leads_fts.rowid '
+                           'WHERE leads_fts MATCH ? ORDER BY bm25(leads_fts) LIMIT ?', (match, limit))
+        return [_lead(r) for r in rows]
+
+    def fresh(self, place_ids, max_age_seconds: float, exclude_job: str = '') -> dict:
+        """{place_id: detail record} for `place_ids` scraped within
+        `max_age_seconds` by any job but `exclude_job`, in the shape
+        _scrape_place returns, plus the time it was scraped as
+        source_scraped_at: a copy is written as new to the job reusing it
+        but stays only as fresh as the original scrape."""
+        cutoff = time.time() - max_age_seconds
+        ids = list(place_ids)
+        found = {}
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            rows = self._query(f'SELECT * FROM leads WHERE place_id IN ({", ".join("?" * len(batch))})'
+                               ' AND scraped_at >= ? AND job != ?', (*batch, cutoff, exclude_job))
+            for r in rows:
+                found[r['place_id']] = {
+                    'place_id': r['place_id'], 'name': r['name'], 'address': r['address'],
+                    'phone': r['phone'], 'website': r['website'], 'google_maps_url': r['maps_url'],
+                    'source_scraped_at': r['scraped_at'],
+                }
+        return found
+
+    def count(self) -> int:
+        return self._query('SELECT COUNT(*) FROM leads')[0][0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,122 @@
+"""
+Persistent, content-addressed cache of API responses.
+
+Entries live under one directory as <sha256[:2]>/<sha256>.json, where the
+hash is taken over the canonical JSON of the request (payload plus anything
+else that changes the response, e.g. the field mask). Shared by every job in
+the process and across runs.
+
+- TTL: entries older than `ttl_seconds` (by their stored_at stamp) are misses.
+- Size bound: when the directory grows past `max_bytes`, the least recently
+  used entries (file mtime, refreshed on every hit) are deleted.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class ResponseCache:
+    """Content-addressed on-disk response cache with TTL and LRU eviction."""
+
+    _shared: dict = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root, ttl_seconds: float, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = None  # path -> size, built lazily on first write
+        self._total = 0
+
+    @classmethod
+    def shared(cls, root, ttl_seconds: float, max_bytes: int) -> 'ResponseCache':
+        """One instance per directory, so concurrent jobs share size accounting."""
+        key = str(Path(root).resolve())
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls._shared[key] = cls(root, ttl_seconds, max_bytes)
+            return cache
+
+    @staticmethod
+    def key(request: dict) -> str:
+        canonical = json.dumps(request, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f'{key}.json'
+
+    def get(self, key: str):
+        """Return the cached value for `key`, or None on a miss or expired entry."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get('stored_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                if self._sizes is not None:
+                    self._total -= self._sizes.pop(path, 0)
+            return None
+        try:
+            os.utime(path)  # LRU: a hit makes the entry most recently used
+        except OSError:
+            pass
+        return entry.get('value')
+
+    def put(self, key: str, value):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps({'stored_at': time.time(), 'value': value})
+        tmp = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            sizes = self._load_sizes()
+            self._total += len(data) - sizes.get(path, 0)
+            sizes[path] = len(data)
+            if self._total > self.max_bytes:
+                self._evict(sizes)
+
+    def _load_sizes(self) -> dict:
+        if self._sizes is None:
+            self._sizes = {}
+            for path in self.root.glob('*/*.json'):
+                try:
+                    self._sizes[path] = path.stat().st_size
+                except OSError:
+                    continue
+            self._total = sum(self._sizes.values())
+        return self._sizes
+
+    def _evict(self, sizes: dict):
+        """Delete least recently used entries until under 90% of max_bytes."""
+        entries = []
+        for path in list(sizes):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                self._total -= sizes.pop(path, 0)
+        entries.sort()
+        target = self.max_bytes * 0.9
+        for _, path in entries:
+            if self._total <= target:
+                break
+            self._total -= sizes.pop(path, 0)
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -6,22 +6,37 @@ All progress is reported via HTTP POST to a Firebase Cloud Function,
 so the Chimp app can show real-time status. No service account needed.
 
 Supports resume: if the process is interrupted (laptop closed, crash, etc),
-local checkpoint files allow picking up exactly where the job left off.
+the per-job checkpoint database (job_store.py) allows picking up exactly where the job left off.
 """
 
-import requests
+import hashlib
 import json
+import math
 import time
 import re
 import random
 import asyncio
 import os
+from collections import deque
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from urllib.parse import unquote, urljoin, urlparse
 
-import pandas as pd
+import aiohttp
 from tqdm import tqdm
-from playwright.async_api import async_playwright
+
+import browser_profile
+import email_extractor
+import exporter
+import site_fetcher
+from browser_pool import BrowserPool
+from browser_profile import PageStats
+from firebase_sync import FirebaseSync
+from job_store import JobStore, WriteBatch
+from land_mask import cell_on_land
+from lead_index import LeadIndex
+from response_cache import ResponseCache
+from site_fetcher import SiteFetcher
 
 # =============================================================================
 #  FIREBASE API (simple HTTP POST to Cloud Function)
@@ -32,17 +47,28 @@ DEFAULT_FIREBASE_URL = os.environ.get('SCRAPER_API_URL', '')
 
 
 class FirebaseAPI:
-    """Thin wrapper that POSTs scraper updates to the Firebase Cloud Function."""
+    """Thin wrapper that POSTs scraper updates to the Firebase Cloud Function.
+
+    Job updates are queued on the URL's FirebaseSync and sent in the
+    background; every other call is a direct request on its pooled session.
+    Writes that must land after a job's queued updates (rerun, uploads)
+    drain that job's queue first; reads never wait on it.
+    """
 
     def __init__(self, function_url: str = ''):
         self.url = function_url or DEFAULT_FIREBASE_URL
         self.enabled = bool(self.url)
+        self.sync = FirebaseSync.get(self.url) if self.enabled else None
 
-    def _post(self, payload: dict) -> dict:
+    def _post(self, payload: dict, drain: bool = False) -> dict:
         if not self.enabled:
             return {}
+        if drain:
+            # The job's queued updates go first, so a rerun or results
+            # upload never lands before them.
+            self.sync.flush(job_id=payload['jobId'])
         try:
-            r = requests.post(self.url, json=payload, timeout=15)
+            r = self.sync.post(payload)
             if r.status_code == 200:
                 return r.json()
             else:
@@ -66,23 +92,53 @@ class FirebaseAPI:
         if status:
             data['status'] = status
         if progress:
-            data['progress'] = progress
+            data['progress'] = dict(progress)
         if total_results is not None:
             data['totalResults'] = total_results
         if csv_url is not None:
             data['csvUrl'] = csv_url
-        self._post({'action': 'updateJob', 'jobId': job_id, 'data': data})
+        if self.enabled:
+            self.sync.update(job_id, data)
 
     def update_region(self, job_id: str, region: str):
         """Update the region label on a Firestore job document."""
-        if not job_id:
+        if not job_id or not self.enabled:
             return
-        self._post({'action': 'updateJob', 'jobId': job_id, 'data': {'region': region}})
+        self.sync.update(job_id, {'region': region})
 
     def upload_results(self, job_id: str, results: list):
         if not job_id:
             return
-        self._post({'action': 'uploadResults', 'jobId': job_id, 'data': {'results': results}})
+        self._post({'action': 'uploadResults', 'jobId': job_id, 'data': {'results': results}}, drain=True)
+
+    def queue_results(self, job_id: str, rows: list, on_ack=None):
+        """Queue result rows (full or partial, keyed by placeId) for the
+        background sender; see FirebaseSync.upload_rows."""
+        if job_id and self.enabled:
+            self.sync.upload_rows(job_id, rows, on_ack)
+
+    def upload_results_chunk(self, job_id: str, results: list, chunk: int) -> bool:
+        """Upsert one chunk of result rows (keyed by placeId) into the job."""
+        if not job_id:
+            return False
+        resp = self._post({
+            'action': 'uploadResultsChunk',
+            'jobId': job_id,
+            'data': {'results': results, 'chunk': chunk}
+        }, drain=True)
+        return bool(resp.get('success'))
+
+    def upload_csv_part(self, job_id: str, file_name: str, part: int, parts: int,
+                        csv_content: str) -> dict:
+        """Store part `part` of `parts` of a CSV; the last part assembles the
+        file and its response carries the csvUrl."""
+        if not job_id:
+            return {}
+        return self._post({
+            'action': 'uploadCsvPart',
+            'jobId': job_id,
+            'data': {'fileName': file_name, 'part': part, 'parts': parts, 'csv': csv_content}
+        }, drain=True)
 
     def upload_csv(self, job_id: str, csv_content: str, file_name: str) -> str | None:
         if not job_id:
@@ -91,7 +147,7 @@ class FirebaseAPI:
             'action': 'uploadCsv',
             'jobId': job_id,
             'data': {'csv': csv_content, 'fileName': file_name}
-        })
+        }, drain=True)
         return resp.get('csvUrl')
 
     def get_job_state(self, job_id: str) -> dict | None:
@@ -105,7 +161,7 @@ class FirebaseAPI:
         """Reset a scrape job in Firebase (clears results/progress, keeps the doc ID)."""
         if not job_id:
             return False
-        resp = self._post({'action': 'rerunJob', 'jobId': job_id})
+        resp = self._post({'action': 'rerunJob', 'jobId': job_id}, drain=True)
         return resp.get('success', False)
 
     def list_jobs(self) -> list:
@@ -114,6 +170,138 @@ class FirebaseAPI:
         return resp.get('jobs', []) if resp.get('success') else []
 
 
+# =============================================================================
+#  RATE LIMITING
+# =============================================================================
+
+class TokenBucket:
+    """Async token-bucket rate limiter shared by concurrent API workers.
+
+    `rate` tokens are added per second up to `burst`; each request takes one.
+    A rate of 0 disables limiting. `pause()` holds every waiter (e.g. after a
+    429) without each worker sleeping on its own schedule.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                if self.rate <= 0:
+                    return
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class PlacesAPIError(Exception):
+    """A Places API request that failed and left its cell unscanned.
+
+    `status` is the HTTP status (0 for network errors), `retry_after` the
+    server's Retry-After in seconds if it sent one. Only `retryable` errors
+    go back on the scan queue.
+    """
+
+    def __init__(self, message: str, status: int = 0, retry_after: float = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status == 0 or self.status == 429 or self.status >= 500
+
+    @property
+    def quota(self) -> bool:
+        return self.status == 429
+
+
+def _parse_retry_after(value) -> float | None:
+    """Retry-After as seconds; accepts delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# =============================================================================
+#  PIPELINE HAND-OFF
+# =============================================================================
+
+class StageQueue:
+    """Bounded hand-off from one pipeline stage to the next.
+
+    put() waits while the queue is full, so a fast stage cannot run ahead of
+    a slow one. get() returns None once the producer has called finish() and
+    everything queued has been taken. close() is the consumer giving up: the
+    queue empties and later puts are dropped. Producers checkpoint an item
+    before handing it on, so anything still queued when a job stops is found
+    again in the files on resume.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        self._items = deque()
+        self._ready = asyncio.Event()  # an item arrived, or the queue ended
+        self._space = asyncio.Event()  # an item was taken, or the queue closed
+        self._finished = False
+        self._closed = False
+
+    def __len__(self):
+        return len(self._items)
+
+    async def put(self, item):
+        while not self._closed:
+            if len(self._items) < self.maxsize:
+                self._items.append(item)
+                self._ready.set()
+                return
+            self._space.clear()
+            await self._space.wait()
+
+    async def get(self):
+        while True:
+            if self._items:
+                self._space.set()
+                return self._items.popleft()
+            if self._finished or self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+    def finish(self):
+        self._finished = True
+        self._ready.set()
+
+    def close(self):
+        self._closed = True
+        self._items.clear()
+        self._ready.set()
+        self._space.set()
+
+
 # =============================================================================
 #  VALID GOOGLE PLACES TYPES (Table A — usable as includedType in Text Search)
 # =============================================================================
@@ -382,9 +570,101 @@ class ScrapeJob:
     GRID_SPACING = 0.5
     SEARCH_RADIUS = 35000
 
+    # Scan engine tuning: cells in flight at once and Places API requests/sec.
+    SCAN_CONCURRENCY = 8
+    SCAN_QPS = 8.0
+
+    # Detail scrape tuning: browser pages working in parallel, and the place
+    # visits/sec they share (one page alone manages about 1 per 7s). Pages
+    # are leased from the process-wide BrowserPool, whose MAX_PAGES caps all
+    # jobs together. A worker that fails SCRAPE_WORKER_MAX_FAILS visits in a
+    # row drops its context; if it keeps failing after that, it retires.
+    SCRAPE_CONCURRENCY = 4
+    SCRAPE_RATE = 0.5
+    SCRAPE_WORKER_MAX_FAILS = 10
+
+    # Request blocking profile (see browser_profile.BLOCK_PROFILES) for the
+    # Maps detail step and the email step; '' loads everything.
+    SCRAPE_BLOCKING = 'maps'
+    EMAIL_BLOCKING = 'site'
+
+    # Email step: websites checked at once. Each is fetched over plain HTTP
+    # first and only falls back to a browser page when that finds nothing.
+    EMAIL_CONCURRENCY = 8
+
+    # Pipeline: 'sequential' runs each step to completion before the next;
+    # 'streaming' runs scan, scrape and emails together, new place IDs
+    # flowing to the scrape workers and scraped websites to the email
+    # workers through StageQueues of PIPELINE_QUEUE_SIZE items.
+    PIPELINE_MODES = ('sequential', 'streaming')
+    PIPELINE = 'sequential'
+    PIPELINE_QUEUE_SIZE = 200
+
+    # Scrape and email results are written to job.db in batches: one
+    # transaction per CHECKPOINT_BATCH items or CHECKPOINT_SECONDS, whichever
+    # comes first, and whatever is left when the step ends. A crash loses at
+    # most one batch, which resume redoes.
+    CHECKPOINT_BATCH = 25
+    CHECKPOINT_SECONDS = 10
+
+    # Export uploads: result rows go to Firebase UPLOAD_CHUNK_ROWS at a time
+    # and the CSV in parts of about CSV_PART_BYTES, each acknowledged chunk
+    # recorded in job.db. Later exports (resume, expand) send only rows that
+    # are new or changed since.
+    UPLOAD_CHUNK_ROWS = 500
+    CSV_PART_BYTES = 4 * 1024 * 1024
+
+    # Export files written next to the CSV (see exporter.FORMATS). The CSV
+    # is always written: it is what gets downloaded and uploaded.
+    EXPORT_FORMATS = ('csv', 'xlsx')
+
+    # Exported leads of every job go into the shared lead index
+    # (<data_dir>/_index/leads.db). Step 2 copies places another job scraped
+    # within LEAD_INDEX_FRESH_DAYS from it instead of visiting them; 0
+    # turns that off.
+    LEAD_INDEX_FRESH_DAYS = 90
+
+    # Adaptive scan: a cell whose search hits the Text Search ceiling
+    # (3 pages x 20 results) is split into four quadrants and rescanned,
+    # down to MAX_SPLIT_DEPTH levels below the grid spacing.
+    SCAN_MODES = ('grid', 'adaptive')
+    RESULT_CEILING = 60
+    MAX_SPLIT_DEPTH = 4
+
+    # Failed cells are retried with exponential backoff (never sooner than
+    # the server's Retry-After) up to MAX_CELL_ATTEMPTS times per run, then
+    # left unscanned for resume. CIRCUIT_BREAKER_ERRORS quota errors in a row
+    # pause the whole scan for CIRCUIT_BREAKER_PAUSE seconds.
+    MAX_CELL_ATTEMPTS = 5
+    RETRY_BASE_SECONDS = 2
+    RETRY_MAX_SECONDS = 300
+    CIRCUIT_BREAKER_ERRORS = 5
+    CIRCUIT_BREAKER_PAUSE = 300
+
+    # Text Search responses are cached under <data_dir>/_cache/places and
+    # shared by every job; reruns within the TTL cost nothing.
+    RESPONSE_CACHE_TTL_DAYS = 45
+    RESPONSE_CACHE_MAX_MB = 512
+
+    # Email step results are cached per website origin under
+    # <data_dir>/_cache/emails, so places sharing a site (chains, franchises)
+    # and later jobs reuse one crawl.
+    EMAIL_CACHE_TTL_DAYS = 30
+    EMAIL_CACHE_MAX_MB = 64
+
+    # Detail enrichment: 'browser' visits every place in headless Chromium
+    # (step 2); 'api' asks Text Search for phone, website and address during
+    # the scan (a pricier SKU) and writes scraped.json directly, so step 2
+    # has nothing left to do.
+    ENRICHMENT_MODES = ('browser', 'api')
+    SEARCH_FIELDS = 'places.id,places.primaryType,places.displayName,nextPageToken'
+    API_ENRICHMENT_FIELDS = 'places.formattedAddress,places.nationalPhoneNumber,places.websiteUri'
+
     def __init__(self, job_id: str, niche: str, region: str, region_key: str,
                  api_key: str, firebase_url: str = '', data_dir: str = '',
-                 niche_type: str = ''):
+                 niche_type: str = '', scan_concurrency: int = 0,
+                 scan_qps: float = 0, scan_mode: str = 'grid',
+                 enrichment: str = 'browser'):
 
         self.local_id = job_id
         self.niche = niche
@@ -394,6 +674,25 @@ class ScrapeJob:
         self.region = region
         self.region_key = region_key
         self.api_key = api_key
+        self.scan_concurrency = scan_concurrency or self.SCAN_CONCURRENCY
+        self.scan_qps = scan_qps or self.SCAN_QPS
+        self.scrape_concurrency = self.SCRAPE_CONCURRENCY
+        self.scrape_rate = self.SCRAPE_RATE
+        self.scrape_blocking = self.SCRAPE_BLOCKING
+        self.email_blocking = self.EMAIL_BLOCKING
+        self.email_concurrency = self.EMAIL_CONCURRENCY
+        self.pipeline = self.PIPELINE
+        self.pipeline_queue_size = self.PIPELINE_QUEUE_SIZE
+        self.export_formats = self.EXPORT_FORMATS
+        self.lead_index_fresh_days = self.LEAD_INDEX_FRESH_DAYS
+        self._sitemap_memo = {}  # origin -> sitemap contact hints, per email step
+        self.scrape_stats = PageStats()
+        self.email_stats = PageStats()
+        # Start of the current run, for progress['firstLeadSeconds']: time
+        # until the first lead with a phone or email reached Firebase.
+        self.run_started = None
+        self.scan_mode = scan_mode if scan_mode in self.SCAN_MODES else 'grid'
+        self.enrichment = enrichment if enrichment in self.ENRICHMENT_MODES else 'browser'
 
         # Firebase integration
         self.fb = FirebaseAPI(firebase_url)
@@ -404,15 +703,25 @@ class ScrapeJob:
         slug = re.sub(r'[^a-z0-9]+', '_', f"{niche}_{region}".lower()).strip('_')
         self.project_dir = base / slug
         self.project_dir.mkdir(parents=True, exist_ok=True)
-
-        self.place_ids_file   = self.project_dir / 'place_ids.json'
-        self.excluded_file    = self.project_dir / 'excluded_ids.json'
-        self.progress_file    = self.project_dir / 'progress.json'
-        self.scraped_file     = self.project_dir / 'scraped.json'
-        self.emails_file      = self.project_dir / 'emails.json'
-        self.meta_file        = self.project_dir / 'job_meta.json'
+        self.response_cache = ResponseCache.shared(
+            base / '_cache' / 'places',
+            ttl_seconds=self.RESPONSE_CACHE_TTL_DAYS * 86400,
+            max_bytes=self.RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+        )
+        self.email_cache = ResponseCache.shared(
+            base / '_cache' / 'emails',
+            ttl_seconds=self.EMAIL_CACHE_TTL_DAYS * 86400,
+            max_bytes=self.EMAIL_CACHE_MAX_MB * 1024 * 1024,
+        )
+        self.lead_index = LeadIndex.shared(base)
+
+        # Checkpoints (scan cells, places, details, emails, job metadata)
+        # live in one SQLite database per job; see job_store.py.
+        self.store = JobStore(self.project_dir / 'job.db')
+        self._migrate_legacy_checkpoints()
         self.csv_file         = self.project_dir / f'{slug}.csv'
         self.excluded_csv_file = self.project_dir / f'{slug}_excluded.csv'
+        self.xlsx_file        = self.project_dir / f'{slug}.xlsx'
 
         # Runtime state
         self.status = 'created'
@@ -422,7 +731,11 @@ class ScrapeJob:
             'gridTotal': 0, 'gridScanned': 0, 'placesFound': 0,
             'placesScraped': 0, 'emailsScraped': 0, 'emailsFound': 0,
             'totalWithPhone': 0, 'totalWithEmail': 0, 'totalWithWebsite': 0,
-            'placesExcluded': 0,
+            'placesExcluded': 0, 'cellsSplit': 0, 'cellsMasked': 0,
+            'cacheHits': 0, 'cacheMisses': 0, 'cacheSavedUsd': 0.0,
+            'cellsFailed': 0, 'cellRetries': 0, 'quotaPauses': 0,
+            'emailHttpSites': 0, 'emailHttpHits': 0, 'emailBrowserSites': 0, 'emailBrowserHits': 0,
+            'emailOrigins': 0, 'emailCacheHits': 0, 'emailCacheMisses': 0,
         }
 
         # Load existing metadata if resuming
@@ -430,13 +743,17 @@ class ScrapeJob:
 
     def _load_meta(self):
         """Load saved job metadata (firebase_job_id, last status, etc)."""
-        meta = self._load_json(self.meta_file)
+        meta = self.store.get_meta()
         if meta:
             self.firebase_job_id = meta.get('firebase_job_id')
             saved_status = meta.get('status', 'created')
             # Restore niche_type from saved meta (may not exist in older jobs)
             if meta.get('niche_type'):
                 self.niche_type = meta['niche_type']
+            if meta.get('scan_mode') in self.SCAN_MODES:
+                self.scan_mode = meta['scan_mode']
+            if meta.get('enrichment') in self.ENRICHMENT_MODES:
+                self.enrichment = meta['enrichment']
             # Restore progress counters from saved meta
             if meta.get('progress'):
                 self.progress.update(meta['progress'])
@@ -445,11 +762,13 @@ class ScrapeJob:
 
     def _save_meta(self):
         """Persist job metadata for resume across restarts."""
-        self._save_json(self.meta_file, {
+        self.store.set_meta({
             'firebase_job_id': self.firebase_job_id,
             'local_id': self.local_id,
             'niche': self.niche,
             'niche_type': self.niche_type,
+            'scan_mode': self.scan_mode,
+            'enrichment': self.enrichment,
             'region': self.region,
             'region_key': self.region_key,
             'status': self.status,
@@ -458,9 +777,10 @@ class ScrapeJob:
 
     def _detect_resume_status(self, saved_status: str) -> str:
         """Figure out where to resume based on local checkpoint files."""
-        has_place_ids = self.place_ids_file.exists() and len(self._load_json(self.place_ids_file) or []) > 0
-        has_scraped = self.scraped_file.exists() and len(self._load_json(self.scraped_file) or {}) > 0
-        has_emails = self.emails_file.exists() and len(self._load_json(self.emails_file) or {}) > 0
+        summary = self.store.summary()
+        has_place_ids = summary['places'] > 0
+        has_scraped = summary['details'] > 0
+        has_emails = summary['emails'] > 0
 
         # If the job completed, keep it complete
         if saved_status == 'complete':
@@ -487,22 +807,18 @@ class ScrapeJob:
         if self.status == 'created':
             return False
         # Has some local checkpoint data
-        return (self.place_ids_file.exists() or
-                self.scraped_file.exists() or
-                self.emails_file.exists())
+        summary = self.store.summary()
+        return any(summary[k] for k in ('scanned', 'failed_cells', 'places', 'details', 'emails'))
 
     @property
     def resume_step(self) -> str:
         """Human-readable description of where the job will resume from."""
-        has_emails = self.emails_file.exists() and len(self._load_json(self.emails_file) or {}) > 0
-        has_scraped = self.scraped_file.exists() and len(self._load_json(self.scraped_file) or {}) > 0
-        has_place_ids = self.place_ids_file.exists() and len(self._load_json(self.place_ids_file) or []) > 0
-
-        progress_data = self._load_json(self.progress_file) or {}
-        scanned_count = len(progress_data.get('scanned_points', []))
-        place_count = len(self._load_json(self.place_ids_file) or [])
-        scraped_count = len(self._load_json(self.scraped_file) or {}) if has_scraped else 0
-        email_count = len(self._load_json(self.emails_file) or {}) if has_emails else 0
+        summary = self.store.summary()
+        email_count = summary['emails']
+        scraped_count = summary['details']
+        place_count = summary['places']
+        scanned_count = summary['scanned']
+        has_emails, has_scraped, has_place_ids = email_count > 0, scraped_count > 0, place_count > 0
 
         if has_emails:
             return f"Resume from email scraping ({email_count} sites checked)"
@@ -522,70 +838,319 @@ class ScrapeJob:
         self.should_stop = True
 
     # -- Firebase sync --
+    # Called from the engine loop, so nothing here may block: the update is
+    # only queued on FirebaseSync, and meta is one small SQLite write.
     def _sync_firebase(self, status=None):
         if status:
             self.status = status
         self.fb.update_job(self.firebase_job_id, status=self.status, progress=self.progress)
         self._save_meta()
 
-    # -- Local file helpers --
-    def _load_json(self, path):
-        if path.exists():
-            with open(path, 'r') as f:
-                return json.load(f)
-        return None
+    # -- Scan checkpoint --
+    def _load_scan_state(self) -> dict:
+        """Scan state from the job store.
+
+        Returns {'scanned': set of grid points, 'ids': set of place IDs,
+        'excluded': {place_id: record}, 'quadtree': {node_key: count},
+        'details': {place_id: scraped record}, 'failed': {node_key: error}}.
+        'details' is only filled in API enrichment mode, where the scan itself
+        produces the place details. 'failed' holds cells whose last attempt
+        errored.
+        """
+        state = self.store.scan_state()
+        state['ids'] = set(self.store.place_ids())
+        state['excluded'] = {r['id']: r for r in self.store.excluded()}
+        state['details'] = self.store.details() if self.enrichment == 'api' else {}
+        return state
+
+    # Per-job JSON checkpoints written before the SQLite store.
+    LEGACY_FILES = ('job_meta.json', 'place_ids.json', 'excluded_ids.json', 'progress.json',
+                    'scan_journal.jsonl', 'scraped.json', 'emails.json')
 
-    def _save_json(self, path, data):
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2 if len(str(data)) < 100000 else None)
+    def _migrate_legacy_checkpoints(self):
+        self._migrate_legacy_dir(self.project_dir, self.store)
+
+    @staticmethod
+    def _migrate_legacy_dir(project_dir: Path, store: JobStore) -> bool:
+        """One-time import of a pre-SQLite job directory into `store`.
+
+        The scan journal is replayed over the snapshot files exactly as the
+        old loader did; the JSON files are then moved to legacy_json/ so
+        this runs once and nothing is lost if it is interrupted.
+        """
+        legacy = {name: project_dir / name for name in ScrapeJob.LEGACY_FILES}
+        if not any(path.exists() for path in legacy.values()):
+            return False
+
+        def load(name, default):
+            try:
+                with open(legacy[name], 'r') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return default
+
+        progress_data = load('progress.json', {})
+        scan = {
+            'scanned': {ScrapeJob._snap_to_lattice(p) for p in progress_data.get('scanned_points', [])},
+            'quadtree': progress_data.get('quadtree', {}),
+            'failed': progress_data.get('failed', {}),
+        }
+        ids = set(load('place_ids.json', []))
+        excluded = {r['id']: r for r in load('excluded_ids.json', [])}
+        details = load('scraped.json', {})
+        if legacy['scan_journal.jsonl'].exists():
+            with open(legacy['scan_journal.jsonl'], 'r') as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn final line from a crash mid-append
+                    ids.update(rec.get('ids', []))
+                    for ex in rec.get('excluded', []):
+                        excluded[ex['id']] = ex
+                    for detail in rec.get('details', []):
+                        details[detail['place_id']] = detail
+                    key = ScrapeJob._node_key(rec['root'], rec['path'])
+                    if 'failed' in rec:
+                        scan['failed'][key] = {'error': rec['failed'], 'status': rec.get('status', 0),
+                                               'attempts': rec.get('attempts', 1)}
+                        continue
+                    scan['failed'].pop(key, None)
+                    if 'q' in rec:
+                        scan['quadtree'][key] = rec['q']
+                    if rec.get('done'):
+                        scan['scanned'].add(tuple(rec['root']))
+
+        store.import_legacy(load('job_meta.json', None), ids, list(excluded.values()),
+                            details, load('emails.json', {}), scan)
+        backup = project_dir / 'legacy_json'
+        backup.mkdir(exist_ok=True)
+        for path in legacy.values():
+            if path.exists():
+                os.replace(path, backup / path.name)
+        return True
+
+    @staticmethod
+    def migrate_data_dir(data_dir: str) -> int:
+        """Move every legacy job under `data_dir` into its SQLite store.
+        Returns the number of jobs migrated."""
+        base = Path(data_dir)
+        if not base.exists():
+            return 0
+        migrated = 0
+        for project_dir in sorted(base.iterdir()):
+            if not (project_dir / 'job_meta.json').exists():
+                continue
+            store = JobStore(project_dir / 'job.db')
+            try:
+                migrated += ScrapeJob._migrate_legacy_dir(project_dir, store)
+            finally:
+                store.close()
+        return migrated
 
     # -- Cost estimation --
     COST_PER_REQUEST = 0.035  # USD, Text Search (New) — Advanced pricing tier
+    COST_PER_REQUEST_API_ENRICHMENT = 0.040  # Preferred tier (phone / website fields)
+
+    # Rough figures for the enrichment time/price tradeoff: included places
+    # per paid request, and wall time per place for one step 2 page (load,
+    # panel wait, 2-4s delay and the periodic 15-30s pause).
+    EST_PLACES_PER_REQUEST = 8
+    SCRAPE_SECONDS_PER_PLACE = 7
 
     @staticmethod
-    def estimate_scan_cost(region_key: str) -> dict:
+    def cost_per_request(enrichment: str = 'browser') -> float:
+        if enrichment == 'api':
+            return ScrapeJob.COST_PER_REQUEST_API_ENRICHMENT
+        return ScrapeJob.COST_PER_REQUEST
+
+    # Assumed share of saturated cells at each split depth for the adaptive
+    # estimate. Few 0.5° cells saturate, but the children of one that did
+    # (a metro area) often saturate again.
+    ADAPTIVE_SATURATION = (0.04, 0.3, 0.2, 0.1)
+
+    @staticmethod
+    def _adaptive_cell_estimate(depth: int = 0) -> tuple[float, float]:
+        """Expected (requests, splits) for one adaptive cell at `depth`."""
+        if depth >= min(ScrapeJob.MAX_SPLIT_DEPTH, len(ScrapeJob.ADAPTIVE_SATURATION)):
+            return 1.1, 0.0
+        sat = ScrapeJob.ADAPTIVE_SATURATION[depth]
+        child_requests, child_splits = ScrapeJob._adaptive_cell_estimate(depth + 1)
+        # A saturated cell always costs all 3 pages before it splits.
+        requests_ = (1 - sat) * 1.1 + sat * (3 + 4 * child_requests)
+        splits = sat * (1 + 4 * child_splits)
+        return requests_, splits
+
+    @staticmethod
+    def estimate_scan_cost(region_key: str, scan_mode: str = 'grid', scanned: set = None,
+                           enrichment: str = 'browser') -> dict:
         """Estimate the Google Places API cost for scanning a region.
 
         Returns a dict with grid_points, estimated_requests, and estimated_cost_usd.
+        In adaptive mode the request count includes the expected subdivisions
+        (see ADAPTIVE_SATURATION) and estimated_splits is added.
+
+        estimated_cost_usd is priced for `enrichment`; enrichment_options
+        compares both modes as {mode: {cost_usd, hours}}, where hours covers
+        the scan plus (for 'browser') the step 2 Chromium visits.
+
+        If `scanned` (grid points a job has already covered) is given, the
+        cost covers only the new cells and new_grid_points is added.
+
+        Cells dropped by the land mask are not counted; cells_masked and
+        requests_avoided / cost_avoided_usd report what the mask saved.
         """
         bounds = get_region_bounds(region_key)
         if not bounds:
             return {'error': f'Unknown region: {region_key}'}
 
-        # Replicate _generate_grid without instantiating a full job
-        points = 0
-        lat = bounds['min_lat']
-        while lat <= bounds['max_lat']:
-            lng = bounds['min_lng']
-            while lng <= bounds['max_lng']:
-                points += 1
-                lng += ScrapeJob.GRID_SPACING
-            lat += ScrapeJob.GRID_SPACING
+        grid = ScrapeJob._generate_grid(bounds)
+        masked = len(ScrapeJob._generate_grid(bounds, masked=False)) - len(grid)
+        points = len(grid)
+        if scanned is not None:
+            points = len([p for p in grid if p not in scanned])
 
         # Each grid point = 1 request (plus up to 2 pagination requests for dense areas,
         # but most points return <20 results so pagination is rare outside cities).
         # We use 1.1× as a modest buffer for pagination.
         estimated_requests = round(points * 1.1)
-        estimated_cost = round(estimated_requests * ScrapeJob.COST_PER_REQUEST, 2)
-
-        return {
-            'grid_points': points,
-            'estimated_requests': estimated_requests,
-            'estimated_cost_usd': estimated_cost,
+        result = {'scan_mode': 'grid', 'grid_points': len(grid)}
+        if scanned is not None:
+            result['new_grid_points'] = points
+        if scan_mode == 'adaptive':
+            per_cell, splits = ScrapeJob._adaptive_cell_estimate()
+            estimated_requests = round(points * per_cell)
+            result['scan_mode'] = 'adaptive'
+            result['estimated_splits'] = round(points * splits)
+
+        price = ScrapeJob.cost_per_request(enrichment)
+        result['enrichment'] = 'api' if enrichment == 'api' else 'browser'
+        result['estimated_requests'] = estimated_requests
+        result['estimated_cost_usd'] = round(estimated_requests * price, 2)
+        result['cells_masked'] = masked
+        result['requests_avoided'] = round(masked * 1.1)
+        result['cost_avoided_usd'] = round(result['requests_avoided'] * price, 2)
+
+        places = estimated_requests * ScrapeJob.EST_PLACES_PER_REQUEST
+        scan_seconds = estimated_requests / ScrapeJob.SCAN_QPS
+        scrape_rate = min(ScrapeJob.SCRAPE_RATE,
+                          ScrapeJob.SCRAPE_CONCURRENCY / ScrapeJob.SCRAPE_SECONDS_PER_PLACE)
+        result['estimated_places'] = places
+        result['enrichment_options'] = {
+            'browser': {
+                'cost_usd': round(estimated_requests * ScrapeJob.COST_PER_REQUEST, 2),
+                'hours': round((scan_seconds + places / scrape_rate) / 3600, 1),
+            },
+            'api': {
+                'cost_usd': round(estimated_requests * ScrapeJob.COST_PER_REQUEST_API_ENRICHMENT, 2),
+                'hours': round(scan_seconds / 3600, 1),
+            },
         }
+        return result
+
+    @staticmethod
+    def coverage_report() -> list:
+        """Per-region summary of the paid calls the land mask avoids."""
+        report = []
+        for key in [*REGIONS, *sorted(k for k in STATE_BOUNDS if k not in REGIONS)]:
+            est = ScrapeJob.estimate_scan_cost(key)
+            report.append({
+                'region': key,
+                'name': REGIONS[key]['name'] if key in REGIONS else key.title(),
+                'grid_points': est['grid_points'],
+                'cells_masked': est['cells_masked'],
+                'requests_avoided': est['requests_avoided'],
+                'cost_avoided_usd': est['cost_avoided_usd'],
+            })
+        return report
 
     # -- Grid generation --
-    def _generate_grid(self, bounds):
-        points = []
-        lat = bounds['min_lat']
-        while lat <= bounds['max_lat']:
-            lng = bounds['min_lng']
-            while lng <= bounds['max_lng']:
-                points.append((round(lat, 4), round(lng, 4)))
-                lng += self.GRID_SPACING
-            lat += self.GRID_SPACING
+    # Grid points sit on one global lattice: node (i, j) is at
+    # (i * GRID_SPACING, j * GRID_SPACING) and covers the cell extending half
+    # a spacing either side. Every region, expansion and rerun therefore
+    # produces the same point for the same cell, so scanned cells carry over.
+    @staticmethod
+    def _lattice_index(coord: float) -> int:
+        """Index of the lattice node whose cell contains `coord`."""
+        return math.floor(coord / ScrapeJob.GRID_SPACING + 0.5)
+
+    @staticmethod
+    def _lattice_point(i: int, j: int) -> tuple:
+        return (round(i * ScrapeJob.GRID_SPACING, 4), round(j * ScrapeJob.GRID_SPACING, 4))
+
+    @staticmethod
+    def _generate_grid(bounds, masked: bool = True):
+        """All lattice points whose cells intersect the bounding box.
+
+        With masked=True (the default) cells with no US land in them (ocean,
+        Great Lakes, Canada, Mexico) are dropped; see land_mask.py.
+        """
+        lat_range = range(ScrapeJob._lattice_index(bounds['min_lat']),
+                          ScrapeJob._lattice_index(bounds['max_lat']) + 1)
+        lng_range = range(ScrapeJob._lattice_index(bounds['min_lng']),
+                          ScrapeJob._lattice_index(bounds['max_lng']) + 1)
+        points = [ScrapeJob._lattice_point(i, j) for i in lat_range for j in lng_range]
+        if masked:
+            half = ScrapeJob.GRID_SPACING / 2.0
+            points = [p for p in points if cell_on_land(p[0], p[1], half)]
         return points
 
+    @staticmethod
+    def _snap_to_lattice(point) -> tuple:
+        """Map a scanned point from an older, region-anchored grid onto the lattice.
+
+        Points within a quarter spacing of a node (in both axes) mostly cover
+        that node's cell, so they count as it; anything else is kept as-is.
+        """
+        lat, lng = point
+        i, j = ScrapeJob._lattice_index(lat), ScrapeJob._lattice_index(lng)
+        node = ScrapeJob._lattice_point(i, j)
+        tolerance = ScrapeJob.GRID_SPACING / 4.0
+        if abs(lat - node[0]) <= tolerance and abs(lng - node[1]) <= tolerance:
+            return node
+        return (lat, lng)
+
+    # -- Adaptive quadtree --
+    @staticmethod
+    def _node_key(root, path: str) -> str:
+        """Quadtree node id: the grid point plus a string of quadrant digits."""
+        return f"{root[0]},{root[1]}/{path}"
+
+    def _node_geometry(self, root, path: str):
+        """Return (lat, lng, half_step) of a quadtree node below a grid point.
+
+        Quadrant digits: 0=SW, 1=SE, 2=NW, 3=NE.
+        """
+        lat, lng = root
+        half = self.GRID_SPACING / 2.0
+        for q in path:
+            half /= 2.0
+            q = int(q)
+            lat += half if q & 2 else -half
+            lng += half if q & 1 else -half
+        return lat, lng, half
+
+    def _pending_nodes(self, root, quadtree: dict, max_depth: int) -> list:
+        """Quadtree paths under `root` that still need scanning."""
+        pending, stack = [], ['']
+        while stack:
+            path = stack.pop()
+            count = quadtree.get(self._node_key(root, path))
+            if count is None:
+                pending.append(path)
+            elif count >= self.RESULT_CEILING and len(path) < max_depth:
+                stack.extend(self._land_children(root, path))
+        return pending
+
+    def _land_children(self, root, path: str) -> list:
+        """Paths of the quadrants of a node that contain land."""
+        children = []
+        for q in '0123':
+            lat, lng, half = self._node_geometry(root, path + q)
+            if cell_on_land(round(lat, 6), round(lng, 6), half):
+                children.append(path + q)
+        return children
+
     # -- Type normalization --
     @staticmethod
     def _normalize_type(niche: str) -> str:
@@ -595,33 +1160,55 @@ class ScrapeJob:
     # =========================================================================
     #  STEP 1: Collect Place IDs (FREE)
     # =========================================================================
-    def _search_at_point(self, lat, lng):
+    async def _search_at_point(self, session, limiter, lat, lng, half_step=None):
         """Search one grid cell.
 
         If niche_type is set, send it as includedType for the tightest match.
         If includedType is rejected (400) or niche_type is empty, fall back to
         a text-only search and apply the three-bucket exclusion filter instead.
 
-        Returns (included_ids: set, excluded_records: list[dict])
-        where each excluded record is {id, primaryType, googleMapsUrl}.
+        Every request (including pagination) first takes a token from the
+        shared `limiter`, so concurrent cells stay within the configured QPS.
+        Complete responses (all pages) are kept in the shared response cache,
+        keyed by the first-page payload and field mask, and consulted first.
+
+        `half_step` is the half-width of the search rectangle in degrees
+        (defaults to half the grid spacing; smaller for quadtree children).
+
+        In API enrichment mode the field mask also asks for phone, website and
+        address (so those responses are cached under their own keys).
+
+        Returns (included_ids: set, excluded_records: list[dict], total: int,
+        details: dict) where each excluded record is {id, primaryType,
+        googleMapsUrl}, total is the raw number of places Google returned
+        across all pages, and details maps each included place ID to a
+        scraped.json record (empty unless enrichment is 'api').
+
+        Raises PlacesAPIError on a network error or any other non-200 status;
+        partial results are discarded so the caller can retry the whole cell.
         """
         url = 'https://places.googleapis.com/v1/places:searchText'
+        field_mask = self.SEARCH_FIELDS
+        if self.enrichment == 'api':
+            field_mask += ',' + self.API_ENRICHMENT_FIELDS
         headers = {
             'X-Goog-Api-Key': self.api_key,
-            'X-Goog-FieldMask': 'places.id,places.primaryType,places.displayName,nextPageToken'
+            'X-Goog-FieldMask': field_mask,
         }
-        ids = set()
-        excluded = []
+        places = []
+        requests_made = 0
+        cache_key = None
         page_token = None
-        half_step = self.GRID_SPACING / 2.0
-        niche_type = self.niche_type  # may be empty string
+        if half_step is None:
+            half_step = self.GRID_SPACING / 2.0
 
         while True:
+            niche_type = self.niche_type  # may be empty string, or cleared by another worker
             payload = {
                 'textQuery': self.niche,
                 'locationRestriction': {'rectangle': {
-                    'low': {'latitude': lat - half_step, 'longitude': lng - half_step},
-                    'high': {'latitude': lat + half_step, 'longitude': lng + half_step},
+                    'low': {'latitude': round(lat - half_step, 6), 'longitude': round(lng - half_step, 6)},
+                    'high': {'latitude': round(lat + half_step, 6), 'longitude': round(lng + half_step, 6)},
                 }},
                 'maxResultCount': 20,
                 'languageCode': 'en',
@@ -630,49 +1217,87 @@ class ScrapeJob:
                 payload['includedType'] = niche_type
             if page_token:
                 payload['pageToken'] = page_token
+            else:
+                cache_key = self.response_cache.key({'fieldMask': field_mask, **payload})
+                cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+                if cached is not None:
+                    places = cached['places']
+                    self._record_cache_hit(cached['requests'])
+                    break
+                self.progress['cacheMisses'] += 1
+            await limiter.acquire()
             try:
-                r = requests.post(url, headers=headers, json=payload, timeout=30)
-                if r.status_code == 200:
-                    data = r.json()
-                    for p in data.get('places', []):
-                        pid = p.get('id')
-                        if not pid:
-                            continue
-                        primary = p.get('primaryType', '')
-                        if primary in EXCLUDED_PRIMARY_TYPES:
-                            excluded.append({
-                                'id': pid,
-                                'primaryType': primary,
-                                'name': p.get('displayName', {}).get('text', ''),
-                                'googleMapsUrl': f'https://www.google.com/maps/place/?q=place_id:{pid}',
-                            })
-                        else:
-                            ids.add(pid)
-                    page_token = data.get('nextPageToken')
-                    if not page_token:
-                        break
-                    time.sleep(0.5)
-                elif r.status_code == 400 and niche_type:
-                    # includedType not recognized by Google — clear it at the job
-                    # level so NO subsequent grid point wastes an extra API call.
+                async with session.post(url, headers=headers, json=payload) as r:
+                    status = r.status
+                    retry_after = _parse_retry_after(r.headers.get('Retry-After'))
+                    data = await r.json(content_type=None) if status == 200 else None
+            except Exception as e:
+                raise PlacesAPIError(f"network error: {e}") from e
+            if status == 200:
+                requests_made += 1
+                places.extend(data.get('places', []))
+                page_token = data.get('nextPageToken')
+                if not page_token:
+                    await asyncio.to_thread(self.response_cache.put, cache_key,
+                                            {'places': places, 'requests': requests_made})
+                    break
+            elif status == 400 and niche_type:
+                # includedType not recognized by Google — clear it at the job
+                # level so NO subsequent grid point wastes an extra API call.
+                if self.niche_type == niche_type:
                     self.log(f"  includedType '{niche_type}' not recognized, switching to text-only search for all remaining points")
                     self.niche_type = ''
-                    niche_type = ''
-                    page_token = None
-                    ids.clear()
-                    excluded.clear()
-                elif r.status_code == 429:
-                    self.log("  Rate limited, waiting 30s...")
-                    time.sleep(30)
-                else:
-                    self.log(f"  API error ({lat:.2f},{lng:.2f}): {r.status_code}")
-                    break
-            except Exception as e:
-                self.log(f"  Error ({lat:.2f},{lng:.2f}): {e}")
-                break
-        return ids, excluded
+                page_token = None
+                places = []
+                requests_made = 0
+            elif status == 429:
+                raise PlacesAPIError('rate limited (429)', status, retry_after)
+            else:
+                # Partial pages are dropped: the whole cell is retried later.
+                raise PlacesAPIError(f'HTTP {status}', status, retry_after)
+
+        ids = set()
+        excluded = []
+        details = {}
+        for p in places:
+            pid = p.get('id')
+            if not pid:
+                continue
+            primary = p.get('primaryType', '')
+            if primary in EXCLUDED_PRIMARY_TYPES:
+                excluded.append({
+                    'id': pid,
+                    'primaryType': primary,
+                    'name': p.get('displayName', {}).get('text', ''),
+                    'googleMapsUrl': f'https://www.google.com/maps/place/?q=place_id:{pid}',
+                })
+            else:
+                ids.add(pid)
+                if self.enrichment == 'api':
+                    details[pid] = self._place_record(pid, p)
+        return ids, excluded, len(places), details
+
+    @staticmethod
+    def _place_record(place_id: str, place: dict) -> dict:
+        """A Text Search place in the same shape _scrape_place produces."""
+        return {
+            'place_id': place_id,
+            'name': place.get('displayName', {}).get('text', ''),
+            'address': place.get('formattedAddress', ''),
+            'phone': place.get('nationalPhoneNumber', ''),
+            'website': place.get('websiteUri', ''),
+            'google_maps_url': f'https://www.google.com/maps/place/?q=place_id:{place_id}',
+        }
+
+    def _record_cache_hit(self, requests_saved: int):
+        self.progress['cacheHits'] += 1
+        saved = self.progress['cacheSavedUsd'] + requests_saved * self.cost_per_request(self.enrichment)
+        self.progress['cacheSavedUsd'] = round(saved, 3)
 
-    def step_scan(self):
+    async def step_scan(self, feed: StageQueue = None):
+        """Step 1. With `feed` (streaming pipeline), every newly found place
+        is handed on as soon as its cell is committed: its ID for the detail
+        scrape, or with API enrichment (place_id, website, name) for emails."""
         self.status = 'scanning'
         self.log("STEP 1: Scanning for businesses (FREE)...")
 
@@ -682,312 +1307,715 @@ class ScrapeJob:
             return
 
         grid = self._generate_grid(bounds)
-        progress_data = self._load_json(self.progress_file) or {'scanned_points': []}
-        all_ids = set(self._load_json(self.place_ids_file) or [])
+        state = self._load_scan_state()
+        all_ids = state['ids']
         # excluded_map: place_id -> {primaryType, name, googleMapsUrl}
-        excluded_map = {r['id']: r for r in (self._load_json(self.excluded_file) or [])}
-        scanned = set(tuple(p) for p in progress_data.get('scanned_points', []))
+        excluded_map = state['excluded']
+        details = state['details']
+        failed = state['failed']
+        scanned = state['scanned']
         remaining = [p for p in grid if p not in scanned]
 
         self.progress['gridTotal'] = len(grid)
-        self.progress['gridScanned'] = len(scanned)
+        self.progress['cellsMasked'] = len(self._generate_grid(bounds, masked=False)) - len(grid)
+        # `scanned` can hold cells from other regions this job covered, so
+        # count only this region's share.
+        self.progress['gridScanned'] = len(grid) - len(remaining)
         self.progress['placesFound'] = len(all_ids)
         self.progress['placesExcluded'] = len(excluded_map)
+        self.progress['cellsFailed'] = len(failed)
+        if self.enrichment == 'api':
+            self.progress['placesScraped'] = len(details)
+            self.progress['totalWithPhone'] = len([d for d in details.values() if d.get('phone')])
+            self.progress['totalWithWebsite'] = len([d for d in details.values() if d.get('website')])
         self._sync_firebase('scanning')
 
         if remaining:
-            self.log(f"  Grid: {len(grid)} total, {len(remaining)} remaining, {len(all_ids)} IDs so far")
+            self.log(f"  Grid: {len(grid)} total, {len(remaining)} remaining, {len(all_ids)} IDs so far"
+                     f" ({self.scan_mode} mode, {self.scan_concurrency} in flight, {self.scan_qps:g} req/s)")
         else:
             self.log(f"  Grid scan already complete. {len(all_ids)} places found.")
 
-        for lat, lng in remaining:
-            if self.should_stop:
-                self.log("Stopped by user.")
-                break
-
-            new_ids, new_excluded = self._search_at_point(lat, lng)
+        # Every grid point is the root of a quadtree. In grid mode the tree
+        # never splits; in adaptive mode node counts ('q') are stored per cell
+        # so resume can find unfinished leaves. A grid point is marked done
+        # only once its whole tree is, and never while any of its cells is in
+        # `failed`.
+        max_depth = self.MAX_SPLIT_DEPTH if self.scan_mode == 'adaptive' else 0
+        quadtree = state['quadtree']
+        cells_done = 0
+
+        def checkpoint(record: dict):
+            """Commit one cell's outcome to the job store in one transaction."""
+            nonlocal cells_done
+            key = self._node_key(record['root'], record['path'])
+            if 'failed' in record:
+                self.store.record_cell_failure(key, record['failed'], record['status'], record['attempts'])
+            else:
+                self.store.record_cell(key, ids=record.get('ids', ()), excluded=record.get('excluded', ()),
+                                       details=record.get('details', ()), count=record.get('q'),
+                                       done_root=record['root'] if record.get('done') else None)
+            cells_done += 1
+
+        queue = asyncio.Queue()
+        outstanding = {}
+        for root in remaining:
+            nodes = self._pending_nodes(root, quadtree, max_depth)
+            if not nodes:
+                scanned.add(root)
+                self.progress['gridScanned'] += 1
+                checkpoint({'root': list(root), 'path': '', 'done': True})
+                continue
+            outstanding[root] = len(nodes)
+            for path in nodes:
+                queue.put_nowait((root, path, 1))
+        limiter = TokenBucket(self.scan_qps, burst=self.scan_concurrency)
+        failed_roots = set()  # roots with a cell given up on in this run
+        retries = set()       # backoff timers that will requeue a failed cell
+        quota_errors = 0      # consecutive 429s, for the circuit breaker
+
+        async def scan_node(session, root, path):
+            nonlocal quota_errors
+            lat, lng, half = self._node_geometry(root, path)
+            new_ids, new_excluded, total, new_details = await self._search_at_point(
+                session, limiter, lat, lng, half)
+            quota_errors = 0
+            if failed.pop(self._node_key(root, path), None):
+                self.progress['cellsFailed'] = len(failed)
+
+            # Workers share one event loop, so this block runs without
+            # interleaving and the store always matches `scanned`.
+            record = {'root': list(root), 'path': path,
+                      'ids': [pid for pid in new_ids if pid not in all_ids],
+                      'excluded': [r for r in new_excluded if r['id'] not in excluded_map]}
+            if new_details:
+                record['details'] = [d for pid, d in new_details.items() if pid not in details]
+                details.update(new_details)
             all_ids.update(new_ids)
             for rec in new_excluded:
                 excluded_map[rec['id']] = rec
-            scanned.add((lat, lng))
-
-            progress_data['scanned_points'] = [list(p) for p in scanned]
-            self._save_json(self.progress_file, progress_data)
-            self._save_json(self.place_ids_file, list(all_ids))
-            self._save_json(self.excluded_file, list(excluded_map.values()))
+            outstanding[root] -= 1
+            if max_depth:
+                quadtree[self._node_key(root, path)] = total
+                record['q'] = total
+                if total >= self.RESULT_CEILING and len(path) < max_depth:
+                    children = self._land_children(root, path)
+                    outstanding[root] += len(children)
+                    for child in children:
+                        queue.put_nowait((root, child, 1))
+                    self.progress['cellsSplit'] = self.progress.get('cellsSplit', 0) + 1
+            if outstanding[root] == 0 and root not in failed_roots:
+                scanned.add(root)
+                record['done'] = True
+                self.progress['gridScanned'] += 1
+            checkpoint(record)
 
-            self.progress['gridScanned'] = len(scanned)
             self.progress['placesFound'] = len(all_ids)
             self.progress['placesExcluded'] = len(excluded_map)
+            if new_details:
+                self.progress['placesScraped'] = len(details)
+                self.progress['totalWithPhone'] += sum(1 for d in record['details'] if d['phone'])
+                self.progress['totalWithWebsite'] += sum(1 for d in record['details'] if d['website'])
+                self._sync_results([self._result_row(d['place_id'], d) for d in record['details']])
 
-            if len(scanned) % 5 == 0:
+            if cells_done % 5 == 0:
                 self._sync_firebase()
 
-            time.sleep(0.2)
+            if feed is not None:
+                if self.enrichment == 'api':
+                    for d in record.get('details', []):
+                        if d['website']:
+                            await feed.put((d['place_id'], d['website'], d['name']))
+                else:
+                    for pid in record['ids']:
+                        await feed.put(pid)
+
+        def retry_later(item, delay):
+            async def requeue():
+                await asyncio.sleep(delay)
+                queue.put_nowait(item)
+            task = asyncio.create_task(requeue())
+            retries.add(task)
+            task.add_done_callback(retries.discard)
+
+        def scan_failed(root, path, attempt, err):
+            nonlocal quota_errors
+            key = self._node_key(root, path)
+            if err.quota:
+                quota_errors += 1
+                if quota_errors >= self.CIRCUIT_BREAKER_ERRORS:
+                    self.log(f"  {quota_errors} quota errors in a row, pausing scan for {self.CIRCUIT_BREAKER_PAUSE}s...")
+                    limiter.pause(self.CIRCUIT_BREAKER_PAUSE)
+                    self.progress['quotaPauses'] += 1
+                    quota_errors = 0
+                elif err.retry_after:
+                    limiter.pause(err.retry_after)
+            if err.retryable and attempt < self.MAX_CELL_ATTEMPTS:
+                delay = min(self.RETRY_MAX_SECONDS, self.RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                delay = max(delay, err.retry_after or 0) * random.uniform(1, 1.25)
+                self.progress['cellRetries'] += 1
+                self.log(f"  Cell {key}: {err}, retry {attempt} in {delay:.0f}s")
+                retry_later((root, path, attempt + 1), delay)
+                return
+            # Give up for this run. The cell stays out of `scanned`, so resume
+            # (or the next expansion) scans it again.
+            failed[key] = {'error': str(err), 'status': err.status, 'attempts': attempt}
+            failed_roots.add(root)
+            outstanding[root] -= 1
+            self.progress['cellsFailed'] = len(failed)
+            self.log(f"  Cell {key} failed after {attempt} attempt(s): {err}")
+            checkpoint({'root': list(root), 'path': path, 'failed': str(err),
+                        'status': err.status, 'attempts': attempt})
+
+        async def worker(session):
+            while True:
+                root, path, attempt = await queue.get()
+                try:
+                    if not self.should_stop:
+                        try:
+                            await scan_node(session, root, path)
+                        except PlacesAPIError as e:
+                            scan_failed(root, path, attempt, e)
+                finally:
+                    queue.task_done()
+
+        async def drained():
+            # queue.join() alone returns while a failed cell waits out its
+            # backoff, so also wait for the retry timers.
+            while True:
+                await queue.join()
+                if not retries or self.should_stop:
+                    return
+                await asyncio.wait(set(retries), timeout=1)
+
+        if not queue.empty():
+            connector = aiohttp.TCPConnector(limit=self.scan_concurrency, keepalive_timeout=60)
+            timeout = aiohttp.ClientTimeout(total=30)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                workers = [asyncio.create_task(worker(session)) for _ in range(self.scan_concurrency)]
+                join = asyncio.create_task(drained())
+                done, _ = await asyncio.wait([join, *workers], return_when=asyncio.FIRST_COMPLETED)
+                pending = [join, *workers, *retries]
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                # Workers only finish early by raising; surface that to the job.
+                for task in done:
+                    if task is not join:
+                        task.result()
+            if self.should_stop:
+                self.log("Stopped by user.")
 
         self._sync_firebase('scan_complete')
         self.log(f"  Found {len(all_ids)} unique places. ({len(excluded_map)} filtered out)")
+        if failed:
+            self.log(f"  {len(failed)} cells failed and were left unscanned; resume will retry them.")
 
     # =========================================================================
     #  STEP 2: Scrape Google Maps (FREE)
     # =========================================================================
+    # Everything _scrape_place needs, read in one round trip to the page.
+    PLACE_EXTRACT_JS = """() => {
+        const attr = (sel, name) => {
+            const el = document.querySelector(sel);
+            return el ? (el.getAttribute(name) || '') : '';
+        };
+        const h1 = document.querySelector('h1');
+        return {
+            name: h1 ? h1.innerText.trim() : '',
+            address: attr('button[aria-label^="Address"]', 'aria-label'),
+            phone: attr('button[aria-label^="Phone"]', 'aria-label'),
+            tel: attr('a[href^="tel:"]', 'href'),
+            website: attr('a[aria-label^="Website"]', 'href'),
+        };
+    }"""
+    PLACE_PANEL_SELECTOR = 'div[role="main"] h1'
+    # The info rows (address, phone, website) render after the heading; a
+    # place with none of them costs PLACE_INFO_TIMEOUT ms extra.
+    PLACE_INFO_SELECTOR = ('button[aria-label^="Address"], button[aria-label^="Phone"], '
+                           'a[href^="tel:"], a[aria-label^="Website"]')
+    PLACE_INFO_TIMEOUT = 5000
+
+    @staticmethod
+    async def _flush_on_timer(batch: WriteBatch):
+        """Keep `batch`'s time bound while the workers are idle (a streaming
+        stage waiting on a slow upstream adds nothing for a while)."""
+        while True:
+            await asyncio.sleep(min(1.0, batch.max_seconds))
+            batch.flush_due()
+
     async def _scrape_place(self, page, place_id):
         url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
         try:
-            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            await asyncio.sleep(3)
-            result = {'place_id': place_id, 'name': '', 'address': '',
-                      'phone': '', 'website': '', 'google_maps_url': url}
-
-            try:
-                result['name'] = await page.locator('h1').first.inner_text(timeout=5000)
-            except Exception:
-                pass
+            await browser_profile.goto(page, url, self.scrape_stats,
+                                       wait_until='domcontentloaded', timeout=30000)
             try:
-                label = await page.locator('button[aria-label^="Address"]').first.get_attribute('aria-label', timeout=3000)
-                if label:
-                    m = re.search(r'Address:\s*(.+)', label)
-                    if m:
-                        result['address'] = m.group(1).strip()
+                await page.wait_for_selector(self.PLACE_PANEL_SELECTOR, timeout=10000)
+                await page.wait_for_selector(self.PLACE_INFO_SELECTOR, timeout=self.PLACE_INFO_TIMEOUT)
             except Exception:
-                pass
-            try:
-                label = await page.locator('button[aria-label^="Phone"]').first.get_attribute('aria-label', timeout=3000)
-                if label:
-                    m = re.search(r'Phone:\s*(.+)', label)
-                    if m:
-                        result['phone'] = m.group(1).strip()
-            except Exception:
-                pass
-            if not result['phone']:
-                try:
-                    href = await page.locator('a[href^="tel:"]').first.get_attribute('href', timeout=2000)
-                    if href:
-                        result['phone'] = href.replace('tel:', '').strip()
-                except Exception:
-                    pass
-            try:
-                href = await page.locator('a[aria-label^="Website"]').first.get_attribute('href', timeout=3000)
-                if href:
-                    if '/url?q=' in href:
-                        m2 = re.search(r'/url\?q=([^&]+)', href)
-                        if m2:
-                            href = unquote(m2.group(1))
-                    result['website'] = href
-            except Exception:
-                pass
+                pass  # extract whatever rendered; missing fields stay empty
+            fields = await page.evaluate(self.PLACE_EXTRACT_JS)
+            result = {'place_id': place_id, 'name': fields.get('name', ''), 'address': '',
+                      'phone': '', 'website': '', 'google_maps_url': url}
+
+            m = re.search(r'Address:\s*(.+)', fields.get('address', ''))
+            if m:
+                result['address'] = m.group(1).strip()
+            m = re.search(r'Phone:\s*(.+)', fields.get('phone', ''))
+            if m:
+                result['phone'] = m.group(1).strip()
+            elif fields.get('tel'):
+                result['phone'] = fields['tel'].replace('tel:', '').strip()
+            href = fields.get('website', '')
+            if href:
+                if '/url?q=' in href:
+                    m2 = re.search(r'/url\?q=([^&]+)', href)
+                    if m2:
+                        href = unquote(m2.group(1))
+                result['website'] = href
             return result
         except Exception as e:
             return {'place_id': place_id, 'error': str(e)[:200]}
 
-    async def step_scrape(self):
-        self.status = 'scraping'
+    async def step_scrape(self, source: StageQueue = None, feed: StageQueue = None):
+        """Step 2. In the streaming pipeline, place IDs keep arriving on
+        `source` after the saved backlog is done, and each place with a
+        website goes on to `feed` once it is saved.
+
+        Streaming: the job's status belongs to _run_streaming, so the step
+        never sets it while an earlier stage may still be running."""
+        if source is None:
+            self.status = 'scraping'
         self.log("STEP 2: Scraping Google Maps details (FREE)...")
 
-        all_ids = self._load_json(self.place_ids_file) or []
-        scraped = self._load_json(self.scraped_file) or {}
+        all_ids = self.store.place_ids()
+        scraped = self.store.details()
         remaining = [pid for pid in all_ids if pid not in scraped]
 
+        # Places another job scraped recently are copied from the lead index.
+        max_age = self.lead_index_fresh_days * 86400
+        reused = self._reuse_indexed(remaining) if max_age and remaining else {}
+        if reused:
+            self.store.put_details(list(reused.values()))
+            scraped.update(reused)
+            remaining = [pid for pid in remaining if pid not in reused]
+            self.log(f"  {len(reused)} places already scraped by other jobs (lead index)")
+
         self.progress['placesFound'] = len(all_ids)
-        self.progress['placesScraped'] = len([v for v in scraped.values() if 'error' not in v])
-        self.progress['totalWithPhone'] = len([v for v in scraped.values() if v.get('phone')])
-        self.progress['totalWithWebsite'] = len([v for v in scraped.values() if v.get('website')])
-        self._sync_firebase('scraping')
+        self.progress['placesScraped'] = sum(1 for v in scraped.values() if 'error' not in v)
+        self.progress['totalWithPhone'] = sum(1 for v in scraped.values() if v.get('phone'))
+        self.progress['totalWithWebsite'] = sum(1 for v in scraped.values() if v.get('website'))
+        self._sync_firebase('scraping' if source is None else None)
         self.log(f"  {len(all_ids)} total, {len(scraped)} done, {len(remaining)} remaining")
+        # Reused places are not fed on: stages start in order and nothing
+        # above awaits, so they are saved before the email stage reads its
+        # backlog, and feeding them too would count their emails twice.
 
-        if not remaining:
-            self.log("  All already scraped.")
+        if not remaining and source is None:
+            if self.enrichment == 'api':
+                self.log("  Details came from the Places API during the scan (API enrichment).")
+            else:
+                self.log("  All already scraped.")
             self._sync_firebase('scrape_complete')
             return
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            ctx = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            page = await ctx.new_page()
-            fails = 0
-
-            for i, pid in enumerate(remaining):
-                if self.should_stop:
-                    self.log("Stopped by user.")
-                    break
+        queue = asyncio.Queue()
+        for pid in remaining:
+            queue.put_nowait(pid)
+        backlog = set(remaining)
+        # One bucket for the whole pool keeps the overall visit rate polite
+        # no matter how many pages are open.
+        limiter = TokenBucket(self.scrape_rate, burst=1)
+        visited = 0
+        self.scrape_stats = PageStats.restore(self.progress, 'scrape')
+
+        pool = BrowserPool.get()
+        batch = WriteBatch(self.store.put_details, self.CHECKPOINT_BATCH, self.CHECKPOINT_SECONDS)
+
+        async def next_place():
+            if not queue.empty():
+                return queue.get_nowait()
+            while source is not None:
+                pid = await source.get()
+                # The scan may have saved this ID before the backlog was read.
+                if pid is not None and (pid in backlog or pid in scraped):
+                    continue
+                record = self._reuse_indexed([pid]).get(pid) if pid and max_age else None
+                if record is None:
+                    return pid
+                scraped[pid] = record
+                batch.add(record)
+                self.progress['placesScraped'] += 1
+                self.progress['totalWithPhone'] += bool(record['phone'])
+                self.progress['totalWithWebsite'] += bool(record['website'])
+                if feed is not None and record['website']:
+                    await feed.put((pid, record['website'], record['name']))
+            return None
 
-                result = await self._scrape_place(page, pid)
+        async def worker(n):
+            nonlocal visited
+            fails = 0
+            recycled = False
+            visits = 0
+            while not self.should_stop:
+                pid = await next_place()
+                if pid is None:
+                    return
+                await limiter.acquire()
+                async with pool.lease(self.scrape_blocking, self.scrape_stats) as lease:
+                    result = await self._scrape_place(lease.page, pid)
+                    if 'error' in result:
+                        fails += 1
+                        if fails >= self.SCRAPE_WORKER_MAX_FAILS:
+                            lease.discard()
+                    else:
+                        fails = 0
+                        recycled = False
                 scraped[pid] = result
-
-                if 'error' in result:
-                    fails += 1
-                    if fails >= 10:
-                        self.log("  Too many failures, stopping.")
-                        break
-                else:
+                visits += 1
+                visited += 1
+
+                if fails >= self.SCRAPE_WORKER_MAX_FAILS:
+                    if recycled:
+                        self.log(f"  Worker {n}: too many failures, retiring.")
+                        return
+                    self.log(f"  Worker {n}: {fails} failures in a row, dropping its browser context...")
                     fails = 0
+                    recycled = True
 
-                self._save_json(self.scraped_file, scraped)
+                batch.add(result)
+                if 'error' not in result:
+                    self._sync_results([self._result_row(pid, result)])
 
-                success = len([v for v in scraped.values() if 'error' not in v])
-                self.progress['placesScraped'] = success
-                self.progress['totalWithPhone'] = len([v for v in scraped.values() if v.get('phone')])
-                self.progress['totalWithWebsite'] = len([v for v in scraped.values() if v.get('website')])
+                # Each place is visited once per run, so the totals only grow.
+                if 'error' not in result:
+                    self.progress['placesScraped'] += 1
+                self.progress['totalWithPhone'] += bool(result.get('phone'))
+                self.progress['totalWithWebsite'] += bool(result.get('website'))
+                self.progress.update(self.scrape_stats.as_progress('scrape'))
 
-                if (i + 1) % 10 == 0:
+                if visited % 10 == 0:
                     self._sync_firebase()
-                    self.log(f"  Scraped {success}...")
+                    self.log(f"  Scraped {self.progress['placesScraped']}...")
+
+                if feed is not None and result.get('website'):
+                    await feed.put((pid, result['website'], result['name']))
 
                 await asyncio.sleep(random.uniform(2, 4))
-                if (i + 1) % 25 == 0:
+                if visits % 25 == 0:
                     pause = random.uniform(15, 30)
-                    self.log(f"  Pausing {pause:.0f}s...")
+                    self.log(f"  Worker {n}: pausing {pause:.0f}s...")
                     await asyncio.sleep(pause)
 
-            await browser.close()
+        workers = self.scrape_concurrency if source is not None else min(self.scrape_concurrency, len(remaining))
+        self.log(f"  {workers} pages in parallel, {self.scrape_rate:g} visits/s overall")
+        timer = asyncio.create_task(self._flush_on_timer(batch))
+        try:
+            await asyncio.gather(*(worker(n + 1) for n in range(workers)))
+        finally:
+            timer.cancel()
+            batch.flush()
+
+        if self.should_stop:
+            self.log("Stopped by user.")
+        elif not queue.empty():
+            self.log("  All workers gave up after repeated failures, stopping.")
 
-        self._sync_firebase('scrape_complete')
+        self._sync_firebase('scrape_complete' if source is None else None)
         self.log(f"  Scraping complete. {self.progress['placesScraped']} businesses.")
 
     # =========================================================================
     #  STEP 3: Scrape Emails (FREE)
     # =========================================================================
-    EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+\-]+@[a-zA-Z0-9.\-]+\.[a-zA-Z]{2,}', re.I)
-    JUNK_DOMAINS = {'example.com', 'test.com', 'email.com', 'domain.com',
-                    'sentry.io', 'wixpress.com', 'googleapis.com', 'google.com',
-                    'gstatic.com', 'w3.org', 'schema.org', 'wordpress.org',
-                    'wordpress.com', 'squarespace.com', 'godaddy.com'}
-
-    def _extract_emails(self, text):
-        raw = self.EMAIL_RE.findall(text)
-        clean = set()
-        for e in raw:
-            e = e.strip().rstrip('.').lower()
-            domain = e.split('@')[-1]
-            if domain not in self.JUNK_DOMAINS and len(e) < 100:
-                if not any(ext in e for ext in ['.png', '.jpg', '.gif', '.svg', '.woff', '.css', '.js']):
-                    clean.add(e)
-        return clean
-
-    async def _scrape_emails_from_site(self, page, url):
-        emails = set()
+    # Hosts that serve many unrelated businesses; their sites are told apart
+    # by path rather than sharing one origin.
+    SHARED_HOSTS = {'facebook.com', 'm.facebook.com', 'instagram.com', 'linktr.ee',
+                    'yelp.com', 'sites.google.com', 'google.com', 'g.page', 'x.com',
+                    'twitter.com', 'linkedin.com', 'nextdoor.com', 'youtube.com'}
+
+    def _origin_key(self, url: str) -> str:
+        """Normalized website origin: lowercase host without www/scheme/port 80/443."""
+        parsed = urlparse(url.strip())
+        host = (parsed.hostname or '').lower().removeprefix('www.')
+        if parsed.port and parsed.port not in (80, 443):
+            host = f'{host}:{parsed.port}'
+        if host in self.SHARED_HOSTS:
+            return host + parsed.path.rstrip('/').lower()
+        return host
+
+    CONTACT_TEXT = ('contact', 'reach us', 'get in touch')
+    CONTACT_HREF = ('contact', 'about')
+    CONTACT_CANDIDATES = 3  # contact pages tried per site (HTTP: at once, browser: in turn); first with an email wins
+
+    # Page HTML plus every anchor, read in one round trip.
+    PAGE_LINKS_JS = """() => {
+        const links = [];
+        for (const a of document.querySelectorAll('a[href]')) {
+            if (links.length >= 300) break;
+            links.push([a.href, (a.innerText || a.getAttribute('aria-label') || '').trim().slice(0, 80)]);
+        }
+        return {html: document.documentElement.outerHTML, links};
+    }"""
+
+    def _contact_links(self, base_url, anchors) -> list:
+        """Same-site contact/about page URLs from (href, text) pairs, best first.
+
+        Link text naming a contact page ranks above a contact URL, which ranks
+        above an about page.
+        """
+        origin = self._origin_key(base_url)
+        ranked = {}
+        for href, text in anchors:
+            text, lowered = text.lower(), href.lower()
+            if any(kw in text for kw in self.CONTACT_TEXT):
+                score = 3
+            elif 'contact' in lowered:
+                score = 2
+            elif any(kw in lowered for kw in self.CONTACT_HREF) or 'about' in text:
+                score = 1
+            else:
+                continue
+            link = urljoin(base_url, href).split('#')[0]
+            if (link.startswith('http') and link.rstrip('/') != base_url.rstrip('/')
+                    and self._origin_key(link) == origin):
+                ranked[link] = max(score, ranked.get(link, 0))
+        return sorted(ranked, key=lambda link: -ranked[link])
+
+    async def _sitemap_hints(self, fetcher, url) -> list:
+        """Contact/about URLs listed in the site's sitemap.xml, as (href, '') pairs."""
+        origin = self._origin_key(url)
+        if origin not in self._sitemap_memo:
+            page = await fetcher.fetch(urljoin(url, '/sitemap.xml'), html_only=False)
+            locs = site_fetcher.sitemap_locs(page[1]) if page else []
+            self._sitemap_memo[origin] = [(loc, '') for loc in locs
+                                          if any(kw in loc.lower() for kw in self.CONTACT_HREF)]
+        return self._sitemap_memo[origin]
+
+    @staticmethod
+    async def _first_hit(coros) -> set:
+        """Run `coros` together; return the first non-empty result and cancel the rest."""
+        tasks = [asyncio.ensure_future(c) for c in coros]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                result = await fut
+                if result:
+                    return result
+            return set()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _scrape_emails_http(self, fetcher, url):
+        """Static-HTML tier: the homepage, then the best contact pages at once.
+
+        Returns the emails found (empty means the browser tier should try),
+        or None if the homepage could not be fetched.
+        """
         if not url or not url.startswith('http'):
+            return set()
+        page = await fetcher.fetch(url)
+        if not page:
+            return None
+        final_url, html = page
+        emails = await email_extractor.extract_async(html)
+        if emails or site_fetcher.looks_js_rendered(html):
             return emails
+
+        anchors = site_fetcher.links(html) + await self._sitemap_hints(fetcher, final_url)
+        candidates = self._contact_links(final_url, anchors)[:self.CONTACT_CANDIDATES]
+
+        async def fetch_emails(link):
+            page = await fetcher.fetch(link)
+            return await email_extractor.extract_async(page[1]) if page else set()
+
+        return await self._first_hit(fetch_emails(link) for link in candidates)
+
+    async def _page_emails(self, fields: dict) -> set:
+        """Emails in a PAGE_LINKS_JS result: page text plus mailto: links."""
+        emails = await email_extractor.extract_async(fields['html'])
+        for href, _ in fields['links']:
+            if href.lower().startswith('mailto:'):
+                e = email_extractor.clean(unquote(href[7:]).split('?')[0])
+                if e:
+                    emails.add(e)
+        return emails
+
+    async def _scrape_emails_from_site(self, page, url, fetcher=None):
+        """Browser tier: render the homepage, then the best contact pages one
+        at a time in the same leased page (first with an email wins), so
+        the pool's page cap holds. None if the homepage did not load."""
+        if not url or not url.startswith('http'):
+            return set()
         try:
-            await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+            await browser_profile.goto(page, url, self.email_stats,
+                                       wait_until='domcontentloaded', timeout=15000)
             await asyncio.sleep(2)
-            content = await page.content()
-            emails.update(self._extract_emails(content))
+            fields = await page.evaluate(self.PAGE_LINKS_JS)
+        except Exception:
+            return None
+        emails = await self._page_emails(fields)
+        if emails:
+            return emails
 
-            # mailto links
+        anchors = [tuple(a) for a in fields['links']]
+        if fetcher is not None:
+            anchors += await self._sitemap_hints(fetcher, page.url)
+        candidates = self._contact_links(page.url, anchors)[:self.CONTACT_CANDIDATES]
+
+        for link in candidates:
             try:
-                ml = page.locator('a[href^="mailto:"]')
-                for i in range(min(await ml.count(), 10)):
-                    href = await ml.nth(i).get_attribute('href')
-                    if href:
-                        e = href.replace('mailto:', '').split('?')[0].strip().lower()
-                        if e and e.split('@')[-1] not in self.JUNK_DOMAINS:
-                            emails.add(e)
+                await browser_profile.goto(page, link, self.email_stats,
+                                           wait_until='domcontentloaded', timeout=15000)
+                await asyncio.sleep(2)
+                emails = await self._page_emails(await page.evaluate(self.PAGE_LINKS_JS))
             except Exception:
-                pass
-
-            # Try contact page if nothing found
-            if not emails:
-                contact_hrefs = []
-                try:
-                    links = page.locator('a')
-                    for i in range(min(await links.count(), 50)):
-                        try:
-                            text = (await links.nth(i).inner_text(timeout=1000)).lower()
-                            href = await links.nth(i).get_attribute('href', timeout=1000)
-                            if href and any(kw in text for kw in ['contact', 'reach us', 'get in touch']):
-                                contact_hrefs.append(href)
-                            elif href and any(kw in str(href).lower() for kw in ['contact', 'about']):
-                                contact_hrefs.append(href)
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-
-                for link in contact_hrefs[:2]:
-                    try:
-                        if not link.startswith('http'):
-                            link = urljoin(url, link)
-                        if urlparse(link).netloc == urlparse(url).netloc:
-                            await page.goto(link, wait_until='domcontentloaded', timeout=15000)
-                            await asyncio.sleep(2)
-                            emails.update(self._extract_emails(await page.content()))
-                            try:
-                                ml2 = page.locator('a[href^="mailto:"]')
-                                for i in range(min(await ml2.count(), 10)):
-                                    href = await ml2.nth(i).get_attribute('href')
-                                    if href:
-                                        e = href.replace('mailto:', '').split('?')[0].strip().lower()
-                                        if e and e.split('@')[-1] not in self.JUNK_DOMAINS:
-                                            emails.add(e)
-                            except Exception:
-                                pass
-                        if emails:
-                            break
-                    except Exception:
-                        continue
-        except Exception:
-            pass
-        return emails
-
-    async def step_emails(self):
-        self.status = 'emails'
+                continue
+            if emails:
+                return emails
+        return set()
+
+    async def step_emails(self, source: StageQueue = None):
+        """Step 3. In the streaming pipeline, (place_id, website, name) items
+        keep arriving on `source` after the saved backlog is done; the job's
+        status is then left to _run_streaming, as in step_scrape."""
+        if source is None:
+            self.status = 'emails'
         self.log("STEP 3: Finding emails from business websites (FREE)...")
 
-        scraped = self._load_json(self.scraped_file) or {}
-        email_data = self._load_json(self.emails_file) or {}
+        scraped = self.store.details()
+        email_data = self.store.emails()
 
         to_scrape = [(pid, info.get('website', ''), info.get('name', ''))
                      for pid, info in scraped.items()
                      if 'error' not in info and info.get('website') and pid not in email_data]
 
+        # Places sharing a website are crawled once, as one group. A group
+        # stays in `origins` until its crawl finishes, so streamed places for
+        # an origin already queued or being crawled join it.
+        origins = {}
+        for item in to_scrape:
+            origins.setdefault(self._origin_key(item[1]), []).append(item)
+
+        found = sum(1 for v in email_data.values() if v)
         self.progress['emailsScraped'] = len(email_data)
-        self.progress['emailsFound'] = len([v for v in email_data.values() if v])
-        self._sync_firebase('emails')
-        self.log(f"  {len(to_scrape)} websites to check ({len(email_data)} already done)")
+        self.progress['emailsFound'] = found
+        self.progress['emailOrigins'] = len(origins)
+        self._sync_firebase('emails' if source is None else None)
+        self.log(f"  {len(to_scrape)} websites to check across {len(origins)} unique sites"
+                 f" ({len(email_data)} already done)")
 
-        if not to_scrape:
+        if not to_scrape and source is None:
             self.log("  All already checked.")
             self._sync_firebase('emails_complete')
             return
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            ctx = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            page = await ctx.new_page()
-            found = len([v for v in email_data.values() if v])
-
-            for i, (pid, website, name) in enumerate(to_scrape):
-                if self.should_stop:
-                    self.log("Stopped by user.")
-                    break
+        self.email_stats = PageStats.restore(self.progress, 'email')
+        pool = BrowserPool.get()
+        batch = WriteBatch(self.store.put_email_groups, self.CHECKPOINT_BATCH, self.CHECKPOINT_SECONDS)
+        self._sitemap_memo = {}
+        queue = asyncio.Queue()
+        for origin in origins:
+            queue.put_nowait(origin)
+        seen = set(origins)
+
+        async def next_origin():
+            if not queue.empty():
+                return queue.get_nowait()
+            while source is not None:
+                item = await source.get()
+                if item is None:
+                    return None
+                origin = self._origin_key(item[1])
+                if origin in origins:
+                    origins[origin].append(item)
+                    continue
+                origins[origin] = [item]
+                if origin not in seen:
+                    seen.add(origin)
+                    self.progress['emailOrigins'] += 1
+                return origin
+            return None
 
-                emails = await self._scrape_emails_from_site(page, website)
-                email_data[pid] = list(emails)
+        async def crawl(fetcher, website):
+            """Emails found for `website`; None if the tier that had the
+            last word could not load it."""
+            self.progress['emailHttpSites'] += 1
+            emails = await self._scrape_emails_http(fetcher, website)
+            if emails:
+                self.progress['emailHttpHits'] += 1
+                return emails
+            self.progress['emailBrowserSites'] += 1
+            async with pool.lease(self.email_blocking, self.email_stats) as lease:
+                emails = await self._scrape_emails_from_site(lease.page, website, fetcher)
+            if emails:
+                self.progress['emailBrowserHits'] += 1
+            await asyncio.sleep(random.uniform(1, 3))
+            return emails
+
+        async def worker(fetcher):
+            nonlocal found
+            while not self.should_stop:
+                origin = await next_origin()
+                if origin is None:
+                    return
+
+                website = origins[origin][0][1]
+                cache_key = self.email_cache.key({'origin': origin})
+                cached = await asyncio.to_thread(self.email_cache.get, cache_key)
+                if cached is not None:
+                    emails = set(cached['emails'])
+                    self.progress['emailCacheHits'] += 1
+                else:
+                    self.progress['emailCacheMisses'] += 1
+                    emails = await crawl(fetcher, website)
+                    if self.should_stop and not emails:
+                        return  # interrupted mid-crawl; leave it for resume
+                    # A site that failed to load is not cached, so a timeout
+                    # or DNS blip does not hide its emails from later jobs.
+                    if emails is not None:
+                        await asyncio.to_thread(self.email_cache.put, cache_key,
+                                                {'emails': sorted(emails), 'url': website})
+                    emails = emails or set()
+
+                sites = origins.pop(origin)
+                for pid, _, name in sites:
+                    email_data[pid] = list(emails)
                 if emails:
-                    found += 1
-                    self.log(f"  Email: {', '.join(emails)} ({name[:30]})")
+                    found += len(sites)
+                    names = ', '.join(name[:30] for _, _, name in sites[:3])
+                    self.log(f"  Email: {', '.join(emails)} ({names}{'...' if len(sites) > 3 else ''})")
 
-                self._save_json(self.emails_file, email_data)
+                batch.add(([pid for pid, _, _ in sites], emails))
+                if emails:
+                    self._sync_results([{'placeId': pid, 'email': '; '.join(emails)} for pid, _, _ in sites])
                 self.progress['emailsScraped'] = len(email_data)
                 self.progress['emailsFound'] = found
+                self.progress.update(self.email_stats.as_progress('email'))
 
-                if (i + 1) % 10 == 0:
+                checked = self.progress['emailCacheHits'] + self.progress['emailCacheMisses']
+                if checked % 10 == 0:
                     self._sync_firebase()
 
-                await asyncio.sleep(random.uniform(1, 3))
-                if (i + 1) % 20 == 0:
-                    await asyncio.sleep(random.uniform(10, 20))
-
-            await browser.close()
-
-        self._sync_firebase('emails_complete')
+        async with SiteFetcher(concurrency=self.email_concurrency * 2) as fetcher:
+            workers = self.email_concurrency if source is not None else min(self.email_concurrency, len(to_scrape))
+            timer = asyncio.create_task(self._flush_on_timer(batch))
+            try:
+                await asyncio.gather(*(worker(fetcher) for _ in range(workers)))
+            finally:
+                timer.cancel()
+                batch.flush()
+        self._sitemap_memo = {}
+        if self.should_stop:
+            self.log("Stopped by user.")
+        if self.progress['emailCacheHits']:
+            self.log(f"  {self.progress['emailCacheHits']} sites answered from the email cache")
+        http_sites = self.progress['emailHttpSites']
+        if http_sites:
+            self.log(f"  Static HTML found emails for {self.progress['emailHttpHits']}/{http_sites} sites; "
+                     f"browser for {self.progress['emailBrowserHits']}/{self.progress['emailBrowserSites']} fallbacks")
+
+        self._sync_firebase('emails_complete' if source is None else None)
         self.log(f"  Found emails for {found} businesses.")
 
     # =========================================================================
@@ -995,73 +2023,29 @@ class ScrapeJob:
     # =========================================================================
     def step_export(self):
         self.log("STEP 4: Exporting results...")
-        scraped = self._load_json(self.scraped_file) or {}
-        email_data = self._load_json(self.emails_file) or {}
-
-        results = []
-        fb_results = []
-        for pid, info in scraped.items():
-            if 'error' in info:
-                continue
-            emails = email_data.get(pid, [])
-            email_str = '; '.join(emails) if emails else ''
-            results.append({
-                'Place ID': pid,
-                'Business Name': info.get('name', ''),
-                'Phone': info.get('phone', ''),
-                'Email': email_str,
-                'Website': info.get('website', ''),
-                'Address': info.get('address', ''),
-                'Google Maps': info.get('google_maps_url', ''),
-            })
-            fb_results.append({
-                'placeId': pid,
-                'name': info.get('name', ''),
-                'phone': info.get('phone', ''),
-                'email': email_str,
-                'website': info.get('website', ''),
-                'address': info.get('address', ''),
-                'googleMapsUrl': info.get('google_maps_url', ''),
-            })
-
-        if not results:
+        if not self.store.summary()['details_ok']:
             self.log("  No results to export.")
             return
 
-        df = pd.DataFrame(results).sort_values('Business Name')
-        df = df[df['Business Name'].str.len() > 0]
-        df.to_csv(self.csv_file, index=False)
-
-        with_phone = df[df['Phone'].str.len() > 0].shape[0]
-        with_email = df[df['Email'].str.len() > 0].shape[0]
-        with_website = df[df['Website'].str.len() > 0].shape[0]
-
-        self.progress['totalWithPhone'] = with_phone
-        self.progress['totalWithEmail'] = with_email
-        self.progress['totalWithWebsite'] = with_website
-
-        self.log(f"  {len(df)} businesses, {with_phone} phones, {with_email} emails")
-        self.log(f"  CSV saved: {self.csv_file}")
-
-        # Export filtered-out places to a separate CSV for review
-        excluded_records = self._load_json(self.excluded_file) or []
-        if excluded_records:
-            ex_df = pd.DataFrame(excluded_records, columns=['id', 'name', 'primaryType', 'googleMapsUrl'])
-            ex_df = ex_df.rename(columns={
-                'id': 'Place ID', 'name': 'Business Name',
-                'primaryType': 'Excluded Reason (Google Type)', 'googleMapsUrl': 'Google Maps',
-            }).sort_values('Excluded Reason (Google Type)')
-            ex_df.to_csv(self.excluded_csv_file, index=False)
-            self.progress['placesExcluded'] = len(ex_df)
-            self.log(f"  {len(ex_df)} filtered places saved: {self.excluded_csv_file}")
+        result = exporter.export(self.store, self.csv_file.with_suffix(''), self.export_formats, self.log)
+
+        self.progress['totalWithPhone'] = result['with_phone']
+        self.progress['totalWithEmail'] = result['with_email']
+        self.progress['totalWithWebsite'] = result['with_website']
+        self.progress['placesExcluded'] = result['excluded']
+
+        self.log(f"  {result['rows']} businesses, {result['with_phone']} phones, {result['with_email']} emails")
+        for path in result['files']:
+            self.log(f"  Saved: {path}")
+        indexed = self.lead_index.update_from_job(self.store, self.project_dir.name, self.niche, self.region)
+        self.log(f"  {indexed} leads added to the lead index")
 
         # Upload to Firebase
         if self.fb.enabled and self.firebase_job_id:
-            self.fb.upload_results(self.firebase_job_id, fb_results)
-            csv_content = self.csv_file.read_text()
-            csv_url = self.fb.upload_csv(self.firebase_job_id, csv_content, self.csv_file.name)
+            self._upload_results()
+            csv_url = self._upload_csv(self.csv_file)
             self.fb.update_job(self.firebase_job_id, status='complete',
-                              progress=self.progress, total_results=len(df),
+                              progress=self.progress, total_results=result['rows'],
                               csv_url=csv_url or '')
             if csv_url:
                 self.log(f"  Uploaded to Firebase: {csv_url}")
@@ -1070,17 +2054,158 @@ class ScrapeJob:
         self._save_meta()
         self.log("Done!")
 
+    def _reuse_indexed(self, place_ids) -> dict:
+        """Fresh lead index records for `place_ids` from other jobs, also
+        queued for Firebase; counted in progress['placesFromIndex']."""
+        found = self.lead_index.fresh(place_ids, self.lead_index_fresh_days * 86400,
+                                      exclude_job=self.project_dir.name)
+        if found:
+            self.progress['placesFromIndex'] = self.progress.get('placesFromIndex', 0) + len(found)
+            self._sync_results([self._result_row(pid, record) for pid, record in found.items()])
+        return found
+
+    # -- Firebase upload --
+    @staticmethod
+    def _result_row(pid: str, info: dict, emails=None) -> dict:
+        """A place as one Firebase results row. Without `emails` the row
+        has no email field, so syncing details doesn't blank an email the
+        cloud already has for the place."""
+        row = {
+            'placeId': pid,
+            'name': info.get('name', ''),
+            'phone': info.get('phone', ''),
+            'website': info.get('website', ''),
+            'address': info.get('address', ''),
+            'googleMapsUrl': info.get('google_maps_url', ''),
+        }
+        if emails is not None:
+            row['email'] = '; '.join(emails)
+        return row
+
+    def _sync_results(self, rows: list):
+        """Send rows to Firebase in the background while the job runs. Rows
+        are upserted by placeId, so resends from resume or rerun replace
+        rather than duplicate; export later sends only what is still missing."""
+        target = self.firebase_job_id
+        if target and self.fb.enabled:
+            self.fb.queue_results(target, rows, lambda acked: self._results_acked(target, acked))
+
+    def _results_acked(self, target: str, rows: list):
+        """Called from the sender thread once Firebase has stored `rows`."""
+        # Partial (email-only) rows can't stand in for the full row export
+        # would send, so only detail rows count as uploaded, as the row of
+        # a place without email. Export resends those that found one.
+        full = [{'email': '', **row} for row in rows if 'name' in row]
+        if full:
+            self.store.ack_uploaded(target, [(row['placeId'], self._row_digest(row)) for row in full])
+        self.progress['resultRowsSynced'] = self.progress.get('resultRowsSynced', 0) + len(rows)
+        if 'firstLeadSeconds' not in self.progress and self.run_started is not None:
+            if any(row.get('phone') or row.get('email') for row in rows):
+                self.progress['firstLeadSeconds'] = round(time.monotonic() - self.run_started, 1)
+
+    @staticmethod
+    def _row_digest(row: dict) -> str:
+        return hashlib.sha1(json.dumps(row, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _upload_results(self):
+        """Upload rows that are new or changed since the last acknowledged
+        upload, UPLOAD_CHUNK_ROWS per request. Each acknowledged chunk is
+        recorded, so a failed export resumes where it stopped."""
+        target = self.firebase_job_id
+        chunk, chunks, sent, unchanged = [], 0, 0, 0
+
+        def send():
+            if not self.fb.upload_results_chunk(target, [row for row, _ in chunk], chunks):
+                self.log(f"  Results upload failed at chunk {chunks + 1}; the next export resumes there.")
+                return False
+            self.store.ack_uploaded(target, [(row['placeId'], digest) for row, digest in chunk])
+            return True
+
+        for pid, info, emails, uploaded in self.store.iter_results_to_upload(target):
+            row = self._result_row(pid, info, emails)
+            digest = self._row_digest(row)
+            if digest == uploaded:
+                unchanged += 1
+                continue
+            chunk.append((row, digest))
+            if len(chunk) >= self.UPLOAD_CHUNK_ROWS:
+                if not send():
+                    return
+                sent, chunks, chunk = sent + len(chunk), chunks + 1, []
+        if chunk:
+            if not send():
+                return
+            sent, chunks = sent + len(chunk), chunks + 1
+        if sent:
+            self.log(f"  Uploaded {sent} new or changed rows to Firebase in {chunks} chunks"
+                     f" ({unchanged} already there)")
+        else:
+            self.log("  Firebase results already up to date.")
+
+    def _csv_parts(self, path: Path):
+        """`path` read back in parts of about CSV_PART_BYTES, split on line
+        boundaries."""
+        current, size = [], 0
+        with open(path, 'rb') as f:
+            for line in f:
+                current.append(line)
+                size += len(line)
+                if size >= self.CSV_PART_BYTES:
+                    yield b''.join(current)
+                    current, size = [], 0
+        if current:
+            yield b''.join(current)
+
+    def _upload_csv(self, path: Path) -> str | None:
+        """Upload the CSV in parts, skipping parts already acknowledged for
+        the same file contents; returns its URL once assembled."""
+        digest, parts = hashlib.sha1(), 0
+        for part in self._csv_parts(path):
+            digest.update(part)
+            parts += 1
+        key = (self.firebase_job_id, path.name, digest.hexdigest())
+        state = self.store.get_value('csv_upload') or {}
+        if (state.get('target'), state.get('file'), state.get('digest')) != key:
+            state = {'target': key[0], 'file': key[1], 'digest': key[2], 'acked': 0, 'url': ''}
+        if state['url']:
+            return state['url']
+        for n, part in enumerate(self._csv_parts(path)):
+            if n < state['acked']:
+                continue
+            resp = self.fb.upload_csv_part(self.firebase_job_id, path.name, n, parts, part.decode('utf-8'))
+            if not resp.get('success'):
+                self.log(f"  CSV upload failed at part {n + 1}/{parts}; the next export resumes there.")
+                return None
+            state['acked'] = n + 1
+            state['url'] = resp.get('csvUrl') or ''
+            self.store.set_value('csv_upload', state)
+        return state['url'] or None
+
+    async def _export(self):
+        # File writing and the Firebase upload block; keep them off the shared loop
+        # so other jobs keep running meanwhile.
+        await asyncio.to_thread(self.step_export)
+
     # =========================================================================
     #  RUN FULL PIPELINE (new job)
     # =========================================================================
     async def run(self):
         # Create Firebase job
-        self.firebase_job_id = self.fb.create_job(self.niche, self.region)
+        self.firebase_job_id = await asyncio.to_thread(self.fb.create_job, self.niche, self.region)
         if self.firebase_job_id:
             self.log(f"Firebase job: {self.firebase_job_id}")
         self._save_meta()
 
-        self.step_scan()
+        await self._run_pipeline()
+
+    async def _run_pipeline(self):
+        """Scan, scrape, emails and export, one step after another or (in
+        streaming mode) as concurrent stages."""
+        if self.pipeline == 'streaming':
+            await self._run_streaming()
+            return
+        self.run_started = time.monotonic()
+        await self.step_scan()
         if self.should_stop:
             return
         await self.step_scrape()
@@ -1089,7 +2214,50 @@ class ScrapeJob:
         await self.step_emails()
         if self.should_stop:
             return
-        self.step_export()
+        await self._export()
+
+    async def _run_streaming(self):
+        """Run the steps as stages joined by bounded StageQueues.
+
+        Each stage first works through the backlog its checkpoint files
+        leave (so resume picks up items that were queued or in flight), then
+        takes new items from the stage before it. When a stage finishes, the
+        job's status moves on to the next one (only the scan, the leading
+        stage, sets it itself); if one fails, the others are cancelled.
+        """
+        started = self.run_started = time.monotonic()
+        to_scrape = StageQueue(self.pipeline_queue_size)
+        to_email = StageQueue(self.pipeline_queue_size)
+        if self.enrichment == 'api':
+            stages = [(self.step_scan(feed=to_email), None, to_email, 'emails'),
+                      (self.step_emails(source=to_email), to_email, None, 'emails_complete')]
+        else:
+            stages = [(self.step_scan(feed=to_scrape), None, to_scrape, 'scraping'),
+                      (self.step_scrape(source=to_scrape, feed=to_email), to_scrape, to_email, 'emails'),
+                      (self.step_emails(source=to_email), to_email, None, 'emails_complete')]
+
+        async def stage(step, source, feed, next_status):
+            try:
+                await step
+            finally:
+                if source is not None:
+                    source.close()  # upstream must not block on a stage that has ended
+                if feed is not None:
+                    feed.finish()
+            if next_status and not self.should_stop:
+                self._sync_firebase(next_status)
+
+        tasks = [asyncio.create_task(stage(*s)) for s in stages]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
+        if self.should_stop:
+            return
+        self.log(f"  Pipeline finished in {(time.monotonic() - started) / 60:.1f} min.")
+        await self._export()
 
     # =========================================================================
     #  RESUME PIPELINE (pick up from where we left off)
@@ -1098,61 +2266,54 @@ class ScrapeJob:
         """Resume a previously interrupted job from the last checkpoint."""
         if not self.firebase_job_id:
             # No firebase job exists, create one now
-            self.firebase_job_id = self.fb.create_job(self.niche, self.region)
+            self.firebase_job_id = await asyncio.to_thread(self.fb.create_job, self.niche, self.region)
             if self.firebase_job_id:
                 self.log(f"Created new Firebase job: {self.firebase_job_id}")
             self._save_meta()
 
         self.log(f"Resuming job: {self.niche} in {self.region}")
+        self.run_started = time.monotonic()
 
         # Determine whether there are grid points that still need scanning.
         # This handles the region-expansion case: after expand_region() the
-        # bounding box is larger, so new grid cells exist that are not yet in
-        # progress.json even though all previously-found places may be fully
+        # bounding box is larger, so new grid cells exist that are not yet
+        # scanned even though all previously-found places may be fully
         # scraped and emailed.
+        scan_state = self.store.scan_state()
         bounds = get_region_bounds(self.region_key)
         if bounds:
             full_grid = self._generate_grid(bounds)
-            progress_data = self._load_json(self.progress_file) or {'scanned_points': []}
-            already_scanned = set(tuple(p) for p in progress_data.get('scanned_points', []))
+            already_scanned = scan_state['scanned']
             grid_remaining = [p for p in full_grid if p not in already_scanned]
         else:
             grid_remaining = []
 
         if grid_remaining:
             self.log(f"  {len(grid_remaining)} grid points remaining — running full pipeline from scan...")
-            self.step_scan()
-            if self.should_stop:
-                return
-            await self.step_scrape()
-            if self.should_stop:
-                return
-            await self.step_emails()
-            if self.should_stop:
-                return
-            self.step_export()
+            await self._run_pipeline()
+            return
+
+        if self.pipeline == 'streaming':
+            # Every stage starts from its own checkpoint backlog.
+            self.log("  Resuming all steps as a streaming pipeline...")
+            await self._run_streaming()
             return
 
         # Determine which step to resume from based on local checkpoint data
-        has_place_ids = self.place_ids_file.exists() and len(self._load_json(self.place_ids_file) or []) > 0
-        has_scraped = self.scraped_file.exists() and len(self._load_json(self.scraped_file) or {}) > 0
-        has_emails = self.emails_file.exists() and len(self._load_json(self.emails_file) or {}) > 0
+        summary = self.store.summary()
+        has_place_ids = summary['places'] > 0
+        has_scraped = summary['details'] > 0
+        has_emails = summary['emails'] > 0
 
         # Check what's left to do
-        all_ids = self._load_json(self.place_ids_file) or []
-        scraped = self._load_json(self.scraped_file) or {}
-        email_data = self._load_json(self.emails_file) or {}
-
-        scrape_remaining = [pid for pid in all_ids if pid not in scraped] if has_place_ids else []
-        email_targets = [(pid, info.get('website', ''))
-                         for pid, info in scraped.items()
-                         if 'error' not in info and info.get('website') and pid not in email_data] if has_scraped else []
+        scrape_remaining = summary['scrape_pending']
+        email_targets = summary['email_pending']
 
         # Smart resume: skip completed steps
         if has_emails and not email_targets:
             # Emails done, just need to export
             self.log("  All steps complete. Running export...")
-            self.step_export()
+            await self._export()
             return
 
         if has_scraped and not scrape_remaining and not email_targets:
@@ -1161,7 +2322,7 @@ class ScrapeJob:
             await self.step_emails()
             if self.should_stop:
                 return
-            self.step_export()
+            await self._export()
             return
 
         if has_scraped and not scrape_remaining:
@@ -1170,7 +2331,7 @@ class ScrapeJob:
             await self.step_emails()
             if self.should_stop:
                 return
-            self.step_export()
+            await self._export()
             return
 
         if has_place_ids and not scrape_remaining:
@@ -1182,33 +2343,24 @@ class ScrapeJob:
             await self.step_emails()
             if self.should_stop:
                 return
-            self.step_export()
+            await self._export()
             return
 
         if has_place_ids and scrape_remaining:
             # Scan done, scraping partially done
-            self.log(f"  Resuming scraping ({len(scrape_remaining)} remaining)...")
+            self.log(f"  Resuming scraping ({scrape_remaining} remaining)...")
             await self.step_scrape()
             if self.should_stop:
                 return
             await self.step_emails()
             if self.should_stop:
                 return
-            self.step_export()
+            await self._export()
             return
 
         # Default: scan may be partially done or not started
         self.log("  Resuming from scan step...")
-        self.step_scan()
-        if self.should_stop:
-            return
-        await self.step_scrape()
-        if self.should_stop:
-            return
-        await self.step_emails()
-        if self.should_stop:
-            return
-        self.step_export()
+        await self._run_pipeline()
 
     # =========================================================================
     #  RE-RUN PIPELINE (wipe local data, reset Firebase, scrape from scratch)
@@ -1217,9 +2369,12 @@ class ScrapeJob:
         """Delete all local checkpoints and reset the Firebase job, then run fresh."""
         self.log(f"Re-running job: {self.niche} in {self.region}")
 
-        # 1. Clear local checkpoint files
-        for f in [self.place_ids_file, self.excluded_file, self.progress_file,
-                  self.scraped_file, self.emails_file, self.csv_file, self.excluded_csv_file]:
+        # 1. Clear local checkpoints and exports
+        await asyncio.to_thread(self.store.clear)
+        self.log("  Cleared scan, place, detail and email checkpoints")
+        base = self.csv_file.with_suffix('')
+        for f in [self.csv_file, self.excluded_csv_file, self.xlsx_file,
+                  Path(f'{base}.parquet'), Path(f'{base}_excluded.parquet')]:
             if f.exists():
                 f.unlink()
                 self.log(f"  Cleared {f.name}")
@@ -1232,36 +2387,32 @@ class ScrapeJob:
             'gridTotal': 0, 'gridScanned': 0, 'placesFound': 0,
             'placesScraped': 0, 'emailsScraped': 0, 'emailsFound': 0,
             'totalWithPhone': 0, 'totalWithEmail': 0, 'totalWithWebsite': 0,
+            'cellsSplit': 0, 'cellsMasked': 0,
+            'cacheHits': 0, 'cacheMisses': 0, 'cacheSavedUsd': 0.0,
+            'cellsFailed': 0, 'cellRetries': 0, 'quotaPauses': 0,
+            'emailHttpSites': 0, 'emailHttpHits': 0, 'emailBrowserSites': 0, 'emailBrowserHits': 0,
+            'emailOrigins': 0, 'emailCacheHits': 0, 'emailCacheMisses': 0,
         }
 
         # 3. Reset the Firebase job (clears results but keeps the same doc ID)
         if self.firebase_job_id:
-            success = self.fb.rerun_job(self.firebase_job_id)
+            success = await asyncio.to_thread(self.fb.rerun_job, self.firebase_job_id)
             if success:
                 self.log("  Firebase job reset (results cleared, contacts preserved)")
             else:
                 self.log("  Warning: could not reset Firebase job, creating new one")
-                self.firebase_job_id = self.fb.create_job(self.niche, self.region)
+                self.firebase_job_id = await asyncio.to_thread(self.fb.create_job, self.niche, self.region)
 
         self._save_meta()
 
         # 4. Run the full pipeline from scratch
         if not self.firebase_job_id:
-            self.firebase_job_id = self.fb.create_job(self.niche, self.region)
+            self.firebase_job_id = await asyncio.to_thread(self.fb.create_job, self.niche, self.region)
             if self.firebase_job_id:
                 self.log(f"  New Firebase job: {self.firebase_job_id}")
             self._save_meta()
 
-        self.step_scan()
-        if self.should_stop:
-            return
-        await self.step_scrape()
-        if self.should_stop:
-            return
-        await self.step_emails()
-        if self.should_stop:
-            return
-        self.step_export()
+        await self._run_pipeline()
 
     def get_state(self) -> dict:
         """Return current job state for the UI."""
@@ -1275,6 +2426,7 @@ class ScrapeJob:
             'log': self.log_lines[-50:],
             'csv_path': str(self.csv_file) if self.csv_file.exists() else None,
             'excluded_csv_path': str(self.excluded_csv_file) if self.excluded_csv_file.exists() else None,
+            'xlsx_path': str(self.xlsx_file) if self.xlsx_file.exists() else None,
             'can_resume': self.can_resume,
             'resume_step': self.resume_step if self.can_resume else None,
             'firebase_job_id': self.firebase_job_id,
@@ -1308,14 +2460,15 @@ class ScrapeJob:
         self.region_key = new_region_key
 
         # Recalculate grid totals for the new (larger) bounding box.
-        # Existing scanned_points are preserved in progress.json so step_scan
-        # will skip them automatically on the next run.
+        # Both regions share the global lattice, so existing scanned_points
+        # match the new grid exactly and step_scan skips them on the next run.
         new_grid = self._generate_grid(bounds)
-        progress_data = self._load_json(self.progress_file) or {'scanned_points': []}
-        already_scanned = set(tuple(p) for p in progress_data.get('scanned_points', []))
+        already_scanned = self.store.scan_state()['scanned']
         new_points_count = len([p for p in new_grid if p not in already_scanned])
+        reused = len(new_grid) - new_points_count
 
         self.progress['gridTotal'] = len(new_grid)
+        self.progress['gridScanned'] = reused
 
         # Move the status back so can_resume returns True and resume()
         # detects that there are new grid points to scan.
@@ -1332,9 +2485,15 @@ class ScrapeJob:
 
         self.log(f"Region expanded: {old_region} → {self.region}")
         self.log(f"  Total grid: {len(new_grid)} points, {new_points_count} new to scan")
-        self.log(f"  Existing scan progress preserved ({len(already_scanned)} points done)")
+        self.log(f"  Existing scan progress preserved ({reused} of {len(already_scanned)} scanned points reused)")
         return True
 
+    def estimate_expansion_cost(self, region_key: str) -> dict:
+        """Scan cost for `region_key`, counting only cells this job hasn't scanned."""
+        return self.estimate_scan_cost(region_key, scan_mode=self.scan_mode,
+                                       scanned=self.store.scan_state()['scanned'],
+                                       enrichment=self.enrichment)
+
     # =========================================================================
     #  CLASS METHOD: Discover resumable jobs from local data directory
     # =========================================================================
@@ -1345,16 +2504,19 @@ class ScrapeJob:
         if not base.exists():
             return []
 
+        ScrapeJob.migrate_data_dir(data_dir)
         resumable = []
         for project_dir in sorted(base.iterdir()):
-            if not project_dir.is_dir():
-                continue
-            meta_file = project_dir / 'job_meta.json'
-            if not meta_file.exists():
+            if not (project_dir / 'job.db').exists():
                 continue
             try:
-                with open(meta_file, 'r') as f:
-                    meta = json.load(f)
+                store = JobStore(project_dir / 'job.db')
+                try:
+                    meta = store.get_meta()
+                finally:
+                    store.close()
+                if not meta:
+                    continue
                 # Skip completed jobs
                 if meta.get('status') == 'complete':
                     continue
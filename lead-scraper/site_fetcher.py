@@ -0,0 +1,183 @@
+"""
+Plain-HTTP fetcher for business websites (the first tier of the email step).
+
+Most small-business sites serve their contact details in static HTML, so a
+pooled aiohttp session gets them far cheaper than a Chromium navigation.
+The email step falls back to the browser only when the HTML looks
+client-rendered or yields nothing.
+
+- One connection pool for the whole step, with a DNS cache and a cap on
+  connections per host.
+- Bodies are read up to MAX_BYTES; non-HTML responses are ignored.
+
+A homepage that looks client-rendered skips the static contact-page crawl
+and goes straight to the browser.
+
+Run as a script to measure throughput on a generated local site corpus
+(one port per site, so the per-host limit applies as it would live):
+    python site_fetcher.py [sites] [latency_ms]
+"""
+
+import asyncio
+import re
+
+import aiohttp
+
+from browser_profile import USER_AGENT
+
+MAX_BYTES = 1_500_000
+
+HREF_RE = re.compile(r'<a\s[^>]*?href\s*=\s*["\']([^"\']+)["\'][^>]*>(.*?)</a>', re.I | re.S)
+TAG_RE = re.compile(r'<[^>]+>')
+LOC_RE = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>', re.I)
+SCRIPT_STYLE_RE = re.compile(r'<(script|style|noscript)\b.*?</\1\s*>', re.I | re.S)
+
+# Markers of an app shell that renders its content client-side.
+JS_SHELL_MARKERS = (
+    'id="root"></div>', "id='root'></div>", 'id="app"></div>', 'id="__next"></div>',
+    'ng-version=', 'window.__NUXT__',
+    'enable javascript to run this app', 'requires javascript',
+)
+
+
+class SiteFetcher:
+    """Shared aiohttp session tuned for many small sites."""
+
+    def __init__(self, concurrency: int = 16, per_host: int = 2, timeout: float = 12):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self._session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host,
+                                         ttl_dns_cache=600, use_dns_cache=True)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'User-Agent': USER_AGENT, 'Accept': 'text/html,application/xhtml+xml'},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    async def fetch(self, url: str, html_only: bool = True) -> tuple[str, str] | None:
+        """GET `url`; returns (final_url, text), or None on error or (with
+        html_only) a non-HTML response."""
+        try:
+            async with self._session.get(url, allow_redirects=True, max_redirects=5) as r:
+                if r.status != 200:
+                    return None
+                if html_only and 'html' not in r.headers.get('Content-Type', 'text/html').lower():
+                    return None
+                body = await r.content.read(MAX_BYTES)
+                return str(r.url), body.decode(r.charset or 'utf-8', errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeError, ValueError):
+            return None
+
+
+def links(html: str) -> list[tuple[str, str]]:
+    """(href, visible text) for every anchor in `html`."""
+    return [(href.strip(), TAG_RE.sub(' ', text).strip())
+            for href, text in HREF_RE.findall(html)]
+
+
+def sitemap_locs(xml: str) -> list[str]:
+    """Page URLs listed in a sitemap.xml body."""
+    return LOC_RE.findall(xml)
+
+
+def looks_js_rendered(html: str) -> bool:
+    """True if `html` is probably an app shell with little server-rendered text."""
+    lowered = html.lower()
+    if any(marker.lower() in lowered for marker in JS_SHELL_MARKERS):
+        return True
+    text = TAG_RE.sub(' ', SCRIPT_STYLE_RE.sub(' ', html))
+    return len(text.split()) < 40
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from aiohttp import web
+
+    import email_extractor
+
+    SITES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    LATENCY = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    FILLER = '<p>' + 'Family owned and serving the area since 1987. ' * 40 + '</p>'
+
+    def page(body: str) -> str:
+        return (f'<html><head><title>Site</title><style>body{{margin:0}}</style></head><body>'
+                f'<nav><a href="/">Home</a> <a href="/about">About</a> <a href="/contact">Contact Us</a></nav>'
+                f'{FILLER}{body}</body></html>')
+
+    # Every other site lists its email on the homepage, every fourth on
+    # /contact only, every eighth is an app shell; the rest have none.
+    def site_pages(n: int) -> dict:
+        email = f'<a href="mailto:office@site{n}.example">office@site{n}.example</a>'
+        if n % 8 == 7:
+            return {'/': '<html><body><div id="root"></div><script src="/app.js"></script></body></html>'}
+        if n % 2 == 0:
+            return {'/': page(email), '/contact': page(email), '/about': page('')}
+        if n % 4 == 1:
+            return {'/': page(''), '/contact': page(email), '/about': page('')}
+        return {'/': page(''), '/contact': page(''), '/about': page('')}
+
+    corpus = {}
+
+    async def handle(request):
+        await asyncio.sleep(LATENCY)
+        body = corpus[request.url.port].get(request.path)
+        if body is None:
+            raise web.HTTPNotFound()
+        return web.Response(text=body, content_type='text/html')
+
+    async def crawl(fetcher, url: str) -> tuple[set, int, str]:
+        """(emails, pages fetched, tier) for one site, as the email step's HTTP tier does."""
+        home = await fetcher.fetch(url)
+        if not home:
+            return set(), 1, 'error'
+        emails = await email_extractor.extract_async(home[1])
+        if emails:
+            return emails, 1, 'homepage'
+        if looks_js_rendered(home[1]):
+            return set(), 1, 'browser'
+        targets = [href for href, text in links(home[1]) if 'contact' in (href + text).lower()][:3]
+        pages = await asyncio.gather(*(fetcher.fetch(url.rstrip('/') + href) for href in targets))
+        for p in pages:
+            if p:
+                emails |= await email_extractor.extract_async(p[1])
+        return emails, 1 + len(targets), 'contact' if emails else 'browser'
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/{path:.*}', handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        urls = []
+        for n in range(SITES):
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            corpus[port] = site_pages(n)
+            urls.append(f'http://127.0.0.1:{port}/')
+
+        tiers = {}
+        pages = 0
+        started = time.perf_counter()
+        async with SiteFetcher(concurrency=32) as fetcher:
+            results = await asyncio.gather(*(crawl(fetcher, url) for url in urls))
+        elapsed = time.perf_counter() - started
+        for emails, fetched, tier in results:
+            pages += fetched
+            tiers[tier] = tiers.get(tier, 0) + 1
+        await runner.cleanup()
+
+        print(f"{SITES} sites, {LATENCY * 1000:.0f} ms server latency")
+        print(f"  {elapsed:.2f}s: {SITES / elapsed:.0f} sites/s, {pages / elapsed:.0f} pages/s")
+        print('  ' + ', '.join(f'{tier}: {count}' for tier, count in sorted(tiers.items())))
+
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Per-place latency of ScrapeJob._scrape_place on saved Maps panel fixtures.
+
+Each fixture in fixtures/maps renders the place heading at once and the
+info rows (address, phone, website) after a delay, like the live panel.
+Every fixture is scraped with the old per-field locator sequence (fixed 3s
+settle, then one locator call per field with its own timeout) and with
+_scrape_place, and the time and fields found are printed side by side:
+
+    python tests/bench_scrape_place.py [rounds]
+
+Needs Playwright's Chromium (python -m playwright install chromium).
+"""
+
+import asyncio
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright  # noqa: E402
+
+import browser_profile  # noqa: E402
+from scraper import ScrapeJob  # noqa: E402
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'maps'
+FIELDS = ('name', 'address', 'phone', 'website')
+
+
+async def scrape_place_locators(page, place_id):
+    """_scrape_place before the single-evaluate rewrite."""
+    url = f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+    await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    await asyncio.sleep(3)
+    result = {'place_id': place_id, 'name': '', 'address': '', 'phone': '', 'website': ''}
+    try:
+        result['name'] = await page.locator('h1').first.inner_text(timeout=5000)
+    except Exception:
+        pass
+    try:
+        label = await page.locator('button[aria-label^="Address"]').first.get_attribute('aria-label', timeout=3000)
+        m = re.search(r'Address:\s*(.+)', label or '')
+        if m:
+            result['address'] = m.group(1).strip()
+    except Exception:
+        pass
+    try:
+        label = await page.locator('button[aria-label^="Phone"]').first.get_attribute('aria-label', timeout=3000)
+        m = re.search(r'Phone:\s*(.+)', label or '')
+        if m:
+            result['phone'] = m.group(1).strip()
+    except Exception:
+        pass
+    if not result['phone']:
+        try:
+            href = await page.locator('a[href^="tel:"]').first.get_attribute('href', timeout=2000)
+            if href:
+                result['phone'] = href.replace('tel:', '').strip()
+        except Exception:
+            pass
+    try:
+        href = await page.locator('a[aria-label^="Website"]').first.get_attribute('href', timeout=3000)
+        if href:
+            m = re.search(r'/url\?q=([^&]+)', href)
+            result['website'] = unquote(m.group(1)) if m else href
+    except Exception:
+        pass
+    return result
+
+
+async def main(rounds: int):
+    fixtures = sorted(FIXTURES.glob('*.html'))
+
+    async def serve(route):
+        place_id = parse_qs(urlparse(route.request.url).query)['q'][0].split(':', 1)[1]
+        await route.fulfill(status=200, content_type='text/html',
+                            body=(FIXTURES / f'{place_id}.html').read_text())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job = ScrapeJob('bench', 'bench', 'bench', 'IL', api_key='', data_dir=tmp)
+        async with async_playwright() as p:
+            browser = await browser_profile.launch(p)
+            ctx = await browser.new_context()
+            await ctx.route(lambda url: '/maps/place/' in url, serve)
+            page = await ctx.new_page()
+
+            print(f"{'fixture':<12} {'locators':>10} {'evaluate':>10}  fields (locators / evaluate)")
+            totals = [0.0, 0.0]
+            for path in fixtures:
+                times, found = [0.0, 0.0], [0, 0]
+                for _ in range(rounds):
+                    for i, scrape in enumerate((scrape_place_locators, job._scrape_place)):
+                        started = time.perf_counter()
+                        result = await scrape(page, path.stem)
+                        times[i] += (time.perf_counter() - started) / rounds
+                        found[i] = sum(bool(result.get(f)) for f in FIELDS)
+                totals = [t + x for t, x in zip(totals, times)]
+                print(f"{path.stem:<12} {times[0]:>9.2f}s {times[1]:>9.2f}s  {found[0]}/{len(FIELDS)} / {found[1]}/{len(FIELDS)}")
+            print(f"{'mean':<12} {totals[0] / len(fixtures):>9.2f}s {totals[1] / len(fixtures):>9.2f}s")
+            await browser.close()
+        job.store.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3))
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app's modules live flat in lead-scraper/ and import each other by name.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
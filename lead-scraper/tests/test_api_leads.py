@@ -0,0 +1,22 @@
+import pytest
+
+import app as webapp
+from job_store import JobStore
+from lead_index import LeadIndex
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(webapp, 'DATA_DIR', str(tmp_path))
+    store = JobStore(tmp_path / 'job.db')
+    store.put_details([{'place_id': f'p{i}', 'name': f'Summit Plumbing {i}'} for i in range(3)])
+    LeadIndex.shared(tmp_path).update_from_job(store, 'job')
+    store.close()
+    return webapp.app.test_client()
+
+
+@pytest.mark.parametrize('limit, found', [('2', 2), ('abc', 3), ('-5', 1), ('0', 1), ('100000', 3)])
+def test_limit_is_parsed_and_clamped(client, limit, found):
+    resp = client.get(f'/api/leads?q=summit&limit={limit}')
+    assert resp.status_code == 200
+    assert len(resp.get_json()['results']) == found
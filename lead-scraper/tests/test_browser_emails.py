@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from scraper import ScrapeJob
+
+SITE = {
+    'https://plumbco.net/': ('<p>Call us</p>', [('https://plumbco.net/contact', 'Contact us'),
+                                                ('https://plumbco.net/about', 'About')]),
+    'https://plumbco.net/contact': ('<form></form>', []),
+    'https://plumbco.net/about': ('<p>Write to office@plumbco.net</p>', []),
+}
+
+
+class LeasedPage:
+    """The page a BrowserPool lease hands out; opening more tabs is an error."""
+
+    def __init__(self):
+        self.url = 'about:blank'
+        self.visited = []
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        self.visited.append(url)
+
+    async def evaluate(self, script):
+        html, links = SITE[self.url]
+        return {'html': html, 'links': [list(link) for link in links]}
+
+    @property
+    def context(self):
+        raise AssertionError('opened a tab outside the browser pool')
+
+
+@pytest.fixture
+def job(tmp_path, monkeypatch):
+    real_sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, 'sleep', lambda seconds: real_sleep(0))
+    job = ScrapeJob('emails', 'plumber', 'Utah', 'utah', api_key='', data_dir=str(tmp_path))
+    yield job
+    job.store.close()
+
+
+def test_contact_pages_are_visited_in_the_leased_page(job):
+    page = LeasedPage()
+    emails = asyncio.run(job._scrape_emails_from_site(page, 'https://plumbco.net/'))
+
+    assert emails == {'office@plumbco.net'}
+    assert page.visited == ['https://plumbco.net/', 'https://plumbco.net/contact',
+                            'https://plumbco.net/about']
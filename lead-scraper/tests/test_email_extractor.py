@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from email_extractor import extract
+
+PAGES = Path(__file__).parent / 'fixtures' / 'pages'
+
+LONG_DOMAIN = 'office@' + 'a' * 60 + '.' + 'b' * 20 + '.com'
+
+
+def test_adjacent_addresses_are_not_cut():
+    text = 'Email alice@foo.com for sales. ' + 'x' * 50 + ' or bob@bigcompanyname.com today'
+    assert extract(text) == {'alice@foo.com', 'bob@bigcompanyname.com'}
+
+
+def test_adjacent_entity_encoded_addresses():
+    text = 'Email alice&#64;foo.com for sales. ' + 'x' * 50 + ' or bob&#64;bigcompanyname.com today'
+    assert extract(text) == {'alice@foo.com', 'bob@bigcompanyname.com'}
+
+
+def test_domain_longer_than_window():
+    assert extract(f'<p>Write to {LONG_DOMAIN} now</p>') == {LONG_DOMAIN}
+
+
+def test_local_part_longer_than_window_edge():
+    address = 'customer.service.department.' + 'c' * 30 + '@shop.example.org'
+    assert extract(f'<a href="mailto:{address}">{address}</a>') == {address}
+
+
+def test_overlong_token_is_not_truncated_into_an_address():
+    assert extract('<p>' + 'y' * 400 + '@foo.com</p>') == set()
+    assert extract('a@b.co' + 'q' * 400) == set()
+
+
+def test_skipped_regions_and_junk():
+    text = ('<script>var dsn = "abc@sentry.io";</script><img srcset="logo@2x.png 2x">'
+            '<p>info@plumbing.example.net</p>')
+    assert extract(text) == {'info@plumbing.example.net'}
+
+
+def test_obfuscated_and_cloudflare():
+    assert extract('sales [at] roofing-co [dot] com') == {'sales@roofing-co.com'}
+    key = 0x42
+    encoded = bytes([key]) + bytes(b ^ key for b in b'hi@cfsite.net')
+    assert extract(f'<a data-cfemail="{encoded.hex()}">[email protected]</a>') == {'hi@cfsite.net'}
+
+
+@pytest.mark.parametrize('name, emails', [
+    ('wordpress_footer.html', {'office@summitplumbing.net'}),
+    ('wix_app_shell.html', {'hello@canyonroofing.co'}),
+    ('cloudflare_protected.html', {'service@redlineelectric.us', 'jobs@redlineelectric.us'}),
+    ('obfuscated_contact.html', {'sales@brighthvac.com', 'billing@brighthvac.com', 'service@brighthvac.com'}),
+    ('squarespace_inline.html', {'oakandiron.landscape@gmail.com'}),
+    ('no_email.html', set()),
+])
+def test_saved_pages(name, emails):
+    assert extract((PAGES / name).read_text()) == emails
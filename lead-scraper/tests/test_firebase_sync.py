@@ -0,0 +1,179 @@
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from firebase_sync import FirebaseSync
+from scraper import FirebaseAPI
+
+
+class StandIn(ThreadingHTTPServer):
+    """Local stand-in for the Cloud Function: records every request and
+    can fail the next few or refuse batchUpdateJobs like an old deploy."""
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.received = []  # (action, payload, content encoding)
+        self.fail_next = 0
+        self.batching = True
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}/'
+
+    def actions(self):
+        with self.lock:
+            return [action for action, _, _ in self.received]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        encoding = self.headers.get('Content-Encoding', '')
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        server = self.server
+        with server.lock:
+            server.received.append((payload['action'], payload, encoding))
+            fail = server.fail_next > 0
+            server.fail_next -= fail
+        if fail:
+            self._reply(500, {'error': 'unavailable'})
+        elif payload['action'] == 'batchUpdateJobs' and not server.batching:
+            self._reply(400, {'error': 'Unknown action: batchUpdateJobs'})
+        else:
+            self._reply(200, {'success': True, 'failed': []})
+
+    def _reply(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sync(server):
+    sync = FirebaseSync(server.url)
+    sync.SEND_INTERVAL = 0.01
+    return sync
+
+
+def test_updates_coalesce_to_the_latest_per_job(server, sync):
+    # Holding the queue's lock keeps the sender from taking anything early.
+    with sync._cond:
+        for n in range(100):
+            sync.update('job1', {'status': 'scraping', 'progress': {'placesScraped': n}})
+        sync.update('job1', {'progress': {'emailsFound': 7}})
+    assert sync.flush(5)
+
+    assert server.actions() == ['updateJob']
+    _, payload, _ = server.received[0]
+    assert payload['jobId'] == 'job1'
+    assert payload['data'] == {'status': 'scraping', 'progress': {'placesScraped': 99, 'emailsFound': 7}}
+    assert sync.stats()['updatesCoalesced'] == 100
+
+
+def test_several_jobs_share_one_batch_request(server, sync):
+    with sync._cond:
+        for job in ('job1', 'job2', 'job3'):
+            sync.update(job, {'status': 'scanning'})
+    assert sync.flush(5)
+
+    assert server.actions() == ['batchUpdateJobs']
+    updates = server.received[0][1]['data']['updates']
+    assert [u['jobId'] for u in updates] == ['job1', 'job2', 'job3']
+
+
+def test_large_bodies_are_gzipped(server, sync):
+    sync.update('small', {'status': 'scanning'})
+    assert sync.flush(5)
+    sync.upload_rows('big', [{'placeId': f'p{i}', 'name': f'Business {i}' * 5} for i in range(50)])
+    assert sync.flush(5)
+
+    encodings = {action: encoding for action, _, encoding in server.received}
+    assert encodings == {'updateJob': '', 'uploadResultsChunk': 'gzip'}
+    assert server.received[1][1]['data']['results'][49]['placeId'] == 'p49'
+    assert sync.bytes_sent < sync.bytes_raw
+
+
+def test_batch_falls_back_to_single_updates(server, sync):
+    server.batching = False
+    with sync._cond:
+        sync.update('job1', {'status': 'scanning'})
+        sync.update('job2', {'status': 'emails'})
+    assert sync.flush(5)
+
+    assert server.actions() == ['batchUpdateJobs', 'updateJob', 'updateJob']
+    assert not sync.batching
+    sent = {p['jobId']: p['data'] for action, p, _ in server.received if action == 'updateJob'}
+    assert sent == {'job1': {'status': 'scanning'}, 'job2': {'status': 'emails'}}
+
+
+def test_server_errors_are_retried_without_losing_newer_updates(server, sync):
+    server.fail_next = 2
+    sync.update('job1', {'status': 'scanning', 'progress': {'gridScanned': 1}})
+    while len(server.received) < 1:
+        threading.Event().wait(0.01)
+    sync.update('job1', {'progress': {'gridScanned': 2}})
+    assert sync.flush(10)
+
+    assert server.actions() == ['updateJob'] * 3
+    assert server.received[-1][1]['data'] == {'status': 'scanning', 'progress': {'gridScanned': 2}}
+    assert sync.stats()['failures'] == 2
+
+
+def test_rows_are_retried_after_server_errors(server, sync):
+    server.fail_next = 1
+    acked = []
+    sync.upload_rows('job1', [{'placeId': 'p1', 'name': 'A'}], on_ack=acked.extend)
+    sync.upload_rows('job1', [{'placeId': 'p1', 'email': 'a@b.net'}])
+    assert sync.flush(10)
+
+    assert server.actions() == ['uploadResultsChunk', 'uploadResultsChunk']
+    assert server.received[-1][1]['data']['results'] == [{'placeId': 'p1', 'name': 'A', 'email': 'a@b.net'}]
+    assert acked == [{'placeId': 'p1', 'name': 'A', 'email': 'a@b.net'}]
+
+
+def test_flushing_one_job_leaves_the_others_queued(server, sync):
+    sync.upload_rows('busy', [{'placeId': 'p1', 'name': 'A'}])
+    sync.upload_rows('job1', [{'placeId': 'p2', 'name': 'B'}])
+    sync.update('job1', {'status': 'exporting'})
+    assert sync.flush(5, job_id='job1')
+
+    sent = [(action, payload['jobId']) for action, payload, _ in server.received]
+    assert sorted(sent) == [('updateJob', 'job1'), ('uploadResultsChunk', 'job1')]
+    assert sync.stats()['rowsQueued'] == 1
+
+
+def test_reads_do_not_wait_on_the_queue(server):
+    api = FirebaseAPI(server.url)
+    api.sync.SEND_INTERVAL = 0.01
+    api.sync.upload_rows('busy', [{'placeId': 'p1', 'name': 'A'}])
+    started = time.monotonic()
+    api.list_jobs()
+    api.get_job_state('busy')
+    assert time.monotonic() - started < 5
+    assert server.actions() == ['listJobs', 'getJobState']
+    api.upload_results_chunk('busy', [{'placeId': 'p2', 'name': 'B'}], 0)
+    assert server.actions()[2:] == ['uploadResultsChunk', 'uploadResultsChunk']
+    assert server.received[2][1]['data']['results'] == [{'placeId': 'p1', 'name': 'A'}]
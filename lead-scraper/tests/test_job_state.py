@@ -0,0 +1,65 @@
+import builtins
+import io
+import json
+
+import pytest
+
+from job_store import JobStore
+from scraper import ScrapeJob
+
+FULL_READERS = ('place_ids', 'excluded', 'details', 'emails', 'scan_state', 'uploaded',
+                'iter_results', 'iter_results_since', 'iter_results_to_upload', 'iter_excluded', '_stream')
+
+
+@pytest.fixture
+def job(tmp_path):
+    job = ScrapeJob('poll', 'plumber', 'Utah', 'utah', api_key='', data_dir=str(tmp_path))
+    ids = [f'place{i}' for i in range(30)]
+    job.store.record_cell('cell', ids=ids, excluded=[{'id': 'church1', 'primaryType': 'church'}],
+                          done_root=(40.0, -111.5))
+    job.store.put_details([{'place_id': pid, 'name': pid, 'website': f'https://{pid}.example'}
+                           for pid in ids[:20]])
+    job.store.put_email_groups([([pid], ['info@site.net']) for pid in ids[:5]])
+    job.status = 'emails_interrupted'
+    yield job
+    job.store.close()
+
+
+def test_poll_reads_only_the_summary(job, monkeypatch):
+    def forbidden(*args, **kwargs):
+        raise AssertionError('a job state poll parsed a checkpoint')
+
+    monkeypatch.setattr(builtins, 'open', forbidden)
+    monkeypatch.setattr(io, 'open', forbidden)
+    monkeypatch.setattr(json, 'load', forbidden)
+    for name in FULL_READERS:
+        monkeypatch.setattr(JobStore, name, forbidden)
+
+    queries = []
+    real_query = JobStore._query
+
+    def query(self, sql, args=()):
+        queries.append(sql)
+        return real_query(self, sql, args)
+    monkeypatch.setattr(JobStore, '_query', query)
+
+    state = job.get_state()
+    assert job.can_resume
+    assert job.resume_step == state['resume_step']
+
+    assert state['can_resume'] is True
+    assert state['resume_step'] == 'Resume from email scraping (5 sites checked)'
+    assert queries and all(sql == 'SELECT key, value FROM summary' for sql in queries)
+
+
+def test_summary_tracks_checkpoints(job):
+    summary = job.store.summary()
+    assert summary['places'] == 30
+    assert summary['excluded'] == 1
+    assert summary['scanned'] == 1
+    assert summary['details_ok'] == 20
+    assert summary['with_website'] == 20
+    assert summary['emails'] == 5
+    assert summary['emails_found'] == 5
+    assert summary['scrape_pending'] == 10
+    assert summary['email_pending'] == 15
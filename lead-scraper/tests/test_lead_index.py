@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from job_store import JobStore
+from lead_index import LeadIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LeadIndex(tmp_path / '_index' / 'leads.db')
+    yield index
+    index.close()
+
+
+def store(tmp_path, name):
+    return JobStore(tmp_path / f'{name}.db')
+
+
+def leads(index):
+    return {r['place_id']: (r['job'], r['scraped_at'])
+            for r in index._query('SELECT place_id, job, scraped_at FROM leads')}
+
+
+def test_reused_places_are_indexed_under_the_reusing_job(tmp_path, index):
+    first = store(tmp_path, 'first')
+    first.put_details([{'place_id': 'p1', 'name': 'Summit Plumbing', 'website': 'https://summit.net'},
+                       {'place_id': 'p2', 'name': 'Valley Drains'}])
+    index.update_from_job(first, 'first')
+    scraped = leads(index)
+
+    # The second job is indexed once, then an expand reuses the first job's places.
+    second = store(tmp_path, 'second')
+    second.put_details([{'place_id': 'p3', 'name': 'Canyon Rooter'}])
+    index.update_from_job(second, 'second')
+    time.sleep(0.01)
+    second.put_details(list(index.fresh(['p1', 'p2'], 3600, exclude_job='second').values()))
+
+    assert index.update_from_job(second, 'second') == 2
+    assert leads(index)['p1'] == ('second', scraped['p1'][1])
+    assert leads(index)['p2'] == ('second', scraped['p2'][1])
+    # A copy is only as fresh as the original scrape.
+    assert index.fresh(['p2'], 3600)['p2']['source_scraped_at'] == scraped['p2'][1]
+    first.close()
+    second.close()